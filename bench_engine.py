@@ -0,0 +1,827 @@
+#!/usr/bin/env python3
+"""
+SajuEngine 성능 측정 스크립트
+
+실행 방법:
+  python bench_engine.py            # 전체 항목 측정
+  python bench_engine.py load       # 특정 항목만 측정
+"""
+
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from manse_store import ManseStore, TermTable, open_binary
+
+M_FILE = "./data/manse_data.json"
+T_FILE = "./data/term_data.json"
+BIN_FILE = "./data/manse_data.bin"
+
+
+def _measure(fn):
+    """(결과, 소요 시간(초), 유지 메모리(MB)) 반환
+
+    tracemalloc 이 실행 속도를 떨어뜨리므로 시간과 메모리는 따로 측정합니다.
+    """
+    gc.collect()
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, current / 1024 / 1024
+
+
+def _engine():
+    from saju_engine import SajuEngine
+    if os.path.exists(BIN_FILE):
+        return SajuEngine(BIN_FILE)
+    return SajuEngine(M_FILE, T_FILE)
+
+
+def _sample_births(n, seed=42):
+    """1930~2040년 사이 임의의 양력 생년월일시 n개"""
+    rnd = random.Random(seed)
+    return [
+        f"{rnd.randint(1930, 2040)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d} "
+        f"{rnd.randint(0, 23):02d}:{rnd.randint(0, 59):02d}"
+        for _ in range(n)
+    ]
+
+
+def _per_call(fn, items, repeat=3):
+    """items 를 fn 으로 처리할 때 1건당 평균 시간(ms), 여러 번 중 최솟값"""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for it in items:
+            fn(it)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(items) * 1000
+
+
+def bench_load():
+    """만세력 로드: dict(json.load) vs ManseStore"""
+    def load_dict():
+        with open(M_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    d, t_dict, m_dict = _measure(load_dict)
+    print(f"dict (json.load)   : {t_dict:6.3f}s, {m_dict:7.1f}MB ({len(d)}일)")
+    del d
+
+    s, t_store, m_store = _measure(lambda: ManseStore.from_json(M_FILE))
+    print(f"ManseStore (array) : {t_store:6.3f}s, {m_store:7.1f}MB ({len(s)}일)")
+
+
+def bench_mmap():
+    """워커 1개당 엔진 데이터 로드: JSON 변환 vs mmap 바이너리"""
+    _, t_json, m_json = _measure(lambda: (ManseStore.from_json(M_FILE), TermTable.from_json(T_FILE)))
+    print(f"JSON -> 배열       : {t_json:6.3f}s, {m_json:7.2f}MB/워커")
+
+    _, t_bin, m_bin = _measure(lambda: open_binary(BIN_FILE))
+    print(f"mmap (.bin)        : {t_bin:6.4f}s, {m_bin:7.2f}MB/워커 (데이터는 페이지 캐시에서 공유)")
+
+
+def bench_lunar():
+    """음력 입력 analyze 비용: 양력 입력과 비교"""
+    engine = _engine()
+    solar, lunar = [], []
+    for b in _sample_births(400):
+        d = engine.m_db.get(b[:10].replace("-", ""))
+        if d['ld'] > 28:  # 음력 29/30일은 양력 날짜 형식으로 파싱되지 않는 경우가 있어 제외
+            continue
+        solar.append(b)
+        lunar.append((f"{d['ly']}-{d['lm']:02d}-{d['ld']:02d} {b[11:]}", "음력(윤달)" if d['ls'] else "음력"))
+
+    t_solar = _per_call(lambda b: engine.analyze(b, "M", "서울특별시", True, "양력"), solar)
+    t_lunar = _per_call(lambda x: engine.analyze(x[0], "M", "서울특별시", True, x[1]), lunar)
+    print(f"analyze 양력 입력  : {t_solar:6.3f}ms/건")
+    print(f"analyze 음력 입력  : {t_lunar:6.3f}ms/건")
+
+    t_idx = _per_call(lambda x: engine._parse_and_convert_to_solar(*x), lunar)
+    print(f"음력->양력 변환    : {t_idx * 1000:6.1f}us/건 (역인덱스 {len(engine.m_db.lunar_index)}개월)")
+
+    with open(M_FILE, 'r', encoding='utf-8') as f:
+        legacy = json.load(f)
+
+    def linear_scan(x):
+        y, m, d = (int(v) for v in x[0][:10].split("-"))
+        leap = x[1] == "음력(윤달)"
+        return next((k for k, v in legacy.items()
+                     if v['ly'] == y and v['lm'] == m and v['ld'] == d and v['ls'] == leap), None)
+
+    t_scan = _per_call(linear_scan, lunar[:30], repeat=1)
+    print(f"(이전) 전체 순회   : {t_scan * 1000:6.1f}us/건")
+
+
+def bench_batch():
+    """배치 처리량: analyze 단건 루프 vs analyze_many"""
+    engine = _engine()
+    rnd = random.Random(7)
+    unique = [(b, rnd.choice("MF"), "서울특별시", {"use_yajas_i": True}) for b in _sample_births(1000)]
+    dup = [rnd.choice(unique[:400]) for _ in range(1000)]  # 같은 차트가 반복되는 배치
+
+    def loop(items):
+        return [engine.analyze(b, g, loc, **opt) for b, g, loc, opt in items]
+
+    for label, items in (("고유 1,000건", unique), ("중복 포함 1,000건", dup)):
+        t0 = time.perf_counter(); loop(items); t_loop = time.perf_counter() - t0
+        t0 = time.perf_counter(); list(engine.analyze_many(items)); t_many = time.perf_counter() - t0
+        print(f"{label:<14}: 단건 루프 {len(items) / t_loop:7.0f}건/s | analyze_many {len(items) / t_many:7.0f}건/s")
+
+
+def bench_sections():
+    """analyze 섹션 선택: 전체 결과 vs 엔드포인트별 필요한 키만"""
+    from fortune_generator import FortuneGenerator
+    from main import RE_ANALYZE_SECTIONS
+
+    engine = _engine()
+    births = _sample_births(300)
+    for label, secs in (("전체", None), ("/api/re-analyze", RE_ANALYZE_SECTIONS),
+                        ("/api/daily-fortune", FortuneGenerator.REQUIRED_SECTIONS)):
+        t = _per_call(lambda b: engine.analyze(b, "M", "서울특별시", True, sections=secs), births)
+        print(f"{label:<18}: {t:6.3f}ms/건")
+
+
+def bench_cache():
+    """원국 캐시: 같은 사람의 연속 요청 (analyze_web -> re-analyze 토글 -> fortune_web)"""
+    from fortune_generator import FortuneGenerator
+    from main import RE_ANALYZE_SECTIONS
+    from saju_engine import SajuEngine
+
+    path = (BIN_FILE,) if os.path.exists(BIN_FILE) else (M_FILE, T_FILE)
+    births = _sample_births(200)
+
+    def session(engine, b):
+        engine.analyze(b, "F", "서울특별시", True)
+        for hap, johoo in ((True, False), (True, True), (False, False)):
+            engine.analyze(b, "F", "서울특별시", True, use_hap_correction=hap, use_johoo_correction=johoo,
+                           sections=RE_ANALYZE_SECTIONS)
+        engine.analyze(b, "F", "서울특별시", True, sections=FortuneGenerator.REQUIRED_SECTIONS)
+
+    for label, size in (("캐시 없음", 0), ("캐시 2048", 2048)):
+        engine = SajuEngine(*path, cache_size=size)
+        t = _per_call(lambda b: session(engine, b), births, repeat=1)
+        st = engine.cache_stats()["natal"]
+        print(f"{label:<10}: {t:6.3f}ms/세션 (적중 {st['hits']}, 실패 {st['misses']}, 적중률 {st['hit_rate']:.0%})")
+
+
+def bench_tables():
+    """십성/12운성/관계 조회: 사전 조합 계산 vs 사전 생성 테이블 (차트 1개 기준)"""
+    import saju_constants as sc
+    from saju_chart import CHAR_INDEX, TEN_GOD_TABLE, UNSEONG_TABLE, Chart
+
+    engine = _engine()
+    charts = []
+    for b in _sample_births(300):
+        r = engine.analyze(b, "M", "서울특별시", True, sections={"pillars", "me"})
+        charts.append([c for p in r["pillars"] for c in (p["gan"], p["ji"])])
+
+    def legacy(palja):
+        # 이전 방식: 글자마다 REL_MAP/FUNCTIONAL_POLARITY/TEN_GODS_MAP/UNSEONG_MAP 사전 조회
+        me = palja[4]
+        me_hj = sc.E_MAP_HJ[me]
+        out = []
+        for i in range(60):
+            g, j = sc.STEMS[i % 10], sc.BRANCHES[i % 12]
+            for t in (g, j):
+                rel = sc.REL_MAP.get((me_hj, sc.E_MAP_HJ[t]))
+                out.append(sc.TEN_GODS_MAP.get((rel, sc.FUNCTIONAL_POLARITY[me] == sc.FUNCTIONAL_POLARITY[t]), "-"))
+            out.append(sc.UNSEONG_MAP.get(me, {}).get(j, "-"))
+        return out
+
+    def table(palja):
+        me = CHAR_INDEX[palja[4]]
+        ten_gods, unseong = TEN_GOD_TABLE[me], UNSEONG_TABLE[me]
+        out = []
+        for i in range(60):
+            out += (ten_gods[i % 10], ten_gods[10 + i % 12], unseong[i % 12])
+        return out
+
+    assert all(legacy(p) == table(p) for p in charts)
+    t_legacy = _per_call(legacy, charts)
+    t_table = _per_call(table, charts)
+    print(f"60갑자 x (십성 2 + 12운성) : 사전 조합 {t_legacy * 1000:6.1f}us | 테이블 {t_table * 1000:6.1f}us")
+
+    def per_chart(palja):
+        chart = Chart.from_palja(palja)
+        engine._investigate_sinsal(chart)
+        engine.get_yeonun_only(1990, 5, palja[4], palja[4])
+        engine.get_wolun_only(2026, palja[4], palja[4])
+    print(f"원국 표 + 연운 + 월운        : {_per_call(per_chart, charts) * 1000:6.1f}us/차트")
+
+
+def bench_interactions():
+    """합/충/형 등 상호작용 검출: 원국 4기둥, 원국 + 들어오는 운 1기둥"""
+    from saju_chart import Chart
+    from manse_store import SIXTY_GANZI
+
+    engine = _engine()
+    rnd = random.Random(11)
+    charts = [Chart.from_palja([c for _ in range(4) for c in SIXTY_GANZI[rnd.randrange(60)]]) for _ in range(2000)]
+    incoming = [SIXTY_GANZI[rnd.randrange(60)] for _ in charts]
+
+    t_natal = _per_call(engine._analyze_interactions, charts)
+    t_in = _per_call(lambda i: engine.get_incoming_interactions(charts[i], incoming[i]), range(len(charts)))
+    print(f"원국 4기둥        : {t_natal * 1000:6.1f}us/차트")
+    print(f"원국 + 운 1기둥   : {t_in * 1000:6.1f}us/차트")
+
+
+def bench_corrections():
+    """표준시/서머타임 보정: 문자열 비교 순회 vs 구간표 bisect / 배치 훑기"""
+    from datetime import datetime, timedelta
+    import saju_constants as sc
+    from manse_store import minute_index
+    from time_correction import CorrectionTable
+
+    rnd = random.Random(13)
+    dts = [datetime(1900, 1, 1) + timedelta(minutes=rnd.randrange(200 * 525960)) for _ in range(20000)]
+    table = CorrectionTable.for_region("KR")
+
+    def legacy(dt):
+        # 이전 방식: strftime 후 기간 목록을 문자열 비교로 순회
+        offset, ts = 0, dt.strftime("%Y%m%d%H%M")
+        if "190804010000" <= ts <= "191112312359": offset += 30
+        elif "195403210000" <= ts <= "196108092359": offset += 30
+        for start, end in sc.DST_PERIODS:
+            if start <= ts <= end:
+                offset -= 60
+                break
+        return offset
+
+    assert [legacy(d) for d in dts] == [table.offset_at(d) for d in dts]
+    t_legacy = _per_call(legacy, dts)
+    t_table = _per_call(table.offset_at, dts)
+    minutes = [minute_index(d) for d in dts]
+    t_many = _per_call(table.offsets_many, [minutes]) / len(minutes)
+    print(f"문자열 비교 : {t_legacy * 1000:6.2f}us/건")
+    print(f"bisect      : {t_table * 1000:6.2f}us/건 (경계 {len(table)}개)")
+    print(f"배치 훑기   : {t_many * 1000:6.2f}us/건 (epoch minute {len(minutes)}개)")
+
+
+def bench_calendar():
+    """월 달력: 매번 생성 vs 불변 달력 캐시 + is_today 덧씌우기"""
+    from month_calendar import MonthCalendar
+
+    engine = _engine()
+    rnd = random.Random(17)
+    months = [(rnd.randint(1900, 2100), rnd.randint(1, 12)) for _ in range(300)]
+
+    t_build = _per_call(lambda ym: MonthCalendar.build(engine.m_db, engine.t_db, *ym).to_dict(), months)
+    t0 = time.perf_counter()
+    n = engine.warm_calendar()
+    t_warm = time.perf_counter() - t0
+    t_cached = _per_call(lambda ym: engine.get_month_calendar(*ym), months)
+    print(f"매번 생성      : {t_build * 1000:6.1f}us/월")
+    print(f"캐시 적중      : {t_cached * 1000:6.1f}us/월")
+    print(f"전체 워밍      : {n}개월 {t_warm:5.2f}s")
+
+
+def bench_luck():
+    """세운/월운 조회 (/api/yeonun, /api/wolun, analyze 초기 연운/월운): LUCK_TABLE"""
+    import saju_constants as sc
+    from luck_table import LUCK_TABLE
+
+    rnd = random.Random(3)
+    items = [(rnd.randint(1930, 2040), rnd.randint(0, 90), rnd.choice(sc.STEMS)) for _ in range(2000)]
+    t_year = _per_call(lambda it: LUCK_TABLE.yeonun(it[2], it[0], it[1]), items)
+    t_month = _per_call(lambda it: LUCK_TABLE.wolun(it[2], it[0]), items)
+    print(f"세운 10년 : {t_year * 1000:5.2f}us/건")
+    print(f"월운 12개월: {t_month * 1000:5.2f}us/건")
+
+
+def bench_chart():
+    """8글자 단위 결과: 매번 계산 vs chart_cache 적중 vs 오프라인 파일(chart_store) 조회 (원국 캐시 없음)"""
+    import tempfile
+    from chart_store import ChartStore, build
+    from lru_cache import LRUCache
+    from saju_chart import Chart
+    from saju_engine import SajuEngine
+
+    path = (BIN_FILE,) if os.path.exists(BIN_FILE) else (M_FILE, T_FILE)
+    births = _sample_births(500)
+    engine = SajuEngine(*path, cache_size=0, chart_store=None)
+    run = lambda b: engine.analyze(b, "M", "서울특별시", True)
+
+    t_cold = _per_call(run, births)
+    engine.chart_cache = LRUCache(4096)
+    t_hot = _per_call(run, births)
+
+    # 측정 대상 원국만 담은 임시 파일 (실제 파일은 python chart_store.py 로 전체 생성)
+    charts = {Chart.from_palja([c for p in run(b)["pillars"] for c in (p["gan"], p["ji"])]).key for b in births}
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "chart_store.sqlite")
+        build(engine, db, options=((False, False),), charts=[Chart.from_key(k) for k in sorted(charts)])
+        engine.chart_cache, engine.chart_store = LRUCache(0), ChartStore(db)
+        t_store = _per_call(run, births)
+        size = os.path.getsize(db) / (len(charts) * 2)
+    print(f"매번 계산       : {t_cold:6.3f}ms/건")
+    print(f"chart_cache 적중: {t_hot:6.3f}ms/건")
+    print(f"chart_store 조회: {t_store:6.3f}ms/건 ({size:.0f}B/행)")
+
+
+def bench_hours():
+    """생시 모름: 2시간 간격 12회 analyze vs analyze_hours 1회 (날짜 1개 기준, 캐시는 매번 새 엔진)"""
+    from saju_engine import SajuEngine
+
+    path = (BIN_FILE,) if os.path.exists(BIN_FILE) else (M_FILE, T_FILE)
+    dates = [b[:10] for b in _sample_births(100)]
+
+    def per_date(fn):
+        engine = SajuEngine(*path)
+        t0 = time.perf_counter()
+        for d in dates:
+            fn(engine, d)
+        return (time.perf_counter() - t0) / len(dates) * 1000
+
+    t_one = per_date(lambda e, d: e.analyze(f"{d} 12:00", "M", "서울특별시", True))
+    t_guess = per_date(lambda e, d: [e.analyze(f"{d} {h:02d}:30", "M", "서울특별시", True) for h in range(0, 24, 2)])
+    t_hours = per_date(lambda e, d: e.analyze_hours(d, "M", "서울특별시"))
+    print(f"analyze 1회 (참고)   : {t_one:6.3f}ms/날짜")
+    print(f"analyze 12회         : {t_guess:6.3f}ms/날짜")
+    print(f"analyze_hours        : {t_hours:6.3f}ms/날짜")
+
+
+def bench_boundaries():
+    """생시 경계 찾기 (±12시간): 1분마다 8글자 판정 vs find_pillar_boundaries 후보 시각만 판정"""
+    from datetime import datetime, timedelta
+    from saju_engine import SajuEngine
+    from manse_store import minute_index
+    import saju_constants as sc
+
+    path = (BIN_FILE,) if os.path.exists(BIN_FILE) else (M_FILE, T_FILE)
+    engine = SajuEngine(*path)
+    births = _sample_births(20)
+    lng_off = int(round((sc.CITY_DATA["서울특별시"] - 135) * 4))
+
+    def brute(b):
+        dt, prev, found = datetime.strptime(b, "%Y-%m-%d %H:%M") - timedelta(hours=12), None, []
+        for _ in range(24 * 60):
+            hist = engine.time_corrections.offset(minute_index(dt))
+            state = engine._determine_pillars(dt, dt + timedelta(minutes=hist + lng_off), True)[0]
+            if prev is not None and state != prev:
+                found.append(dt)
+            prev, dt = state, dt + timedelta(minutes=1)
+        return found
+
+    t_brute = _per_call(brute, births[:5], repeat=1)
+    t_sweep = _per_call(lambda b: engine.find_pillar_boundaries(b, "서울특별시"), births)
+    print(f"1분 단위 판정        : {t_brute:8.3f}ms/건")
+    print(f"후보 시각만 판정     : {t_sweep:8.3f}ms/건")
+
+
+def bench_options():
+    """합/조후 4가지 조합: 조합마다 analyze vs analyze_options 1회 (캐시는 매번 새 엔진)"""
+    from saju_engine import OPTION_SECTIONS, SajuEngine
+
+    path = (BIN_FILE,) if os.path.exists(BIN_FILE) else (M_FILE, T_FILE)
+    births = _sample_births(300)
+
+    def per_birth(fn):
+        engine = SajuEngine(*path)
+        t0 = time.perf_counter()
+        for b in births:
+            fn(engine, b)
+        return (time.perf_counter() - t0) / len(births) * 1000
+
+    t_each = per_birth(lambda e, b: [e.analyze(b, "M", "서울특별시", True, use_hap_correction=h,
+                                               use_johoo_correction=j, sections=OPTION_SECTIONS)
+                                     for h in (False, True) for j in (False, True)])
+    t_matrix = per_birth(lambda e, b: e.analyze_options(b, "M", "서울특별시"))
+    print(f"analyze 4회          : {t_each:6.3f}ms/건")
+    print(f"analyze_options      : {t_matrix:6.3f}ms/건")
+
+
+def bench_executor():
+    """async 핸들러: 50ms 대기(Gemini 대용) + analyze 를 블로킹 실행 vs 비동기 대기 + CPU 풀 (동시 20건, 루프 지연)"""
+    import asyncio
+    from executor import TaskExecutor
+    from saju_engine import SajuEngine
+
+    path = (BIN_FILE,) if os.path.exists(BIN_FILE) else (M_FILE, T_FILE)
+    engine = SajuEngine(*path)
+    births = _sample_births(20)
+
+    def blocking(b):
+        time.sleep(0.05)
+        return engine.analyze(b, "M", "서울특별시", True)
+
+    async def run(handler):
+        lags, done = [], False
+
+        async def heartbeat():
+            while not done:
+                t0 = time.perf_counter()
+                await asyncio.sleep(0.005)
+                lags.append(time.perf_counter() - t0 - 0.005)
+
+        beat = asyncio.create_task(heartbeat())
+        t0 = time.perf_counter()
+        await asyncio.gather(*(handler(b) for b in births))
+        total = time.perf_counter() - t0
+        done = True
+        await beat
+        return total * 1000, max(lags) * 1000
+
+    async def inline(b):
+        return blocking(b)
+
+    executor = TaskExecutor(engine=engine)
+
+    async def offloaded(b):
+        await asyncio.sleep(0.05)
+        return await executor.run_engine("bench", "analyze", birth_str=b, gender="M", location="서울특별시",
+                                         use_yajas_i=True)
+
+    for name, handler in (("직접 실행", inline), ("TaskExecutor", offloaded)):
+        total, lag = asyncio.run(run(handler))
+        print(f"{name:14s}: 전체 {total:7.1f}ms, 최대 루프 지연 {lag:7.1f}ms")
+    print(f"대기 시간 통계      : {executor.stats()['endpoints']['bench']}")
+    executor.shutdown()
+
+
+def _gemini_stand_in(delay=0.05, fail_first=0, text="## 총운\n테스트 응답입니다.\n", reply=None):
+    """generateContent 응답 형태를 흉내 내는 로컬 HTTP/1.1 서버 (keep-alive)
+
+    reply: 프롬프트 -> (지연 초, 응답 텍스트) 함수 (지정하면 delay/text 대신 사용)
+    URL 을 :streamGenerateContent 로 바꾸면 응답 텍스트를 SSE 조각으로 나눠 지연 시간에 걸쳐 보냄
+
+    Returns: (url, stats: {"connections", "requests"}, server) - server.shutdown() 으로 종료
+    """
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    stats = {"connections": 0, "requests": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True  # 헤더/본문을 따로 쓰므로 keep-alive 연결에서 지연 ACK 대기 방지
+
+        def setup(self):
+            super().setup()
+            with lock:
+                stats["connections"] += 1
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            with lock:
+                stats["requests"] += 1
+                failing = stats["requests"] <= fail_first
+            wait, answer = reply(body["contents"][0]["parts"][0]["text"]) if reply else (delay, text)
+            if ":streamGenerateContent" in self.path and not failing:
+                return self._stream(wait, answer)
+            time.sleep(wait)
+            if failing:
+                status, body = 503, {"error": {"code": 503, "status": "UNAVAILABLE"}}
+            else:
+                status, body = 200, {"candidates": [{"content": {"parts": [{"text": answer}], "role": "model"},
+                                                     "finishReason": "STOP"}]}
+            data = json.dumps(body, ensure_ascii=False).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=UTF-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _stream(self, wait, answer, size=40):
+            pieces = [answer[i:i + size] for i in range(0, len(answer), size)] or [""]
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for piece in pieces:
+                time.sleep(wait / len(pieces))
+                event = {"candidates": [{"content": {"parts": [{"text": piece}], "role": "model"}}]}
+                data = f"data: {json.dumps(event, ensure_ascii=False)}\r\n\r\n".encode()
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.write(b"0\r\n\r\n")
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        request_queue_size = 128  # 기본 5 는 동시 연결 8개에서 SYN 재전송(1초)이 생김
+        daemon_threads = True
+
+    server = Server(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1beta/models/stand-in:generateContent"
+    return url, stats, server
+
+
+def bench_gemini():
+    """Gemini 호출 40건 (로컬 대역 서버, 응답 50ms): urllib 요청마다 새 연결(스레드 8개) vs GeminiClient (동시 8)"""
+    import asyncio
+    import urllib.request
+    from concurrent.futures import ThreadPoolExecutor
+    from gemini_client import GeminiClient, extract_text
+
+    n, prompt = 40, "테스트 프롬프트"
+
+    url, stats, server = _gemini_stand_in()
+
+    def urllib_call(_):
+        data = json.dumps({"contents": [{"parts": [{"text": prompt}]}]}).encode()
+        req = urllib.request.Request(f"{url}?key=x", data=data, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(req, timeout=120) as response:
+            return extract_text(json.loads(response.read()))
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(8) as pool:
+        texts = list(pool.map(urllib_call, range(n)))
+    t_urllib, conn_urllib = time.perf_counter() - t0, stats["connections"]
+    assert all(texts)
+
+    stats["connections"] = 0
+    client = GeminiClient(api_key="x", url=url, max_concurrency=8)
+
+    async def run():
+        await client.generate(prompt)  # 연결 풀 생성 (첫 호출에만 SSL 컨텍스트 로드 ~0.2초)
+        t0 = time.perf_counter()
+        texts = await asyncio.gather(*(client.generate(prompt) for _ in range(n)))
+        elapsed = time.perf_counter() - t0
+        await client.aclose()
+        assert all(texts)
+        return elapsed
+
+    t_async = asyncio.run(run())
+    print(f"urllib (스레드 8)    : {t_urllib * 1000:7.1f}ms, 연결 {conn_urllib}개")
+    print(f"GeminiClient (동시 8): {t_async * 1000:7.1f}ms, 연결 {stats['connections']}개 (이벤트 루프 1개, 스레드 없음)")
+    server.shutdown()
+
+    # 재시도: 처음 2번은 503
+    url, stats, server = _gemini_stand_in(delay=0.0, fail_first=2)
+    client = GeminiClient(api_key="x", url=url, backoff=0.05)
+    text = asyncio.run(client.generate(prompt))
+    print(f"503 두 번 후 성공    : {text is not None}, {client.stats()}")
+    server.shutdown()
+
+
+def bench_lifetime():
+    """평생운세 생성 (로컬 대역 서버, 섹션당 0.2초 생성): 9개 한 번에 vs 섹션 묶음 동시 요청, 섹션 타임아웃"""
+    import asyncio
+    import re
+    import shutil
+    import tempfile
+    import lifetime_fortune as lf
+    from gemini_client import GeminiClient
+    from saju_engine import SajuEngine
+
+    slow = set()
+
+    def reply(prompt):
+        titles = re.findall(r"^\d+\. \*\*(.+?)\*\*", prompt, re.M)
+        wait = 0.2 * len(titles) + (2.0 if slow & set(titles) else 0.0)
+        return wait, "".join(f"## {t}\n{t} 본문입니다.\n\n" for t in titles)
+
+    url, stats, server = _gemini_stand_in(reply=reply)
+    path = (BIN_FILE,) if os.path.exists(BIN_FILE) else (M_FILE, T_FILE)
+    engine = SajuEngine(*path)
+    tmp = tempfile.mkdtemp()
+    lf.CACHE_DB_PATH = os.path.join(tmp, "lifetime_cache.db")
+    birth = "1990-05-17 10:30"
+
+    def run(label, **options):
+        gen = lf.LifetimeFortuneGenerator(engine, client=GeminiClient(api_key="x", url=url), **options)
+        gen.clear_cache()
+        start = stats["requests"]
+        t0 = time.perf_counter()
+        result = asyncio.run(gen.generate(birth, "M", "서울특별시", use_cache=False))
+        elapsed = (time.perf_counter() - t0) * 1000
+        filled = sum(bool(result.get(k)) for k in lf.SECTION_KEYS)
+        print(f"{label:22s}: {elapsed:7.1f}ms, 요청 {stats['requests'] - start}건, 섹션 {filled}/9"
+              + (f", 미완성 {result['missing_sections']}" if result.get("missing_sections") else ""))
+        return gen
+
+    try:
+        run("single (9개 한 번에)", mode="single")
+        run("parallel 묶음 3", mode="parallel", section_batch=3)
+        run("parallel 묶음 1", mode="parallel", section_batch=1)
+        # 느린 섹션 1개: 타임아웃 후 나머지만 반환, 다음 요청은 빠진 섹션만 생성
+        slow.add("재물운")
+        gen = run("parallel 느린 섹션", mode="parallel", section_batch=1, section_timeout=0.5)
+        slow.clear()
+        start = stats["requests"]
+        result = asyncio.run(gen.generate(birth, "M", "서울특별시", use_cache=False))
+        print(f"{'  다시 요청':22s}: 요청 {stats['requests'] - start}건, 미완성 {result.get('missing_sections', [])}")
+    finally:
+        server.shutdown()
+        shutil.rmtree(tmp)
+
+
+def bench_stream():
+    """평생운세 스트리밍 (로컬 대역 서버, 9개 섹션 2초에 걸쳐 생성): 첫 섹션까지 시간, 캐시 히트, 증분 파서 일치"""
+    import asyncio
+    import random
+    import shutil
+    import tempfile
+    import lifetime_fortune as lf
+    from gemini_client import GeminiClient
+    from saju_engine import SajuEngine
+
+    answer = "".join(f"## {title}\n" + f"{title} 본문입니다. " * 30 + "\n\n" for _, title, _ in lf.SECTIONS)
+    url, stats, server = _gemini_stand_in(reply=lambda prompt: (2.0, answer))
+    path = (BIN_FILE,) if os.path.exists(BIN_FILE) else (M_FILE, T_FILE)
+    tmp = tempfile.mkdtemp()
+    lf.CACHE_DB_PATH = os.path.join(tmp, "lifetime_cache.db")
+    gen = lf.LifetimeFortuneGenerator(SajuEngine(*path), client=GeminiClient(api_key="x", url=url), mode="single")
+    birth = "1990-05-17 10:30"
+
+    async def consume(use_cache):
+        t0 = time.perf_counter()
+        first, sections = None, {}
+        async for event, data in gen.stream(birth, "M", "서울특별시", use_cache=use_cache):
+            if event == "section":
+                first = first or (time.perf_counter() - t0) * 1000
+                sections[data["key"]] = data["content"]
+        return first, (time.perf_counter() - t0) * 1000, sections
+
+    try:
+        t0 = time.perf_counter()
+        full = asyncio.run(gen.generate(birth, "M", "서울특별시", use_cache=False))
+        print(f"generate (전체 대기)    : 첫 섹션 {(time.perf_counter() - t0) * 1000:7.1f}ms")
+        first, total, sections = asyncio.run(consume(False))
+        print(f"stream                  : 첫 섹션 {first:7.1f}ms, 전체 {total:7.1f}ms, "
+              f"섹션 {len(sections)}/9, generate 와 같음 {all(sections[k] == full[k] for k in lf.SECTION_KEYS)}")
+        first, total, sections = asyncio.run(consume(True))
+        print(f"stream (캐시 히트)      : 첫 섹션 {first:7.1f}ms, 전체 {total:7.1f}ms, 섹션 {len(sections)}/9")
+    finally:
+        server.shutdown()
+        shutil.rmtree(tmp)
+
+    # 증분 파서: 임의로 자른 조각을 넣어도 _parse_fortune_text(전체) 와 같은지
+    rng = random.Random(0)
+    texts = [answer, "제목 없는 응답", "## 총운\n본문\n## 재물운\n돈 ## 이야기\n#", "서문\n## 대운풀이 (현재)\n\n내용\n\n## 건강운\n끝"]
+    same = total_cases = 0
+    for _ in range(500):
+        text = rng.choice(texts)
+        cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(1, 30))))
+        parser = lf.SectionStreamParser()
+        for a, b in zip([0] + cuts, cuts + [len(text)]):
+            parser.feed(text[a:b])
+        parser.close()
+        same += parser.result() == gen._parse_fortune_text(text)
+        total_cases += 1
+    print(f"증분 파서 일치          : {same}/{total_cases}")
+
+
+def bench_coalesce():
+    """같은 사주 평생운세 20건 동시 요청 (로컬 대역 서버, 응답 0.5초): 호출마다 생성 vs single-flight (generate/stream 섞어서)"""
+    import asyncio
+    import shutil
+    import tempfile
+    import lifetime_fortune as lf
+    from gemini_client import GeminiClient
+    from saju_engine import SajuEngine
+
+    url, stats, server = _gemini_stand_in(delay=0.5)
+    path = (BIN_FILE,) if os.path.exists(BIN_FILE) else (M_FILE, T_FILE)
+    tmp = tempfile.mkdtemp()
+    lf.CACHE_DB_PATH = os.path.join(tmp, "lifetime_cache.db")
+    gen = lf.LifetimeFortuneGenerator(SajuEngine(*path), client=GeminiClient(api_key="x", url=url, max_concurrency=20),
+                                      mode="single")
+    birth = "1990-05-17 10:30"
+
+    async def burst(fn):
+        return await asyncio.gather(*(fn(i) for i in range(20)))
+
+    def run(label, fn):
+        gen.clear_cache()
+        start = stats["requests"]
+        t0 = time.perf_counter()
+        results = asyncio.run(burst(fn))
+        elapsed = (time.perf_counter() - t0) * 1000
+        same = all(r["overall"] == results[0]["overall"] for r in results)
+        print(f"{label:16s}: {elapsed:7.1f}ms, Gemini 요청 {stats['requests'] - start}건, 결과 같음 {same}, "
+              f"이름 유지 {[r['name'] for r in results[:2]]}")
+
+    try:
+        # single-flight 없이: 호출마다 _generate (캐시를 동시에 놓친 뒤 각자 INSERT OR REPLACE)
+        async def uncoalesced(i):
+            analysis, ilju_info = await gen._prepare(birth, "M", "서울특별시", "양력")
+            key = gen._generate_cache_key(analysis, ilju_info, "M")
+            result = await gen._generate(lf._Flight(), key, analysis, ilju_info, birth, "M")
+            return gen._personalize(result, f"회원{i}", birth, False)
+
+        run("호출마다 생성", uncoalesced)
+        run("single-flight", lambda i: gen.generate(birth, "M", "서울특별시", name=f"회원{i}"))
+
+        # 짝수는 stream, 홀수는 generate: 먼저 시작한 stream 의 생성에 모두 합류
+        async def mixed(i):
+            if i % 2:
+                await asyncio.sleep(0.01)
+                return await gen.generate(birth, "M", "서울특별시", name=f"회원{i}")
+            sections = {}
+            async for event, data in gen.stream(birth, "M", "서울특별시", name=f"회원{i}"):
+                if event == "section":
+                    sections[data["key"]] = data["content"]
+            return {"overall": sections.get("overall"), "name": f"회원{i}"}
+
+        run("stream+generate", mixed)
+        print(f"flight_stats    : {gen.flight_stats()}")
+    finally:
+        server.shutdown()
+        shutil.rmtree(tmp)
+
+
+def bench_fingerprint():
+    """평생운세 캐시 키: 생년월일시+성별 vs 원국 지문, 합성 출생 분포 2만 건의 캐시 적중률"""
+    import hashlib
+    import lifetime_fortune as lf
+    from datetime import datetime as dt, timedelta
+    from FortuneBridge import FortuneBridge
+    from saju_engine import SajuEngine
+
+    path = (BIN_FILE,) if os.path.exists(BIN_FILE) else (M_FILE, T_FILE)
+    engine = SajuEngine(*path)
+    bridge = FortuneBridge("./data/ilju_data.json")
+    gen = lf.LifetimeFortuneGenerator.__new__(lf.LifetimeFortuneGenerator)  # 키 계산만 (DB/클라이언트 없이)
+    rng = random.Random(0)
+    base, days = dt(1960, 1, 1), (dt(2005, 12, 31) - dt(1960, 1, 1)).days
+
+    def person():
+        t = base + timedelta(days=rng.randrange(days), minutes=rng.randrange(1440))
+        if rng.random() < 0.5:  # 절반은 시각을 30분 단위로 어림해서 입력
+            t = t.replace(minute=t.minute // 30 * 30)
+        return t, rng.choice("MF")
+
+    def requests(n, repeat):
+        """repeat: 이미 조회한 사람이 다시 조회하는 비율 (그중 절반은 시각을 ±30분 안에서 다르게 입력)"""
+        seen = []
+        for _ in range(n):
+            if seen and rng.random() < repeat:
+                t, gender = rng.choice(seen)
+                if rng.random() < 0.5:
+                    t += timedelta(minutes=rng.randint(-30, 30))
+            else:
+                t, gender = person()
+                seen.append((t, gender))
+            yield t.strftime("%Y-%m-%d %H:%M"), gender
+
+    fingerprints = {}
+
+    def fingerprint(birth, gender):
+        key = (birth, gender)
+        if key not in fingerprints:
+            analysis = engine.analyze(birth_str=birth, gender=gender, location="서울특별시",
+                                      use_yajas_i=True, calendar_type="양력")
+            fingerprints[key] = gen._generate_cache_key(analysis, bridge.get_ilju_report(analysis['ilju']), gender)
+        return fingerprints[key]
+
+    for label, repeat in (("새 방문자만", 0.0), ("재방문 30%", 0.3)):
+        for n in (2000, 20000):
+            old, new = set(), set()
+            old_hits = new_hits = 0
+            t0 = time.perf_counter()
+            for birth, gender in requests(n, repeat):
+                k_old = hashlib.md5(f"{birth}_{gender}".encode()).hexdigest()
+                k_new = fingerprint(birth, gender)
+                old_hits += k_old in old
+                new_hits += k_new in new
+                old.add(k_old)
+                new.add(k_new)
+            elapsed = (time.perf_counter() - t0) * 1000
+            print(f"{label} {n:6d}건: 적중률 생년월일시 {old_hits / n:6.1%} -> 원국 지문 {new_hits / n:6.1%} "
+                  f"(Gemini 호출 {len(old)} -> {len(new)}건, {elapsed / n:.3f}ms/건)")
+
+
+BENCHES = {
+    "load": bench_load,
+    "mmap": bench_mmap,
+    "lunar": bench_lunar,
+    "batch": bench_batch,
+    "sections": bench_sections,
+    "cache": bench_cache,
+    "tables": bench_tables,
+    "interactions": bench_interactions,
+    "corrections": bench_corrections,
+    "calendar": bench_calendar,
+    "luck": bench_luck,
+    "chart": bench_chart,
+    "hours": bench_hours,
+    "boundaries": bench_boundaries,
+    "options": bench_options,
+    "executor": bench_executor,
+    "gemini": bench_gemini,
+    "lifetime": bench_lifetime,
+    "stream": bench_stream,
+    "coalesce": bench_coalesce,
+    "fingerprint": bench_fingerprint,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHES)
+    for name in names:
+        print(f"\n📊 [{name}] {BENCHES[name].__doc__}")
+        BENCHES[name]()
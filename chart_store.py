@@ -0,0 +1,182 @@
+"""
+8글자 분석 결과 파일 (Offline chart result store)
+
+- analyze_chart 결과는 8글자 + 대운 방향 + 합/조후 옵션에만 의존하고, 도달 가능한 원국은
+  년 60 x 월 12 x 일 60 x 시 12 (+ 야자시/조자시로 생기는 시간 천간 변형)개로 유한함
+- 그 전체 결과를 미리 계산해 sqlite 파일 하나로 저장해 두면, 요청 시에는 기둥과 대운수만 계산
+- 키: ((Chart.key * 2 + 순행) * 2 + 합) * 2 + 조후, 값: JSON 을 공용 사전(zdict)으로 deflate 압축
+  (결과마다 키 이름/문구가 반복되므로 샘플 결과로 만든 사전을 쓰면 건당 ~7KB -> ~0.5KB)
+- 입절 경계의 드문 년/월 조합 등 목록에 없는 원국은 요청 시 계산
+- 읽기 전용으로 열어 여러 워커가 같은 파일(페이지 캐시)을 공유
+- meta 에 결과를 만든 코드(SOURCE_MODULES)의 해시를 저장하고, 지금 코드와 다르면 파일을 쓰지 않음
+  (상수/신살/용신/점수 로직이 바뀌면 다시 생성해야 함)
+
+생성 (오프라인, 옵션 조합 1개당 1,296,000건 / 약 0.7GB):
+  python chart_store.py ./data/manse_data.bin ./data/chart_store.sqlite [00 01 10 11]
+  옵션 조합은 "합 조후" 순서의 0/1 (예: "10" = 합 보정만), 생략 시 4가지 전부
+"""
+
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+
+import saju_constants as sc
+from pillar_calc import ganzi_index
+from saju_chart import Chart
+
+
+# analyze_chart 결과를 만드는 모듈: 하나라도 바뀌면 저장된 결과는 쓰지 않음
+SOURCE_MODULES = ("saju_engine.py", "saju_constants.py", "saju_chart.py", "saju_interactions.py", "luck_table.py")
+STORE_FORMAT = 1  # 키/압축 형식 버전
+
+_code_version = None
+
+
+def code_version() -> str:
+    """파일 형식 버전 + SOURCE_MODULES 소스의 해시"""
+    global _code_version
+    if _code_version is None:
+        h = hashlib.sha256(str(STORE_FORMAT).encode())
+        base = os.path.dirname(os.path.abspath(__file__))
+        for name in SOURCE_MODULES:
+            with open(os.path.join(base, name), 'rb') as f:
+                h.update(f.read())
+        _code_version = h.hexdigest()[:16]
+    return _code_version
+
+
+def _compress(zdict: bytes, data: bytes) -> bytes:
+    c = zlib.compressobj(9, zlib.DEFLATED, -15, 9, zlib.Z_DEFAULT_STRATEGY, zdict)
+    return c.compress(data) + c.flush()
+
+
+def _dumps(analysis: dict) -> bytes:
+    return json.dumps(analysis, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def store_key(chart_key: int, is_fwd: bool, hap: bool, johoo: bool) -> int:
+    return ((chart_key * 2 + bool(is_fwd)) * 2 + bool(hap)) * 2 + bool(johoo)
+
+
+def _jasi_hour_branches():
+    """야자시/조자시(원본 23:00~00:59)가 경도/역사 보정 후 들 수 있는 시지
+
+    이 시지들은 시간 천간을 다음 날 일간 기준으로 정하는 경우가 있습니다.
+    """
+    lng_offs = {int(round((lng - 135) * 4)) for lng in list(sc.CITY_DATA.values()) + [sc.DEFAULT_LNG]}
+    hist_offs = {0, 30, -60, -30}
+    return sorted({((raw + lng + hist + 60) // 120) % 12
+                   for lng in lng_offs for hist in hist_offs for raw in range(23 * 60, 25 * 60)})
+
+
+def reachable_charts():
+    """만세력으로 만들어질 수 있는 모든 원국 (Chart.key 오름차순)"""
+    jasi_branches = _jasi_hour_branches()
+    for y in range(60):
+        m_start = ((y % 10) * 2 + 2) % 10  # 월두법: 인월 천간
+        months = sorted(ganzi_index((m_start + i) % 10, (2 + i) % 12) for i in range(12))
+        for m in months:
+            for d in range(60):
+                day_start, next_start = sc.HG_START_IDX[sc.STEMS[d % 10]], sc.HG_START_IDX[sc.STEMS[(d + 1) % 10]]
+                hours = {ganzi_index((day_start + h) % 10, h) for h in range(12)}
+                hours.update(ganzi_index((next_start + h) % 10, h) for h in jasi_branches)
+                for h in sorted(hours):
+                    yield Chart.from_key(((y * 60 + m) * 60 + d) * 60 + h)
+
+
+class ChartStore:
+    """오프라인 생성된 analyze_chart 전체 결과 조회 (읽기 전용)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.zdict = self._conn.execute("SELECT value FROM meta WHERE name = 'zdict'").fetchone()[0]
+        row = self._conn.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+        self.version = row[0] if row else None
+
+    @classmethod
+    def open(cls, path: str):
+        """파일이 있고 지금 코드로 만든 것이면 ChartStore, 아니면 None"""
+        if not os.path.exists(path):
+            return None
+        store = cls(path)
+        if store.version != code_version():
+            print(f"⚠️ 원국 결과 파일을 사용하지 않습니다 (코드 버전 {store.version} != {code_version()}, "
+                  f"python chart_store.py 로 다시 생성하세요): {path}")
+            store.close()
+            return None
+        return store
+
+    def get(self, chart, is_fwd, hap, johoo):
+        """analyze_chart(sections=None) 과 같은 dict, 파일에 없으면 None"""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM charts WHERE k = ?",
+                                     (store_key(chart.key, is_fwd, hap, johoo),)).fetchone()
+        if row is None:
+            return None
+        return json.loads(zlib.decompressobj(-15, zdict=self.zdict).decompress(row[0]))
+
+    def close(self):
+        self._conn.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM charts").fetchone()[0]
+
+
+def build(engine, out_file: str, options=((False, False), (True, False), (False, True), (True, True)),
+          charts=None, limit=None):
+    """원국 목록(기본: 도달 가능한 전체) x 대운 방향 x options 의 analyze_chart 결과를 out_file 에 저장"""
+    charts = list(reachable_charts() if charts is None else charts)
+    # 압축 사전: 임의 원국 결과를 이어 붙인 끝 32KB (deflate 창 크기)
+    sample = random.Random(0).sample(charts, min(64, len(charts)))
+    zdict = b"".join(_dumps(engine._analyze_chart(c, i % 2 == 0, *options[i % len(options)]))
+                     for i, c in enumerate(sample))[-32768:]
+
+    conn = sqlite3.connect(out_file)
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value BLOB NOT NULL)")
+    conn.execute("CREATE TABLE IF NOT EXISTS charts (k INTEGER PRIMARY KEY, data BLOB NOT NULL)")
+    conn.execute("DELETE FROM charts")  # 사전이 바뀌면 기존 행은 풀 수 없으므로 새로 생성
+    conn.execute("INSERT OR REPLACE INTO meta VALUES ('zdict', ?)", (zdict,))
+    conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (code_version(),))
+    t0, count, batch, charts_total = time.time(), 0, [], len(charts)
+    for chart in charts:
+        for is_fwd in (False, True):
+            for hap, johoo in options:
+                data = _compress(zdict, _dumps(engine._analyze_chart(chart, is_fwd, hap, johoo)))
+                batch.append((store_key(chart.key, is_fwd, hap, johoo), data))
+        count += 1
+        if len(batch) >= 10000:
+            conn.executemany("INSERT OR REPLACE INTO charts VALUES (?, ?)", batch)
+            conn.commit()
+            batch.clear()
+            if charts_total > 10000:
+                print(f"  {count:,}/{charts_total:,}개 원국 ({time.time() - t0:.0f}s)")
+        if limit and count >= limit:
+            break
+    conn.executemany("INSERT OR REPLACE INTO charts VALUES (?, ?)", batch)
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+    return count
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("사용법: python chart_store.py <manse_data.bin | manse_data.json term_data.json> <출력.sqlite> [00 01 10 11]")
+        sys.exit(1)
+    from saju_engine import SajuEngine
+
+    args = sys.argv[1:]
+    data_files = args[:2] if args[0].endswith(".json") else args[:1]
+    out, opts = args[len(data_files)], args[len(data_files) + 1:] or ["00", "10", "01", "11"]
+    engine = SajuEngine(*data_files, chart_store=None)
+    n = build(engine, out, options=[(o[0] == "1", o[1] == "1") for o in opts])
+    print(f"✅ 원국 결과 파일 생성 완료: {out} (원국 {n:,}개 x 대운 방향 2 x 옵션 {len(opts)})")
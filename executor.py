@@ -0,0 +1,265 @@
+"""
+비동기 핸들러용 작업 실행기 (Executor layer for async FastAPI handlers)
+
+- async 핸들러 안에서 동기 엔진 분석을 직접 실행하면 이벤트 루프 전체가 멈추므로 분석은 CPU 풀로 넘깁니다
+- CPU 풀: "thread"(기본, 엔진 캐시를 프로세스 안에서 공유) 또는 "process"(워커마다 엔진을 mmap 으로 로드)
+- 풀마다 대기 + 실행 중 작업 수 상한(queue depth)을 넘으면 바로 ExecutorBusy (핸들러에서 503)
+  풀 작업은 기다리던 요청이 끊겨도 끝날 때까지 실행되므로 작업이 실제로 끝날 때 자리를 돌려줌
+- 엔드포인트별 동시 실행 수 제한 (asyncio.Semaphore)
+- 엔드포인트별 대기 시간(동시 실행 제한 + 풀 대기) / 실행 시간 통계 (stats)
+- 이미 비동기인 작업(Gemini 호출 등)은 풀 없이 대기열 상한/동시 실행 제한/통계만 적용 (run_async)
+- async generator(SSE 스트리밍 등)는 끝날 때까지 대기열 자리와 동시 실행 슬롯을 잡아 둠 (open_stream)
+
+환경 변수:
+  SAJU_CPU_EXECUTOR      thread | process (기본 thread)
+  SAJU_CPU_WORKERS       CPU 풀 워커 수 (기본 CPU 코어 수)
+  SAJU_EXECUTOR_QUEUE    풀마다 받아 둘 수 있는 최대 작업 수 (기본 256)
+  SAJU_ENDPOINT_LIMITS   엔드포인트별 동시 실행 수 (예: "lifetime_web=4,lifetime_fortune=4")
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# 엔드포인트별 기본 동시 실행 수 (없으면 제한 없음, 풀 크기와 queue depth 만 적용)
+DEFAULT_ENDPOINT_LIMITS = {"lifetime_web": 4, "lifetime_fortune": 4}
+# 대기 시간 백분위 계산에 쓰는 최근 표본 수
+WAIT_SAMPLES = 1024
+
+# process 모드 워커 프로세스의 엔진 (initializer 에서 생성)
+_worker_engine = None
+
+
+class ExecutorBusy(Exception):
+    """풀의 대기열이 가득 차 작업을 받지 않음"""
+
+
+def _init_worker(engine_args):
+    """process 모드 워커 초기화: 워커마다 엔진 1개 (manse_data.bin 이면 mmap 페이지 공유)"""
+    global _worker_engine
+    from saju_engine import SajuEngine
+    _worker_engine = SajuEngine(*engine_args)
+
+
+def _timed(fn, args, kwargs):
+    """(시작 시각, 결과) 반환: 시작 시각은 프로세스 간 비교 가능한 time.monotonic"""
+    return time.monotonic(), fn(*args, **kwargs)
+
+
+def _timed_engine_call(method, kwargs):
+    """process 모드: 워커 엔진의 메서드 호출"""
+    return time.monotonic(), getattr(_worker_engine, method)(**kwargs)
+
+
+def parse_limits(text):
+    """"name=4,other=2" -> {"name": 4, "other": 2}"""
+    limits = {}
+    for item in (text or "").split(","):
+        if "=" in item:
+            name, value = item.split("=", 1)
+            limits[name.strip()] = int(value)
+    return limits
+
+
+class EndpointStats:
+    """엔드포인트 1개의 호출/거절 수, 대기/실행 시간"""
+
+    __slots__ = ("calls", "rejected", "running", "wait_total", "wait_max", "run_total", "waits")
+
+    def __init__(self):
+        self.calls = self.rejected = self.running = 0
+        self.wait_total = self.wait_max = self.run_total = 0.0
+        self.waits = deque(maxlen=WAIT_SAMPLES)
+
+    def record(self, wait, run):
+        self.calls += 1
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+        self.run_total += run
+        self.waits.append(wait)
+
+    def to_dict(self):
+        waits = sorted(self.waits)
+        p = lambda q: round(waits[min(len(waits) - 1, int(len(waits) * q))] * 1000, 3) if waits else 0.0
+        return {
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "running": self.running,
+            "wait_ms_avg": round(self.wait_total / self.calls * 1000, 3) if self.calls else 0.0,
+            "wait_ms_p50": p(0.5),
+            "wait_ms_p95": p(0.95),
+            "wait_ms_max": round(self.wait_max * 1000, 3),
+            "run_ms_avg": round(self.run_total / self.calls * 1000, 3) if self.calls else 0.0,
+        }
+
+
+class TaskExecutor:
+    """CPU 풀 + 엔드포인트별 동시 실행 제한 + 대기 시간 통계"""
+
+    def __init__(self, engine=None, engine_args=None, cpu_mode="thread", cpu_workers=None, max_queue=256,
+                 limits=None):
+        """
+        Args:
+            engine: thread 모드에서 쓰는 엔진 (프로세스 안 캐시 공유)
+            engine_args: process 모드 워커가 SajuEngine(*engine_args) 로 엔진을 만들 때 쓰는 인자
+            limits: {엔드포인트 이름: 동시 실행 수}
+        """
+        if cpu_mode not in ("thread", "process"):
+            raise ValueError(f"cpu_mode 는 thread/process 중 하나여야 합니다: {cpu_mode}")
+        if cpu_mode == "process" and engine_args is None:
+            raise ValueError("process 모드에는 engine_args 가 필요합니다.")
+        self.engine = engine
+        self.cpu_mode = cpu_mode
+        self.cpu_workers = cpu_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.limits = dict(limits or {})
+        if cpu_mode == "process":
+            self._cpu_pool = ProcessPoolExecutor(
+                max_workers=self.cpu_workers, mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker, initargs=(tuple(engine_args),))
+        else:
+            self._cpu_pool = ThreadPoolExecutor(max_workers=self.cpu_workers, thread_name_prefix="saju-cpu")
+        self._pending = {"cpu": 0, "async": 0}
+        self._semaphores = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, engine=None, engine_args=None):
+        """SAJU_* 환경 변수로 설정한 실행기"""
+        workers = int(os.environ.get("SAJU_CPU_WORKERS", "0"))
+        return cls(engine=engine, engine_args=engine_args,
+                   cpu_mode=os.environ.get("SAJU_CPU_EXECUTOR", "thread"),
+                   cpu_workers=workers or None,
+                   max_queue=int(os.environ.get("SAJU_EXECUTOR_QUEUE", "256")),
+                   limits={**DEFAULT_ENDPOINT_LIMITS, **parse_limits(os.environ.get("SAJU_ENDPOINT_LIMITS"))})
+
+    def _endpoint(self, name):
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = EndpointStats()
+            limit = self.limits.get(name)
+            if limit:
+                self._semaphores[name] = asyncio.Semaphore(limit)
+        return stats
+
+    async def _run(self, kind, endpoint, start):
+        """대기열 확인 -> 엔드포인트 동시 실행 제한 -> 실행, 대기/실행 시간 기록
+
+        start: kind 가 "async" 이면 (시작 시각, 결과) 를 돌려주는 코루틴을, 아니면 풀에 제출한
+               concurrent.futures.Future 를 돌려주는 함수
+        풀 작업은 기다리던 쪽이 취소돼도(클라이언트 연결 끊김) 이미 시작했으면 계속 실행되므로, 대기열 자리와
+        동시 실행 슬롯은 풀 future 의 완료 콜백에서 돌려줍니다.
+        """
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            if self._pending[kind] >= self.max_queue:
+                stats.rejected += 1
+                raise ExecutorBusy("요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해 주세요.")
+            self._pending[kind] += 1
+        t0 = time.monotonic()
+        semaphore = self._semaphores.get(endpoint)
+        loop = asyncio.get_running_loop()
+
+        def release(held=True):
+            if held:
+                stats.running -= 1
+                if semaphore is not None:
+                    semaphore.release()
+            with self._lock:
+                self._pending[kind] -= 1
+
+        try:
+            if semaphore is not None:
+                await semaphore.acquire()
+        except BaseException:
+            release(held=False)
+            raise
+        stats.running += 1
+        try:
+            work = start()
+        except BaseException:
+            release()
+            raise
+        if kind == "async":
+            try:
+                started, result = await work
+            finally:
+                release()
+        else:
+            work.add_done_callback(lambda _: loop.call_soon_threadsafe(release))
+            started, result = await asyncio.wrap_future(work)
+        stats.record(started - t0, time.monotonic() - started)
+        return result
+
+    async def run_engine(self, endpoint, method, **kwargs):
+        """엔진 메서드(analyze 등)를 CPU 풀에서 실행"""
+        if self.cpu_mode == "process":
+            return await self._run("cpu", endpoint,
+                                   lambda: self._cpu_pool.submit(_timed_engine_call, method, kwargs))
+        fn = getattr(self.engine, method)
+        return await self._run("cpu", endpoint, lambda: self._cpu_pool.submit(_timed, fn, (), kwargs))
+
+    async def run_async(self, endpoint, fn, *args, **kwargs):
+        """코루틴 함수 fn 을 이벤트 루프에서 실행 (풀 없이 대기열 상한/동시 실행 제한/통계만)"""
+        async def start():
+            return time.monotonic(), await fn(*args, **kwargs)
+        return await self._run("async", endpoint, start)
+
+    def open_stream(self, endpoint, fn, *args, **kwargs):
+        """async generator 함수 fn 을 run_async 와 같은 대기열 상한/동시 실행 제한/통계 아래에서 실행
+
+        대기열이 가득 찼는지는 바로 확인하므로(가득 차면 여기서 ExecutorBusy) 응답을 시작하기 전에 503 을
+        보낼 수 있습니다. 대기열 자리와 동시 실행 슬롯은 generator 를 처음 돌릴 때 잡아 끝나거나 닫힐 때까지
+        유지합니다 (한 번도 돌지 않고 버려진 스트림이 자리를 남기지 않도록). 실행 시간은 스트림 전체 길이로 기록합니다.
+        """
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            if self._pending["async"] >= self.max_queue:
+                stats.rejected += 1
+                raise ExecutorBusy("요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해 주세요.")
+        return self._stream(endpoint, stats, fn, args, kwargs, time.monotonic())
+
+    async def _stream(self, endpoint, stats, fn, args, kwargs, t0):
+        with self._lock:
+            self._pending["async"] += 1
+        semaphore = self._semaphores.get(endpoint)
+        agen = fn(*args, **kwargs)
+        try:
+            if semaphore is not None:
+                await semaphore.acquire()
+            try:
+                stats.running += 1
+                started = time.monotonic()
+                try:
+                    async for item in agen:
+                        yield item
+                finally:
+                    stats.running -= 1
+                    stats.record(started - t0, time.monotonic() - started)
+                    await agen.aclose()
+            finally:
+                if semaphore is not None:
+                    semaphore.release()
+        finally:
+            with self._lock:
+                self._pending["async"] -= 1
+
+    def stats(self):
+        """{"cpu_mode", "cpu_workers", "max_queue", "pending": {"cpu", "async"}, "endpoints": {이름: 통계}}"""
+        with self._lock:
+            return {
+                "cpu_mode": self.cpu_mode,
+                "cpu_workers": self.cpu_workers,
+                "max_queue": self.max_queue,
+                "pending": dict(self._pending),
+                "limits": dict(self.limits),
+                "endpoints": {name: s.to_dict() for name, s in self._stats.items()},
+            }
+
+    def shutdown(self, wait=True):
+        self._cpu_pool.shutdown(wait=wait)
@@ -84,6 +84,11 @@ class FortuneGenerator:
         "인성": ["편인", "정인"]
     }
     
+    # generate_daily_fortune 이 참조하는 analyze() 결과 키 (analyze(sections=...) 에 전달)
+    REQUIRED_SECTIONS = frozenset({
+        "birth", "me", "me_elem", "pillars", "power", "interactions", "yongsin_detail", "current_trace"
+    })
+    
     # 요일 한글 매핑
     WEEKDAYS_KO = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
     
@@ -0,0 +1,191 @@
+"""
+Gemini generateContent 비동기 클라이언트 (asyncio + httpx)
+
+- 요청마다 TCP/TLS 연결을 새로 열지 않고 keep-alive 연결 풀을 재사용
+- 연결/응답 타임아웃, 동시 요청 수 제한 (asyncio.Semaphore)
+- 429/5xx/네트워크 오류는 지수 백오프(+지터)로 재시도, Retry-After 헤더가 있으면 우선
+- 이벤트 루프마다 연결 풀을 따로 만듦 (스크립트에서 asyncio.run 을 여러 번 호출해도 안전)
+- stream_generate: streamGenerateContent(SSE) 로 생성되는 텍스트를 조각 단위로 받음
+
+환경 변수:
+  GEMINI_API_KEY          API 키 (필수, 코드에 기본값 없음 - 없으면 호출하지 않고 실패로 처리)
+  GEMINI_API_URL          generateContent URL (로컬 대역 서버로 바꿔 시험할 때)
+  GEMINI_TIMEOUT          응답 타임아웃 초 (기본 120)
+  GEMINI_MAX_CONCURRENCY  동시 요청 수 (기본 8)
+  GEMINI_MAX_RETRIES      재시도 횟수 (기본 3)
+"""
+
+import asyncio
+import json
+import os
+import random
+from typing import Optional
+
+import httpx
+
+GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")
+GEMINI_MODEL = "gemini-2.5-flash"
+GEMINI_API_URL = os.environ.get(
+    "GEMINI_API_URL", f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:generateContent")
+
+# 재시도할 HTTP 상태 (요청 한도 초과, 서버 일시 오류)
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class GeminiError(Exception):
+    """스트리밍 생성 실패 (재시도 후에도 실패했거나 응답 도중 끊김)"""
+
+
+def extract_text(result: dict) -> Optional[str]:
+    """generateContent 응답에서 첫 후보의 텍스트 (없으면 None)"""
+    candidates = result.get("candidates") or []
+    if candidates:
+        parts = candidates[0].get("content", {}).get("parts", [])
+        if parts:
+            return parts[0].get("text", "")
+    return None
+
+
+class GeminiClient:
+    """generateContent 호출용 비동기 클라이언트 (연결 풀 + 동시 요청 제한 + 재시도)"""
+
+    def __init__(self, api_key: str = None, url: str = GEMINI_API_URL,
+                 timeout: float = None, connect_timeout: float = 10.0, max_concurrency: int = None,
+                 max_retries: int = None, backoff: float = 1.0, max_backoff: float = 30.0,
+                 max_connections: int = 16):
+        self.api_key = api_key or GEMINI_API_KEY
+        if not self.api_key:
+            print("⚠️ GEMINI_API_KEY 가 설정되지 않아 Gemini 호출은 모두 실패합니다.")
+        self.url = url
+        self.timeout = timeout or float(os.environ.get("GEMINI_TIMEOUT", "120"))
+        self.connect_timeout = connect_timeout
+        self.max_concurrency = max_concurrency or int(os.environ.get("GEMINI_MAX_CONCURRENCY", "8"))
+        self.max_retries = int(os.environ.get("GEMINI_MAX_RETRIES", "3")) if max_retries is None else max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_connections = max_connections
+        self._loops = {}  # 이벤트 루프 -> (httpx.AsyncClient, asyncio.Semaphore)
+        self.requests = self.retries = self.failures = 0
+
+    def _session(self):
+        """현재 이벤트 루프용 (연결 풀, 세마포어)"""
+        loop = asyncio.get_running_loop()
+        session = self._loops.get(loop)
+        if session is None:
+            # 닫힌 루프의 풀은 버림 (그 루프에서만 쓸 수 있음)
+            self._loops = {lp: s for lp, s in self._loops.items() if not lp.is_closed()}
+            client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections))
+            session = self._loops[loop] = (client, asyncio.Semaphore(self.max_concurrency))
+        return session
+
+    def _delay(self, attempt: int, response=None) -> float:
+        """재시도 대기 시간: Retry-After(초) 우선, 없으면 backoff * 2^attempt + 지터"""
+        if response is not None:
+            retry_after = response.headers.get("retry-after", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        return min(self.backoff * (2 ** attempt) + random.uniform(0, self.backoff), self.max_backoff)
+
+    async def generate_content(self, prompt: str, temperature: float = 0.7,
+                               max_output_tokens: int = 8192) -> Optional[dict]:
+        """generateContent 원본 응답 (JSON dict), 재시도 후에도 실패하면 None"""
+        payload = {
+            "contents": [{"parts": [{"text": prompt}]}],
+            "generationConfig": {"temperature": temperature, "maxOutputTokens": max_output_tokens},
+        }
+        if not self.api_key:
+            print("Gemini API 호출 불가: GEMINI_API_KEY 가 설정되지 않았습니다.")
+            self.failures += 1
+            return None
+        client, semaphore = self._session()
+        async with semaphore:
+            for attempt in range(self.max_retries + 1):
+                self.requests += 1
+                response = None
+                try:
+                    response = await client.post(self.url, params={"key": self.api_key}, json=payload)
+                    if response.status_code == 200:
+                        return response.json()
+                    if response.status_code not in RETRY_STATUS:
+                        print(f"Gemini API 오류 {response.status_code}: {response.text[:200]}")
+                        break
+                    print(f"Gemini API 일시 오류 {response.status_code} (시도 {attempt + 1})")
+                except (httpx.TransportError, ValueError) as e:
+                    print(f"Gemini API 호출 실패 (시도 {attempt + 1}): {e!r}")
+                if attempt < self.max_retries:
+                    self.retries += 1
+                    await asyncio.sleep(self._delay(attempt, response))
+        self.failures += 1
+        return None
+
+    async def generate(self, prompt: str, **kwargs) -> Optional[str]:
+        """프롬프트 -> 생성된 텍스트 (실패 시 None)"""
+        result = await self.generate_content(prompt, **kwargs)
+        if result is None:
+            return None
+        text = extract_text(result)
+        if text is None:
+            print(f"API 응답 오류: {result}")
+        return text
+
+    async def stream_generate(self, prompt: str, temperature: float = 0.7, max_output_tokens: int = 8192):
+        """streamGenerateContent(SSE) 로 생성 텍스트를 조각 단위로 내보내는 async generator
+
+        첫 조각을 받기 전의 오류만 재시도합니다 (이미 내보낸 텍스트는 되돌릴 수 없음).
+        최종 실패나 응답 도중 끊김은 GeminiError.
+        """
+        payload = {
+            "contents": [{"parts": [{"text": prompt}]}],
+            "generationConfig": {"temperature": temperature, "maxOutputTokens": max_output_tokens},
+        }
+        if not self.api_key:
+            self.failures += 1
+            raise GeminiError("GEMINI_API_KEY 가 설정되지 않았습니다.")
+        url = self.url.replace(":generateContent", ":streamGenerateContent")
+        client, semaphore = self._session()
+        async with semaphore:
+            for attempt in range(self.max_retries + 1):
+                self.requests += 1
+                response = None
+                received = False
+                try:
+                    async with client.stream("POST", url, params={"key": self.api_key, "alt": "sse"},
+                                             json=payload) as response:
+                        if response.status_code == 200:
+                            async for line in response.aiter_lines():
+                                if not line.startswith("data:"):
+                                    continue
+                                text = extract_text(json.loads(line[5:]))
+                                if text:
+                                    received = True
+                                    yield text
+                            return
+                        body = (await response.aread()).decode(errors="replace")
+                        if response.status_code not in RETRY_STATUS:
+                            print(f"Gemini API 오류 {response.status_code}: {body[:200]}")
+                            break
+                        print(f"Gemini API 일시 오류 {response.status_code} (시도 {attempt + 1})")
+                except (httpx.TransportError, ValueError) as e:
+                    if received:
+                        self.failures += 1
+                        raise GeminiError(f"스트리밍 응답이 끊겼습니다: {e!r}") from e
+                    print(f"Gemini API 호출 실패 (시도 {attempt + 1}): {e!r}")
+                if attempt < self.max_retries:
+                    self.retries += 1
+                    await asyncio.sleep(self._delay(attempt, response))
+        self.failures += 1
+        raise GeminiError("AI 응답 생성 실패")
+
+    async def aclose(self):
+        """현재 이벤트 루프의 연결 풀 닫기"""
+        session = self._loops.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session[0].aclose()
+
+    def stats(self):
+        """{"requests", "retries", "failures", "max_concurrency"}"""
+        return {"requests": self.requests, "retries": self.retries, "failures": self.failures,
+                "max_concurrency": self.max_concurrency}
@@ -0,0 +1,66 @@
+"""
+프로세스 내 LRU 캐시 (In-process bounded LRU cache)
+
+- 최대 개수(maxsize)를 넘으면 가장 오래 사용하지 않은 항목부터 제거
+- 적중/실패/제거 횟수를 세어 크기 튜닝에 사용 (stats)
+- FastAPI 동기 핸들러는 스레드 풀에서 실행되므로 Lock 으로 보호
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """크기 제한 LRU 캐시 (maxsize=0 이면 캐시하지 않음)"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        """값 조회 (적중 시 최근 사용으로 갱신)"""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def peek(self, key, default=None):
+        """통계와 사용 순서를 바꾸지 않고 조회"""
+        with self._lock:
+            return self._data.get(key, default)
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """{"size", "maxsize", "hits", "misses", "evictions", "hit_rate"}"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
@@ -0,0 +1,112 @@
+"""
+세운(연운)/월운 조회 테이블 (Precomputed yearly/monthly luck table)
+
+- 세운 항목은 (일간, 연도), 월운 12개월은 (일간, 해당 연도 천간)에만 의존하므로
+  import 시 1900~2100년 x 일간 10개를 한 번 만들어 두고 조회만 함
+- 결과는 공유 객체이므로 수정할 수 없는 FrozenDict 와 tuple 로 반환
+- 범위 밖 연도의 세운은 요청 시 계산 (결과 형태는 같음)
+"""
+
+from manse_store import SIXTY_GANZI
+from saju_chart import CHAR_ELEM, CHAR_INDEX, CHAR_KOR, CHARS, ELEMENTS, TEN_GOD_TABLE, UNSEONG_TABLE
+
+START_YEAR, END_YEAR = 1900, 2100
+
+
+class FrozenDict(dict):
+    """수정할 수 없는 dict (json/jinja 에서는 일반 dict 와 동일하게 동작)"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("공유 테이블 항목은 수정할 수 없습니다. dict(항목) 으로 복사해서 사용하세요.")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __ior__ = _readonly
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+    def __hash__(self):
+        return hash(frozenset(self.items()))
+
+
+def year_ganzi(year: int) -> int:
+    """연도의 60갑자 인덱스 (2023년 = 계묘 39)"""
+    return (year - 2023 + 39) % 60
+
+
+def _yeonun_entry(me: int, year: int) -> FrozenDict:
+    ten_gods, unseong = TEN_GOD_TABLE[me], UNSEONG_TABLE[me]
+    g = year_ganzi(year)
+    s_i, b_i = g % 10, g % 12
+    return FrozenDict({
+        "year": year,
+        "ganzi": SIXTY_GANZI[g],         # 한자 원문 (예: '癸卯')
+        "gan_kor": CHAR_KOR[s_i],        # 한글 (예: '계')
+        "gan_elem": ELEMENTS[CHAR_ELEM[s_i]],
+        "t_gan": ten_gods[s_i],          # 천간 십성
+        "ji": CHARS[10 + b_i],           # 지지 한자 원문
+        "ji_kor": CHAR_KOR[10 + b_i],    # 지지 한글
+        "ji_elem": ELEMENTS[CHAR_ELEM[10 + b_i]],
+        "t_ji": ten_gods[10 + b_i],      # 지지 십성
+        "unseong": unseong[b_i],         # 12운성
+    })
+
+
+def _wolun_entries(me: int, year_stem: int) -> tuple:
+    """포스텔러 방식: 양력 1월(전년도 축월) ~ 12월(당해년도 자월), 12월부터 내림차순"""
+    ten_gods, unseong = TEN_GOD_TABLE[me], UNSEONG_TABLE[me]
+
+    def month_entry(month, s_i, b_i):
+        return FrozenDict({
+            "month": month,
+            "ganzi": CHARS[s_i] + CHARS[10 + b_i],
+            "gan_kor": CHAR_KOR[s_i],
+            "gan_elem": ELEMENTS[CHAR_ELEM[s_i]],
+            "t_gan": ten_gods[s_i],
+            "ji_kor": CHAR_KOR[10 + b_i],
+            "ji_elem": ELEMENTS[CHAR_ELEM[10 + b_i]],
+            "t_ji": ten_gods[10 + b_i],
+            "unseong": unseong[b_i],
+        })
+
+    # 연두법: 당해년도 인월(양력 2월) ~ 자월(양력 12월) 11개 달
+    start = (year_stem * 2 + 2) % 10
+    months = [month_entry(i + 2, (start + i) % 10, (2 + i) % 12) for i in range(11)]
+    # 전년도 축월 (양력 1월)
+    prev_start = (((year_stem - 1) % 10) * 2 + 2) % 10
+    months.append(month_entry(1, (prev_start + 11) % 10, 1))
+    return tuple(sorted(months, key=lambda m: m["month"], reverse=True))
+
+
+class LuckTable:
+    """일간별 세운/월운 조회표"""
+
+    def __init__(self, start_year: int = START_YEAR, end_year: int = END_YEAR):
+        self.start_year, self.end_year = start_year, end_year
+        # [일간 10][연도 - start_year] -> 세운 항목
+        self.years = tuple(
+            tuple(_yeonun_entry(me, y) for y in range(start_year, end_year + 1)) for me in range(10)
+        )
+        # [일간 10][연도 천간 10] -> 월운 12개월
+        self.months = tuple(tuple(_wolun_entries(me, s) for s in range(10)) for me in range(10))
+
+    def year_entry(self, me: int, year: int) -> FrozenDict:
+        if self.start_year <= year <= self.end_year:
+            return self.years[me][year - self.start_year]
+        return _yeonun_entry(me, year)
+
+    def yeonun(self, me_gan: str, birth_year, daeun_start_age) -> tuple:
+        """대운 10년치 세운 (최신 연도가 앞), me_gan: 일간 한자"""
+        me = CHAR_INDEX[me_gan]
+        start = int(birth_year) + int(daeun_start_age) - 1
+        if self.start_year <= start and start + 9 <= self.end_year:
+            lo = start - self.start_year
+            return self.years[me][lo:lo + 10][::-1]
+        return tuple(self.year_entry(me, y) for y in range(start + 9, start - 1, -1))
+
+    def wolun(self, me_gan: str, target_year) -> tuple:
+        """target_year 의 월운 12개월 (12월부터 내림차순), me_gan: 일간 한자"""
+        return self.months[CHAR_INDEX[me_gan]][year_ganzi(int(target_year)) % 10]
+
+
+# 프로세스 공용 테이블 (엔진과 /api/yeonun, /api/wolun 이 함께 사용)
+LUCK_TABLE = LuckTable()
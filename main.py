@@ -1,12 +1,14 @@
 from fastapi import FastAPI, HTTPException, Request, Form
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 import uvicorn
+from contextlib import asynccontextmanager
 from typing import Optional
 from datetime import datetime, timedelta 
 import traceback
+import json
 import os
 import saju_constants as sc
 
@@ -15,21 +17,50 @@ from saju_engine import SajuEngine
 from FortuneBridge import FortuneBridge
 from fortune_generator import FortuneGenerator, get_daily_fortune
 from lifetime_fortune import LifetimeFortuneGenerator
+from luck_table import LUCK_TABLE
+from executor import ExecutorBusy, TaskExecutor
+from manse_store import binary_matches
 
-app = FastAPI(title="포스텔러 만세력 2.2")
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    if lifetime_gen is not None:
+        await lifetime_gen.client.aclose()
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+app = FastAPI(title="포스텔러 만세력 2.2", lifespan=lifespan)
 templates = Jinja2Templates(directory="templates")
 
 # 엔진 초기화
 try:
     # 경로 및 파일명은 사용자 환경에 맞게 유지
-    engine = SajuEngine("./data/manse_data.json", "./data/term_data.json")
+    # manse_data.bin 이 있으면 mmap 으로 열어 모든 워커가 같은 페이지를 공유합니다.
+    # (생성: python manse_store.py ./data/manse_data.json ./data/term_data.json ./data/manse_data.bin)
+    # .bin 헤더의 원본 지문(크기 + sha256)이 지금 JSON 과 다르면 .bin 은 예전 데이터이므로 JSON 을 씁니다.
+    json_args = ("./data/manse_data.json", "./data/term_data.json")
+    if os.path.exists("./data/manse_data.bin") and not binary_matches("./data/manse_data.bin", *json_args):
+        print("⚠️ manse_data.bin 이 지금 JSON 과 다르게 만들어져 JSON 으로 로드합니다 (manse_store.py 로 다시 변환하세요)")
+        engine_args = json_args
+    elif os.path.exists("./data/manse_data.bin"):
+        engine_args = ("./data/manse_data.bin",)
+    else:
+        engine_args = json_args
+    engine = SajuEngine(*engine_args)
+    # async 핸들러의 분석은 실행기 풀에서, 평생운세는 동시 실행 제한만 (SAJU_CPU_EXECUTOR, SAJU_ENDPOINT_LIMITS 등)
+    executor = TaskExecutor.from_env(engine=engine, engine_args=engine_args)
+    # SAJU_WARM_CALENDAR=1 이면 1900~2100년 월 달력(2,412개월)을 미리 생성 (약 0.3초)
+    if os.environ.get("SAJU_WARM_CALENDAR") == "1":
+        engine.warm_calendar()
     bridge = FortuneBridge("./data/ilju_data.json")
     fortune_gen = FortuneGenerator(fortune_bridge=bridge)
-    lifetime_gen = LifetimeFortuneGenerator(saju_engine=engine, fortune_bridge=bridge)
+    lifetime_gen = LifetimeFortuneGenerator(saju_engine=engine, fortune_bridge=bridge, executor=executor)
     print("✅ 엔진 및 브릿지 로드 완료")
 except Exception as e:
     traceback.print_exc()
-    engine, bridge, fortune_gen, lifetime_gen = None, None, None, None
+    engine, bridge, fortune_gen, lifetime_gen, executor = None, None, None, None, None
 
 HAN_MAP = {
     '甲':'갑','乙':'을','丙':'병','丁':'정','戊':'무','己':'기','庚':'경','辛':'신','壬':'임','癸':'계',
@@ -66,7 +97,8 @@ async def analyze_web(
         # 2. 엔진 분석 실행 
         # 이제 지역명 전처리, 정밀 보정(round 반영), 오행/태그 가공, 
         # Display용 문자열 생성은 모두 엔진 내부에서 수행됩니다.
-        result = engine.analyze(
+        result = await executor.run_engine(
+            "analyze_web", "analyze",
             birth_str=birth_str, 
             gender=gender, 
             location=location, 
@@ -91,6 +123,12 @@ async def analyze_web(
             "h": HAN_MAP
         })
 
+    except ExecutorBusy as e:
+        return templates.TemplateResponse("index.html", {
+            "request": request,
+            "cities": list(sc.CITY_DATA.keys()),
+            "error": str(e)
+        }, status_code=503)
     except Exception as e:
         return templates.TemplateResponse("index.html", {
             "request": request,
@@ -106,19 +144,10 @@ async def get_yeonun(
 ):
     """
     대운 클릭 시 해당 대운의 10년치 연운(세운) 데이터를 반환하는 API
+    (엔진 계산 없이 세운 조회표 LUCK_TABLE 에서 바로 응답)
     """
-    if engine is None:
-        raise HTTPException(status_code=500, detail="엔진이 로드되지 않았습니다.")
-
     try:
-        # 엔진의 연운 전용 계산 메서드 호출
-        yeonun_data = engine.get_yeonun_only(
-            birth_year=birth_year,
-            daeun_start_age=start_age,
-            me_gan=me_gan,
-            me_hj=me_hj
-        )
-        return yeonun_data  # JSON 형식으로 자동 반환
+        return LUCK_TABLE.yeonun(me_gan, birth_year, start_age)  # JSON 형식으로 자동 반환
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
@@ -129,11 +158,8 @@ async def get_wolun(
     me_gan: str,
     me_hj: str
 ):
-    if engine is None:
-        raise HTTPException(status_code=500, detail="엔진 미로드")
     try:
-        wolun_data = engine.get_wolun_only(target_year, me_gan, me_hj)
-        return wolun_data
+        return LUCK_TABLE.wolun(me_gan, target_year)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
@@ -146,6 +172,81 @@ async def get_calendar(year: int, month: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/analyze-hours")
+def analyze_hours(
+    birth_date: str,
+    gender: str,
+    location: str,
+    calendar_type: str = "양력",
+    use_hap: bool = False,
+    use_johoo: bool = False
+):
+    """생시를 모를 때: 날짜 하나로 시간대별 원국 + 시간과 무관한 3주 공통 결과"""
+    if engine is None:
+        raise HTTPException(status_code=500, detail="엔진이 로드되지 않았습니다.")
+    try:
+        result = engine.analyze_hours(
+            birth_date.replace("/", "-"), gender, location, use_yajas_i=True, calendar_type=calendar_type,
+            use_hap_correction=use_hap, use_johoo_correction=use_johoo
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"날짜 형식이 올바르지 않습니다: {birth_date}")
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=result["error"])
+    return result
+
+
+@app.get("/api/pillar-boundaries")
+def pillar_boundaries(
+    birth: str,
+    location: str,
+    gender: str = "M",
+    window_hours: int = 12,
+    calendar_type: str = "양력"
+):
+    """생시 전후로 년/월/일/시주 또는 대운 방향이 바뀌는 시각 목록 (생시 정정용)"""
+    if engine is None:
+        raise HTTPException(status_code=500, detail="엔진이 로드되지 않았습니다.")
+    try:
+        result = engine.find_pillar_boundaries(
+            birth.replace("/", "-"), location, gender=gender, window_hours=window_hours,
+            use_yajas_i=True, calendar_type=calendar_type
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"날짜 형식이 올바르지 않습니다: {birth}")
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=result["error"])
+    return result
+
+
+@app.get("/api/cache-stats")
+async def get_cache_stats():
+    """원국/기준일 캐시 통계 (적중/실패/제거 횟수, SAJU_*_CACHE_SIZE 튜닝용)"""
+    if engine is None:
+        raise HTTPException(status_code=500, detail="엔진이 로드되지 않았습니다.")
+    return engine.cache_stats()
+
+
+@app.get("/api/executor-stats")
+async def get_executor_stats():
+    """실행기 풀 상태와 엔드포인트별 대기/실행 시간 (SAJU_CPU_WORKERS, SAJU_ENDPOINT_LIMITS 튜닝용)"""
+    if executor is None:
+        raise HTTPException(status_code=500, detail="엔진이 로드되지 않았습니다.")
+    return executor.stats()
+
+
+@app.get("/api/lifetime-stats")
+async def get_lifetime_stats():
+    """평생운세 캐시/single-flight(중복 생성 합류)/Gemini 호출 통계"""
+    if lifetime_gen is None:
+        raise HTTPException(status_code=500, detail="엔진이 로드되지 않았습니다.")
+    return {
+        "cache": lifetime_gen.get_cache_stats(),
+        "single_flight": lifetime_gen.flight_stats(),
+        "gemini": lifetime_gen.client.stats(),
+    }
+
+
 @app.get("/fortune", response_class=HTMLResponse)
 async def fortune_input_page(request: Request):
     """오늘의 운세 입력 페이지"""
@@ -182,12 +283,14 @@ async def fortune_web(
         birth_str = f"{formatted_date} {birth_time}"
 
         # 2. 사주 분석 실행
-        analysis = engine.analyze(
+        analysis = await executor.run_engine(
+            "fortune_web", "analyze",
             birth_str=birth_str,
             gender=gender,
             location=location,
             use_yajas_i=True,
-            calendar_type=calendar_type
+            calendar_type=calendar_type,
+            sections=FortuneGenerator.REQUIRED_SECTIONS
         )
 
         if "error" in analysis:
@@ -212,6 +315,12 @@ async def fortune_web(
             "fortune": fortune_result
         })
 
+    except ExecutorBusy as e:
+        return templates.TemplateResponse("fortune_input.html", {
+            "request": request,
+            "cities": list(sc.CITY_DATA.keys()),
+            "error": str(e)
+        }, status_code=503)
     except Exception as e:
         traceback.print_exc()
         return templates.TemplateResponse("fortune_input.html", {
@@ -252,19 +361,7 @@ async def get_daily_fortune_api(
         raise HTTPException(status_code=500, detail="엔진이 로드되지 않았습니다.")
     
     try:
-        # 1. 사주 분석 실행
-        analysis = engine.analyze(
-            birth_str=birth,
-            gender=gender,
-            location=location,
-            use_yajas_i=True,
-            calendar_type=calendar_type
-        )
-        
-        if "error" in analysis:
-            raise HTTPException(status_code=400, detail=analysis["error"])
-        
-        # 2. 운세 생성 대상 날짜 파싱
+        # 1. 운세 생성 대상 날짜 파싱
         fortune_date = None
         if target_date:
             try:
@@ -273,6 +370,21 @@ async def get_daily_fortune_api(
                 fortune_date = datetime.now()
         else:
             fortune_date = datetime.now()
+
+        # 2. 사주 분석 실행 (일운/나이는 운세 대상 날짜 기준)
+        analysis = await executor.run_engine(
+            "daily_fortune", "analyze",
+            birth_str=birth,
+            gender=gender,
+            location=location,
+            use_yajas_i=True,
+            calendar_type=calendar_type,
+            sections=FortuneGenerator.REQUIRED_SECTIONS,
+            as_of=fortune_date
+        )
+        
+        if "error" in analysis:
+            raise HTTPException(status_code=400, detail=analysis["error"])
         
         # 3. 오늘의 운세 생성
         fortune_result = fortune_gen.generate_daily_fortune(
@@ -287,11 +399,20 @@ async def get_daily_fortune_api(
         
     except HTTPException:
         raise
+    except ExecutorBusy as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"운세 생성 중 오류: {str(e)}")
 
 
+# /api/re-analyze 응답에 필요한 analyze() 결과 키
+RE_ANALYZE_SECTIONS = frozenset({
+    "scores", "power", "status", "representative_elem", "representative_tendency",
+    "forestellar_analysis", "relation_groups", "tengod_analysis_dict"
+})
+
+
 @app.get("/api/re-analyze")
 def re_analyze(request: Request):
     """
@@ -323,36 +444,65 @@ def re_analyze(request: Request):
             use_yajas_i=True, 
             calendar_type="양력",
             use_hap_correction=use_hap, 
-            use_johoo_correction=use_johoo
+            use_johoo_correction=use_johoo,
+            sections=RE_ANALYZE_SECTIONS
         )
 
         if "error" in result:
             return {"error": result["error"]}
 
         # 4. 프론트엔드 JS가 요구하는 형식으로 데이터 가공
-        # 십성 비중 계산 시 딕셔너리 데이터를 안전하게 참조합니다.
-        tengod_counts = {}
-        tg_dict = result.get('tengod_analysis_dict', {})
-        for k, v in tg_dict.items():
-            # '-' 표시가 아닐 경우에만 비율 숫자를 추출합니다.
-            tengod_counts[k] = float(v['ratio'].replace('%', '')) if v.get('ratio') != '-' else 0
-
-        return {
-            "scores": result["scores"],
-            "power": result["power"],
-            "status": result["status"],
-            "representative_elem": result["representative_elem"],
-            "representative_tendency": result["representative_tendency"],
-            "forestellar_analysis": result["forestellar_analysis"],
-            "relation_groups": result["relation_groups"],
-            "tengod_counts": tengod_counts
-        }
+        return _re_analyze_payload(result)
 
     except Exception as e:
         print(f"상세 에러 로그: {e}")
         return {"error": f"서버 내부 오류: {str(e)}"}
 
 
+def _re_analyze_payload(result):
+    """analyze() 결과 -> 합/조후 체크박스 갱신용 응답 (/api/re-analyze, /api/analyze-options 공통)"""
+    # 십성 비중 계산 시 딕셔너리 데이터를 안전하게 참조합니다.
+    tengod_counts = {}
+    tg_dict = result.get('tengod_analysis_dict', {})
+    for k, v in tg_dict.items():
+        # '-' 표시가 아닐 경우에만 비율 숫자를 추출합니다.
+        tengod_counts[k] = float(v['ratio'].replace('%', '')) if v.get('ratio') != '-' else 0
+
+    payload = {
+        "scores": result["scores"],
+        "power": result["power"],
+        "status": result["status"],
+        "representative_elem": result["representative_elem"],
+        "representative_tendency": result["representative_tendency"],
+        "forestellar_analysis": result["forestellar_analysis"],
+        "relation_groups": result["relation_groups"],
+        "tengod_counts": tengod_counts
+    }
+    if result.get("yongsin_detail"):
+        payload["yongsin_detail"] = result["yongsin_detail"]
+    return payload
+
+
+@app.get("/api/analyze-options")
+def analyze_options(
+    birth: str,
+    gender: str,
+    location: str,
+    calendar_type: str = "양력"
+):
+    """합/조후 보정 4가지 조합(00/01/10/11)을 한 번에 반환 (체크박스 전환은 프론트엔드에서 바로 처리)"""
+    if engine is None:
+        raise HTTPException(status_code=500, detail="엔진이 로드되지 않았습니다.")
+    try:
+        result = engine.analyze_options(birth.replace("/", "-"), gender, location, use_yajas_i=True,
+                                        calendar_type=calendar_type)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"날짜 형식이 올바르지 않습니다: {birth}")
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=result["error"])
+    return {"options": {k: _re_analyze_payload(v) for k, v in result["options"].items()}}
+
+
 @app.get("/lifetime", response_class=HTMLResponse)
 async def lifetime_input_page(request: Request):
     city_list = list(sc.CITY_DATA.keys())
@@ -383,7 +533,9 @@ async def lifetime_web(
         formatted_date = birth_date.replace("/", "-")
         birth_str = f"{formatted_date} {birth_time}"
 
-        result = lifetime_gen.generate(
+        # Gemini 호출은 비동기 클라이언트 (연결 풀/재시도), 실행기는 동시 실행 제한과 대기 통계만
+        result = await executor.run_async(
+            "lifetime_web", lifetime_gen.generate,
             birth_str=birth_str,
             gender=gender,
             location=location,
@@ -403,6 +555,12 @@ async def lifetime_web(
             "fortune": result
         })
 
+    except ExecutorBusy as e:
+        return templates.TemplateResponse("lifetime_input.html", {
+            "request": request,
+            "cities": list(sc.CITY_DATA.keys()),
+            "error": str(e)
+        }, status_code=503)
     except Exception as e:
         traceback.print_exc()
         return templates.TemplateResponse("lifetime_input.html", {
@@ -424,7 +582,8 @@ async def get_lifetime_fortune_api(
         raise HTTPException(status_code=500, detail="엔진이 로드되지 않았습니다.")
     
     try:
-        result = lifetime_gen.generate(
+        result = await executor.run_async(
+            "lifetime_fortune", lifetime_gen.generate,
             birth_str=birth,
             gender=gender,
             location=location,
@@ -439,10 +598,50 @@ async def get_lifetime_fortune_api(
         
     except HTTPException:
         raise
+    except ExecutorBusy as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"평생운세 생성 중 오류: {str(e)}")
 
 
+
+@app.get("/api/lifetime-fortune/stream")
+async def stream_lifetime_fortune_api(
+    birth: str,
+    gender: str,
+    location: str,
+    name: str = "회원",
+    calendar_type: str = "양력"
+):
+    """평생운세 SSE: meta -> section(섹션마다, 끝나는 대로) -> done | error"""
+    if engine is None or lifetime_gen is None:
+        raise HTTPException(status_code=500, detail="엔진이 로드되지 않았습니다.")
+
+    # /api/lifetime-fortune 과 같은 동시 실행 제한/대기열을 스트림이 끝날 때까지 차지
+    try:
+        stream = executor.open_stream(
+            "lifetime_fortune", lifetime_gen.stream,
+            birth_str=birth,
+            gender=gender,
+            location=location,
+            name=name,
+            calendar_type=calendar_type
+        )
+    except ExecutorBusy as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    async def events():
+        try:
+            async for event, data in stream:
+                yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            traceback.print_exc()
+            yield f"event: error\ndata: {json.dumps({'error': f'평생운세 생성 중 오류: {e}'}, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,371 @@
+"""
+만세력 압축 저장소 (Compact Manse Store)
+
+- 1900-01-01 기준 일련번호(day index)로 하루씩 배열에 저장
+- 년/월/일주는 60갑자 인덱스(0~59), 음력 정보는 작은 정수로 typed array에 보관
+- 기존 m_db(dict)와 같은 get("YYYYMMDD") 방식으로 조회
+- 바이너리 파일(manse_data.bin)은 mmap 으로 읽기 전용 매핑하여
+  여러 워커 프로세스가 페이지 캐시의 같은 물리 페이지를 공유
+
+바이너리 변환:
+  python manse_store.py ./data/manse_data.json ./data/term_data.json ./data/manse_data.bin
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+import saju_constants as sc
+
+EPOCH = date(1900, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+EPOCH_DT = datetime(1900, 1, 1)
+
+SIXTY_GANZI = [f"{sc.STEMS[i % 10]}{sc.BRANCHES[i % 12]}" for i in range(60)]
+GANZI_INDEX = {g: i for i, g in enumerate(SIXTY_GANZI)}
+
+# solarIndex(0=춘분) 순서의 24절기 명칭
+TERM_NAMES = [
+    "춘분", "청명", "곡우", "입하", "소만", "망종", "하지", "소서", "대서", "입추", "처서", "백로",
+    "추분", "한로", "상강", "입동", "소설", "대설", "동지", "소한", "대한", "입춘", "우수", "경칩"
+]
+
+# --- 바이너리 포맷 ---
+# 헤더: magic(8) + version, byteorder(0=little), start, n_days, n_terms (각 int32) + 예약(4)
+#       + 원본 JSON 지문(sha256 32바이트, source_fingerprint)
+# 본문: 만세력 열(ly:H, lm/ld/ls/yG/mG/dG:B) -> 4바이트 정렬 -> 절기 열(minute:i, solarIndex:B, monthIndex:B, degree:H)
+MAGIC = b"MANSEDB1"
+VERSION = 2
+HEADER = struct.Struct("<8s5i4x32s")
+
+
+def day_index(d) -> int:
+    """date/datetime 또는 'YYYYMMDD' 문자열을 1900-01-01 기준 일련번호로 변환"""
+    if isinstance(d, str):
+        d = date(int(d[:4]), int(d[4:6]), int(d[6:8]))
+    return d.toordinal() - EPOCH_ORDINAL
+
+
+def date_of(idx: int) -> date:
+    """일련번호 -> date"""
+    return date.fromordinal(EPOCH_ORDINAL + idx)
+
+
+def minute_index(dt: datetime) -> int:
+    """datetime 을 1900-01-01 00:00 기준 경과 분(epoch minute)으로 변환"""
+    return (dt.toordinal() - EPOCH_ORDINAL) * 1440 + dt.hour * 60 + dt.minute
+
+
+def datetime_of(minute: int) -> datetime:
+    """epoch minute -> datetime"""
+    return EPOCH_DT + timedelta(minutes=minute)
+
+
+def _align(offset: int, size: int = 4) -> int:
+    return (offset + size - 1) // size * size
+
+
+class ManseStore:
+    """일자별 만세력 데이터를 열(column) 단위 배열로 보관하는 저장소
+
+    ly(음력 년)는 'H', 나머지는 'B' 배열을 사용하며 하루당 8바이트입니다.
+    배열 대신 mmap 위의 memoryview 를 받아도 동일하게 동작합니다.
+    ly == 0 인 칸은 데이터가 없는 날짜입니다.
+    """
+
+    def __init__(self, start, ly, lm, ld, ls, yG, mG, dG):
+        self.start = start  # 첫 번째 칸의 day index
+        self.ly, self.lm, self.ld, self.ls = ly, lm, ld, ls
+        self.yG, self.mG, self.dG = yG, mG, dG
+        self.lunar_index = self._build_lunar_index()
+
+    def _build_lunar_index(self) -> dict:
+        """(음력 년, 월, 윤달 여부) -> 그 달 1일의 배열 위치 (음력 -> 양력 역변환용)
+
+        음력 한 달은 연속된 날짜이므로 달마다 시작 위치만 기억하면 됩니다 (약 2,500개).
+        """
+        index = {}
+        ly, lm, ld, ls = self.ly, self.lm, self.ld, self.ls
+        prev = None
+        for i in range(len(ly)):
+            if not ly[i]:
+                continue
+            key = (ly[i], lm[i], ls[i])
+            if key != prev:
+                index[key] = i - ld[i] + 1
+                prev = key
+        return index
+
+    @classmethod
+    def from_json(cls, m_file: str) -> "ManseStore":
+        """기존 manse_data.json 을 읽어 배열 저장소로 변환"""
+        with open(m_file, 'r', encoding='utf-8') as f:
+            raw = json.load(f)
+        return cls.from_dict(raw)
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "ManseStore":
+        indices = {day_index(k): v for k, v in raw.items()}
+        start, end = min(indices), max(indices)
+        n = end - start + 1
+
+        ly, lm, ld, ls = array('H', bytes(2 * n)), array('B', bytes(n)), array('B', bytes(n)), array('B', bytes(n))
+        yG, mG, dG = array('B', bytes(n)), array('B', bytes(n)), array('B', bytes(n))
+        for idx, v in indices.items():
+            i = idx - start
+            ly[i], lm[i], ld[i], ls[i] = v['ly'], v['lm'], v['ld'], 1 if v['ls'] else 0
+            yG[i], mG[i], dG[i] = GANZI_INDEX[v['yG']], GANZI_INDEX[v['mG']], GANZI_INDEX[v['dG']]
+        return cls(start, ly, lm, ld, ls, yG, mG, dG)
+
+    def __len__(self):
+        return len(self.ly)
+
+    def _slot(self, key) -> int:
+        """조회 키를 배열 위치로 변환 (범위 밖이거나 잘못된 키는 -1)"""
+        try:
+            i = day_index(key) - self.start
+        except (ValueError, TypeError):
+            return -1
+        if 0 <= i < len(self.ly) and self.ly[i]:
+            return i
+        return -1
+
+    def __contains__(self, key):
+        return self._slot(key) >= 0
+
+    def get(self, key, default: Optional[dict] = None) -> Optional[dict]:
+        """기존 m_db.get("YYYYMMDD")과 동일한 형태의 dict 반환 (date 객체도 허용)"""
+        i = self._slot(key)
+        if i < 0:
+            return default
+        return self._row(i)
+
+    def _row(self, i: int) -> dict:
+        return {
+            "ly": self.ly[i], "lm": self.lm[i], "ld": self.ld[i], "ls": bool(self.ls[i]),
+            "yG": SIXTY_GANZI[self.yG[i]], "mG": SIXTY_GANZI[self.mG[i]], "dG": SIXTY_GANZI[self.dG[i]]
+        }
+
+    def find_lunar(self, y: int, m: int, d: int, is_leap: bool) -> Optional[date]:
+        """음력(윤달 여부 포함) 날짜에 해당하는 양력 date 반환, 없으면 None (O(1))"""
+        ls = 1 if is_leap else 0
+        base = self.lunar_index.get((y, m, ls))
+        if base is None:
+            return None
+        i = base + d - 1
+        if 0 <= i < len(self.ly) and self.ly[i] == y and self.lm[i] == m and self.ld[i] == d and self.ls[i] == ls:
+            return date_of(self.start + i)
+        return None
+
+    def items(self):
+        """("YYYYMMDD", dict) 순회 (기존 dict 호환용)"""
+        for i in range(len(self.ly)):
+            if self.ly[i]:
+                yield date_of(self.start + i).strftime("%Y%m%d"), self._row(i)
+
+
+class TermTable:
+    """절기 데이터를 시간순 배열로 보관하고 기존 t_db(연도 문자열 -> 절기 list) 형태로 조회
+
+    minute: epoch minute(i), solar: solarIndex(B), month: monthIndex(B, 0=월 변경 없음), degree(H)
+    """
+
+    def __init__(self, minute, solar, month, degree):
+        self.minute, self.solar, self.month, self.degree = minute, solar, month, degree
+
+        # 월이 바뀌는 절(節)만 모은 시간순 타임라인 (로드 시 1회 파싱, 조회는 이분 탐색)
+        self.month_minutes = array('i')
+        self.month_terms = []
+        for i in range(len(minute)):
+            if month[i]:
+                t = self.term(i)
+                t['dt_obj'] = datetime_of(minute[i])
+                self.month_minutes.append(minute[i])
+                self.month_terms.append(t)
+
+    def month_terms_around(self, dt: datetime):
+        """dt 직전(같은 시각 포함) 절과 dt 이후 첫 절을 (l_term, n_term) 으로 반환
+
+        반환되는 dict 는 공유 객체이므로 수정하지 마세요.
+        범위 밖이면 각각 처음/마지막 절을 돌려줍니다.
+        """
+        pos = bisect_right(self.month_minutes, minute_index(dt))
+        l_term = self.month_terms[pos - 1] if pos > 0 else self.month_terms[0]
+        n_term = self.month_terms[pos] if pos < len(self.month_terms) else self.month_terms[-1]
+        return l_term, n_term
+
+    @classmethod
+    def from_json(cls, t_file: str) -> "TermTable":
+        with open(t_file, 'r', encoding='utf-8') as f:
+            raw = json.load(f)
+        return cls.from_dict(raw)
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "TermTable":
+        terms = sorted(
+            (t for y in raw for t in raw[y]),
+            key=lambda t: t['datetime']
+        )
+        minute, solar, month, degree = array('i'), array('B'), array('B'), array('H')
+        for t in terms:
+            minute.append(minute_index(datetime.strptime(t['datetime'], "%Y-%m-%dT%H:%M")))
+            solar.append(t['solarIndex'])
+            month.append(t['monthIndex'] or 0)
+            degree.append(int(t['degree']))
+        return cls(minute, solar, month, degree)
+
+    def __len__(self):
+        return len(self.minute)
+
+    def term(self, i: int) -> dict:
+        """i번째 절기를 term_data.json 과 같은 dict 로 반환"""
+        dt = datetime_of(self.minute[i])
+        ymd, hm = f"{dt.year:04d}{dt.month:02d}{dt.day:02d}", f"{dt.hour:02d}:{dt.minute:02d}"
+        m_idx = self.month[i]
+        return {
+            "term": TERM_NAMES[self.solar[i]],
+            "date": ymd,
+            "time": hm,
+            "datetime": f"{ymd[:4]}-{ymd[4:6]}-{ymd[6:]}T{hm}",
+            "solarIndex": self.solar[i],
+            "degree": float(self.degree[i]),
+            "isMonthChange": m_idx != 0,
+            "monthIndex": m_idx or None
+        }
+
+    def _year_range(self, year: int):
+        lo = bisect_left(self.minute, minute_index(datetime(year, 1, 1)))
+        hi = bisect_left(self.minute, minute_index(datetime(year + 1, 1, 1)))
+        return lo, hi
+
+    def day_terms(self, year: int, month: int) -> dict:
+        """해당 월의 {일: (절기명, "HH:MM")} (하루에 절기가 둘이면 먼저 든 절기)"""
+        lo = bisect_left(self.minute, minute_index(datetime(year, month, 1)))
+        hi = bisect_left(self.minute, minute_index(datetime(year + month // 12, month % 12 + 1, 1)))
+        out = {}
+        for i in range(lo, hi):
+            dt = datetime_of(self.minute[i])
+            if dt.day not in out:
+                out[dt.day] = (TERM_NAMES[self.solar[i]], f"{dt.hour:02d}:{dt.minute:02d}")
+        return out
+
+    def __contains__(self, year_key):
+        try:
+            lo, hi = self._year_range(int(year_key))
+        except (ValueError, TypeError, OverflowError):
+            return False
+        return hi > lo
+
+    def __getitem__(self, year_key):
+        if year_key not in self:
+            raise KeyError(year_key)
+        lo, hi = self._year_range(int(year_key))
+        return [self.term(i) for i in range(lo, hi)]
+
+    def get(self, year_key, default=None):
+        return self[year_key] if year_key in self else default
+
+
+# ==========================================================================
+# 바이너리 파일 (mmap 공유)
+# ==========================================================================
+def source_fingerprint(*sources: str) -> bytes:
+    """원본 JSON 파일들의 지문: 파일마다 (크기, 내용) 을 순서대로 넣은 sha256"""
+    h = hashlib.sha256()
+    for src in sources:
+        h.update(os.path.getsize(src).to_bytes(8, 'little'))
+        with open(src, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.digest()
+
+
+def write_binary(store: ManseStore, terms: TermTable, out_file: str, sources=()):
+    """ManseStore + TermTable 을 mmap 가능한 바이너리 파일로 저장
+
+    sources: 변환에 쓴 원본 JSON 경로 (헤더에 지문을 기록해 binary_matches 로 비교)
+    """
+    n, n_terms = len(store), len(terms)
+    digest = source_fingerprint(*sources) if sources else bytes(32)
+    with open(out_file, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0 if sys.byteorder == 'little' else 1, store.start, n, n_terms,
+                            digest))
+        for col in (store.ly, store.lm, store.ld, store.ls, store.yG, store.mG, store.dG):
+            f.write(bytes(col))
+        f.write(b"\0" * (_align(f.tell()) - f.tell()))
+        for col in (terms.minute, terms.solar, terms.month):
+            f.write(bytes(col))
+        f.write(b"\0" * (_align(f.tell(), 2) - f.tell()))
+        f.write(bytes(terms.degree))
+
+
+def open_binary(bin_file: str):
+    """바이너리 파일을 읽기 전용 mmap 으로 열어 (ManseStore, TermTable) 반환
+
+    데이터는 복사하지 않고 memoryview 로만 참조하므로 워커별 추가 메모리가 거의 없습니다.
+    """
+    with open(bin_file, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, order, start, n, n_terms, _ = HEADER.unpack_from(mm, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"지원하지 않는 만세력 바이너리 파일입니다: {bin_file}")
+    if order != (0 if sys.byteorder == 'little' else 1):
+        raise ValueError("바이트 순서가 다른 시스템에서 생성된 파일입니다. 다시 변환하세요.")
+
+    mv = memoryview(mm)
+    pos = HEADER.size
+
+    def take(fmt, count, size):
+        nonlocal pos
+        view = mv[pos:pos + count * size].cast(fmt)
+        pos += count * size
+        return view
+
+    store = ManseStore(start, take('H', n, 2), *(take('B', n, 1) for _ in range(6)))
+    pos = _align(pos)
+    minute, solar, month = take('i', n_terms, 4), take('B', n_terms, 1), take('B', n_terms, 1)
+    pos = _align(pos, 2)
+    terms = TermTable(minute, solar, month, take('H', n_terms, 2))
+    return store, terms
+
+
+def binary_matches(bin_file: str, *sources: str) -> bool:
+    """바이너리 헤더의 지문이 지금 원본 JSON 과 같으면 True
+
+    수정 시각은 checkout/복사 때 바뀌므로 크기와 내용 해시로 비교합니다.
+    이전 포맷이거나 지문이 다르면 False (다시 변환해야 함), 원본이 없으면 비교할 수 없으므로 True.
+    """
+    if not all(os.path.exists(src) for src in sources):
+        return True
+    with open(bin_file, 'rb') as f:
+        head = f.read(HEADER.size)
+    if len(head) < HEADER.size or head[:8] != MAGIC:
+        return False
+    fields = HEADER.unpack(head)
+    return fields[1] == VERSION and fields[-1] == source_fingerprint(*sources)
+
+
+def load_data(m_file: str, t_file: Optional[str] = None):
+    """엔진용 (ManseStore, TermTable) 로드
+
+    m_file 이 .bin 이면 mmap 으로 두 데이터를 함께 열고, 아니면 JSON 에서 변환합니다.
+    """
+    if m_file.endswith(".bin"):
+        return open_binary(m_file)
+    return ManseStore.from_json(m_file), TermTable.from_json(t_file)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4:
+        print("사용법: python manse_store.py <manse_data.json> <term_data.json> <출력.bin>")
+        sys.exit(1)
+    m_json, t_json, out = sys.argv[1:]
+    write_binary(ManseStore.from_json(m_json), TermTable.from_json(t_json), out, sources=(m_json, t_json))
+    print(f"✅ 바이너리 변환 완료: {out}")
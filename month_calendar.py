@@ -0,0 +1,62 @@
+"""
+월별 일진 달력 (Immutable month calendar)
+
+- (년, 월) 달력은 날짜가 정해지면 바뀌지 않으므로 한 번 만들어 튜플로 보관
+- 절기는 TermTable.day_terms 로 날짜별로 미리 묶어 하루마다 연간 절기 목록을 훑지 않음
+- 오늘 표시(is_today)만 요청 시점에 덧씌워 get_month_calendar 와 같은 dict 로 변환
+"""
+
+import calendar
+
+import saju_constants as sc
+
+# 일별 행: (일, 일진 한글, 일진 한자, 음력 "월.일", 절기명, 절기 시각)
+DAY_FIELDS = ("day", "ganzi_kor", "ganzi_hj", "lunar", "term_name", "term_time")
+
+
+def _kor(ganzi: str) -> str:
+    return f"{sc.B_KOR[ganzi[0]]}{sc.B_KOR[ganzi[1]]}"
+
+
+class MonthCalendar:
+    """(년, 월) 일진 달력 - 생성 후 변경하지 않음"""
+
+    __slots__ = ("year", "month", "first_weekday", "saju_header", "days")
+
+    def __init__(self, year, month, first_weekday, saju_header, days):
+        self.year, self.month = year, month
+        self.first_weekday = first_weekday  # 0: 일요일
+        self.saju_header = saju_header      # "을사년 정해~무자월" 형태
+        self.days = days                    # DAY_FIELDS 순서 튜플들의 튜플
+
+    @classmethod
+    def build(cls, m_db, t_db, year: int, month: int) -> "MonthCalendar":
+        first_weekday, last_day = calendar.monthrange(year, month)
+        first_info = m_db.get(f"{year}{month:02d}01")
+        last_info = m_db.get(f"{year}{month:02d}{last_day:02d}")
+
+        saju_header = ""
+        if first_info and last_info:
+            # 포스텔러 스타일: 연도는 마지막 날(새로운 기운) 기준 하나만, 월건은 바뀌면 범위로 표시
+            m_start, m_end = _kor(first_info['mG']), _kor(last_info['mG'])
+            month_part = f"{m_start}~{m_end}월" if m_start != m_end else f"{m_start}월"
+            saju_header = f"{_kor(last_info['yG'])}년 {month_part}"
+
+        terms = t_db.day_terms(year, month)
+        days = []
+        for day in range(1, last_day + 1):
+            day_info = m_db.get(f"{year}{month:02d}{day:02d}")
+            if day_info:
+                dg = day_info['dG']
+                term_name, term_time = terms.get(day, ("", ""))
+                days.append((day, _kor(dg), dg, f"{day_info['lm']}.{day_info['ld']}", term_name, term_time))
+        return cls(year, month, (first_weekday + 1) % 7, saju_header, tuple(days))
+
+    def to_dict(self, today=None) -> dict:
+        """get_month_calendar 응답 형태 (today: is_today 표시 기준 date/datetime)"""
+        today_day = today.day if today and (today.year, today.month) == (self.year, self.month) else 0
+        return {
+            "first_weekday": self.first_weekday,
+            "days": [dict(zip(DAY_FIELDS, row), is_today=row[0] == today_day) for row in self.days],
+            "saju_header": self.saju_header,
+        }
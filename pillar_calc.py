@@ -0,0 +1,92 @@
+"""
+산술 간지 계산기 (Arithmetic Pillar Calculator)
+
+- 일주: 1900-01-01(甲戌일) 기준 경과 일수 % 60
+- 년주/월주: 절기 타임라인에서 그날 0시 기준 직전 절(節)을 찾아 입춘/월두법으로 계산
+- 일자별 만세력 테이블 없이 manse_data.json 과 같은 yG/mG/dG 를 돌려줍니다.
+
+검증 모드 (1900~2100 전체 일자를 manse_data.json 과 비교):
+  python pillar_calc.py ./data/manse_data.json ./data/term_data.json
+"""
+
+import sys
+from bisect import bisect_right
+
+from manse_store import SIXTY_GANZI, ManseStore, TermTable, date_of, day_index, load_data
+
+DAY_GANZI_OFFSET = 10  # 1900-01-01 = 甲戌(10)
+
+
+def ganzi_index(stem_idx: int, branch_idx: int) -> int:
+    """천간/지지 인덱스 -> 60갑자 인덱스 (음양이 맞는 조합만 유효)"""
+    return (6 * stem_idx - 5 * branch_idx) % 60
+
+
+class PillarCalculator:
+    """절기 타임라인(TermTable) 위에서 년/월/일주를 산술로 계산"""
+
+    def __init__(self, terms: TermTable):
+        self.terms = terms
+
+    def day_ganzi_idx(self, idx: int) -> int:
+        return (idx + DAY_GANZI_OFFSET) % 60
+
+    def year_month_ganzi_idx(self, idx: int):
+        """day index 의 0시 기준 (년주, 월주) 60갑자 인덱스
+
+        manse_builder 와 같은 기준: 0시 이전(같은 분 포함)에 든 마지막 절의 월,
+        그 절 이전의 가장 가까운 입춘 연도를 사주 연도로 사용합니다.
+        """
+        pos = bisect_right(self.terms.month_minutes, idx * 1440)
+        term = self.terms.month_terms[max(pos - 1, 0)]
+        m_idx = term['monthIndex']
+        # 소한(12월 절)은 양력 1월에 들므로 입춘 기준으로는 전년도
+        saju_year = term['dt_obj'].year - 1 if m_idx == 12 else term['dt_obj'].year
+
+        y_idx = (saju_year - 4) % 60
+        m_stem = ((y_idx % 10) * 2 + 2 + m_idx - 1) % 10  # 월두법
+        m_branch = (m_idx + 1) % 12
+        return y_idx, ganzi_index(m_stem, m_branch)
+
+    def day_pillars(self, key):
+        """date/datetime 또는 'YYYYMMDD' -> (yG, mG, dG) 간지 문자열"""
+        idx = day_index(key)
+        y_idx, m_idx = self.year_month_ganzi_idx(idx)
+        return SIXTY_GANZI[y_idx], SIXTY_GANZI[m_idx], SIXTY_GANZI[self.day_ganzi_idx(idx)]
+
+    def day_ganzi(self, key) -> str:
+        """일주 간지 문자열"""
+        return SIXTY_GANZI[self.day_ganzi_idx(day_index(key))]
+
+    def verify(self, store: ManseStore):
+        """저장소의 모든 날짜를 산술 결과와 비교하여 불일치 목록 반환
+
+        Returns:
+            [(YYYYMMDD, 필드명, DB 값, 계산 값), ...]
+        """
+        mismatches = []
+        for i in range(len(store)):
+            if not store.ly[i]:
+                continue
+            idx = store.start + i
+            y_idx, m_idx = self.year_month_ganzi_idx(idx)
+            calc = {"yG": y_idx, "mG": m_idx, "dG": self.day_ganzi_idx(idx)}
+            for field, col in (("yG", store.yG), ("mG", store.mG), ("dG", store.dG)):
+                if col[i] != calc[field]:
+                    mismatches.append((date_of(idx).strftime("%Y%m%d"), field,
+                                       SIXTY_GANZI[col[i]], SIXTY_GANZI[calc[field]]))
+        return mismatches
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("사용법: python pillar_calc.py <manse_data.json|manse_data.bin> [term_data.json]")
+        sys.exit(1)
+    store, terms = load_data(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+    calc = PillarCalculator(terms)
+    bad = calc.verify(store)
+    first, last = date_of(store.start), date_of(store.start + len(store) - 1)
+    print(f"🔍 {first} ~ {last} ({len(store)}일) 검증 완료: 불일치 {len(bad)}건")
+    for row in bad[:20]:
+        print("  ", *row)
+    sys.exit(1 if bad else 0)
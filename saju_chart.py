@@ -0,0 +1,145 @@
+"""
+정수 인코딩 사주 원국 (Integer-encoded Chart)
+
+- 천간 0..9 (甲..癸), 지지 0..11 (子..亥), 간지 0..59 (60갑자) 인덱스로 보관
+- 8칸 순서는 palja 와 동일: [년간, 년지, 월간, 월지, 일간, 일지, 시간, 시지]
+- 칸별 오행(0..4 = 목화토금수)과 기능적 음양(체용 반영)은 생성 시 한 번만 계산
+- 한자/한글 문자열은 결과를 만들 때만 변환합니다 (char, palja, ELEMENTS, TEN_GOD_NAMES)
+- 십성(10x22), 12운성(10x12), 오행 관계(5x5) 등은 import 시 테이블로 미리 생성
+"""
+
+import saju_constants as sc
+from pillar_calc import ganzi_index
+
+# 오행 순서: 상생 순서이므로 (대상 - 나) % 5 가 곧 관계 (0:비겁 1:식상 2:재성 3:관성 4:인성)
+ELEMENTS = ("목", "화", "토", "금", "수")
+RELATION_NAMES = ("비겁", "식상", "재성", "관성", "인성")
+# 관계 * 2 + (음양이 다르면 1)
+TEN_GOD_NAMES = ("비견", "겁재", "식신", "상관", "편재", "정재", "편관", "정관", "편인", "정인")
+
+STEM_INDEX = {c: i for i, c in enumerate(sc.STEMS)}
+BRANCH_INDEX = {c: i for i, c in enumerate(sc.BRANCHES)}
+STEM_ELEM = tuple(ELEMENTS.index(sc.ELEMENT_MAP[c]) for c in sc.STEMS)
+BRANCH_ELEM = tuple(ELEMENTS.index(sc.ELEMENT_MAP[c]) for c in sc.BRANCHES)
+STEM_POL = tuple(sc.FUNCTIONAL_POLARITY[c] for c in sc.STEMS)
+BRANCH_POL = tuple(sc.FUNCTIONAL_POLARITY[c] for c in sc.BRANCHES)
+
+
+def _branch_set(chars) -> frozenset:
+    return frozenset(BRANCH_INDEX[c] for c in chars)
+
+
+# --- 조후 / 합 보정용 ---
+WINTER_SUMMER = _branch_set(sc.WINTER_BS + sc.SUMMER_BS)
+WANGJI = _branch_set("子午卯酉")
+# 삼합 + 방합 규칙 (sc.B_SAMHAP, sc.B_BANGHAP 순서 유지): (지지 집합, 결과 오행)
+HAP_GROUPS = tuple(
+    (_branch_set(chars), ELEMENTS.index((val[0] if isinstance(val, (tuple, list)) else val)[0]))
+    for chars, val in {**sc.B_SAMHAP, **sc.B_BANGHAP}.items()
+)
+
+# --- 신살용 ---
+SAMHAP_START = tuple(BRANCH_INDEX[sc.SAMHAP_START_MAP[c]] for c in sc.BRANCHES)
+# 일간별 (신살명, 해당 지지 집합) - sc.ME_MAPPING_RULES 순서 유지
+ME_SINSAL = tuple(
+    tuple((name, _branch_set([mapping[stem]] if m_type == "single" else mapping[stem]))
+          for mapping, name, m_type in sc.ME_MAPPING_RULES if mapping.get(stem))
+    for stem in sc.STEMS
+)
+BAEKHO_GANZI = frozenset(ganzi_index(STEM_INDEX[g[0]], BRANCH_INDEX[g[1]]) for g in sc.BAEKHO_LIST)
+HYEONCHIM_STEMS = frozenset(STEM_INDEX[c] for c in sc.HYEONCHIM_CHARS if c in STEM_INDEX)
+HYEONCHIM_BRANCHES = frozenset(BRANCH_INDEX[c] for c in sc.HYEONCHIM_CHARS if c in BRANCH_INDEX)
+# 통근 판정 (sc.JIJANGAN_MAP 문자열에 일간 글자가 있는지), [천간][지지]
+ROOTED = tuple(tuple(s in sc.JIJANGAN_MAP.get(b, "") for b in sc.BRANCHES) for s in sc.STEMS)
+
+
+def ten_god_idx(me_elem: int, me_pol: bool, elem: int, pol: bool) -> int:
+    """일간 오행/음양 기준 대상 오행/음양의 십성 인덱스 (TEN_GOD_NAMES)"""
+    return ((elem - me_elem) % 5) * 2 + (me_pol != pol)
+
+
+# --- 관계 조회 테이블 (import 시 1회 생성) ---
+# 22글자 인덱스: 천간 0..9, 지지 10..21
+CHARS = sc.STEMS + sc.BRANCHES
+CHAR_INDEX = {c: i for i, c in enumerate(CHARS)}
+CHAR_ELEM = STEM_ELEM + BRANCH_ELEM
+CHAR_POL = STEM_POL + BRANCH_POL
+CHAR_KOR = tuple(sc.B_KOR[c] for c in CHARS)
+ELEM_INDEX = {e: i for i, e in enumerate(ELEMENTS)}
+
+# [나 오행 5][대상 오행 5] -> 관계명 (비겁/식상/재성/관성/인성)
+RELATION_TABLE = tuple(tuple(RELATION_NAMES[(t - m) % 5] for t in range(5)) for m in range(5))
+# [일간 10][대상 음양 2][대상 오행 5] -> 십성 인덱스 (합으로 오행이 바뀐 글자용)
+TEN_GOD_BY_ELEM = tuple(
+    tuple(tuple(ten_god_idx(STEM_ELEM[m], STEM_POL[m], e, pol) for e in range(5)) for pol in (False, True))
+    for m in range(10)
+)
+# [일간 10][대상 글자 22] -> 십성 이름
+TEN_GOD_TABLE = tuple(
+    tuple(TEN_GOD_NAMES[TEN_GOD_BY_ELEM[m][CHAR_POL[c]][CHAR_ELEM[c]]] for c in range(22))
+    for m in range(10)
+)
+# [일간 10][지지 12] -> 12운성
+UNSEONG_TABLE = tuple(
+    tuple(sc.UNSEONG_MAP.get(stem, {}).get(b, "-") for b in sc.BRANCHES)
+    for stem in sc.STEMS
+)
+
+
+class Chart:
+    """사주 원국 8글자의 정수 표현"""
+
+    __slots__ = ("stems", "branches", "ganzi", "elems", "pols")
+
+    def __init__(self, stems, branches):
+        self.stems = tuple(stems)        # 년/월/일/시 천간 인덱스
+        self.branches = tuple(branches)  # 년/월/일/시 지지 인덱스
+        self.ganzi = tuple(ganzi_index(s, b) for s, b in zip(self.stems, self.branches))
+        elems, pols = [], []
+        for s, b in zip(self.stems, self.branches):
+            elems += (STEM_ELEM[s], BRANCH_ELEM[b])
+            pols += (STEM_POL[s], BRANCH_POL[b])
+        self.elems = tuple(elems)  # 8칸 오행 인덱스
+        self.pols = tuple(pols)    # 8칸 기능적 음양 (True: 양)
+
+    @classmethod
+    def from_palja(cls, palja):
+        """한자 8글자 리스트 -> Chart"""
+        return cls([STEM_INDEX[c] for c in palja[0::2]], [BRANCH_INDEX[c] for c in palja[1::2]])
+
+    @classmethod
+    def from_key(cls, key: int):
+        """Chart.key -> Chart"""
+        ganzi = (key // 216000, key // 3600 % 60, key // 60 % 60, key % 60)
+        return cls([g % 10 for g in ganzi], [g % 12 for g in ganzi])
+
+    @property
+    def key(self) -> int:
+        """년/월/일/시 간지 인덱스를 60진수로 합친 정수 (0 .. 60**4 - 1), 캐시/파일 키용"""
+        y, m, d, h = self.ganzi
+        return ((y * 60 + m) * 60 + d) * 60 + h
+
+    @property
+    def me(self) -> int:
+        """일간 천간 인덱스"""
+        return self.stems[2]
+
+    def code(self, slot: int) -> int:
+        """8칸 위치의 천간/지지 인덱스"""
+        return self.stems[slot // 2] if slot % 2 == 0 else self.branches[slot // 2]
+
+    def char(self, slot: int) -> str:
+        """8칸 위치의 한자"""
+        return sc.STEMS[self.stems[slot // 2]] if slot % 2 == 0 else sc.BRANCHES[self.branches[slot // 2]]
+
+    @property
+    def palja(self):
+        """출력용 한자 8글자 리스트"""
+        return [self.char(i) for i in range(8)]
+
+    def ten_god(self, slot: int, elem: int = None) -> int:
+        """일간 기준 8칸 위치의 십성 인덱스 (elem: 합으로 변한 오행, 없으면 원래 오행)"""
+        return TEN_GOD_BY_ELEM[self.stems[2]][self.pols[slot]][self.elems[slot] if elem is None else elem]
+
+    def __repr__(self):
+        return f"Chart({''.join(self.palja)})"
@@ -135,6 +135,10 @@ GONGMANG_MAP = [
 # saju_constants.py
 
 # --- 역사적 보정 데이터 ---
+# 표준시 변경 기간 (동경 127.5도 기준시 사용, +30분) - 시작/끝 시각 포함
+STANDARD_TIME_PERIODS = [
+    ("190804010000", "191112312359"), ("195403210000", "196108092359")
+]
 DST_PERIODS = [
     ("194806010000", "194809130000"), ("194904030000", "194909110000"),
     ("195004010000", "195009100000"), ("195105060000", "195109090000"),
@@ -144,6 +148,11 @@ DST_PERIODS = [
     ("198705100200", "198710110300"), ("198805080200", "198810090300")
 ]
 
+# 지역별 시간 보정 층(layer): (보정 분, 기간 목록). 같은 층의 기간은 한 번만 적용되고 층끼리는 더해집니다.
+HISTORICAL_CORRECTIONS = {
+    "KR": [(30, STANDARD_TIME_PERIODS), (-60, DST_PERIODS)],
+}
+
 # --- 용신 및 오행 관련 ---
 HJ_ELEMENTS = ['木', '火', '土', '金', '水']
 HJ_TO_HG = {'木': '목', '火': '화', '土': '토', '金': '금', '水': '수'}
@@ -1,13 +1,86 @@
 import json
 import math
+import os
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
 import saju_constants as sc
+from chart_store import ChartStore
+from lru_cache import LRUCache
+from luck_table import LUCK_TABLE
+from manse_store import GANZI_INDEX, SIXTY_GANZI, datetime_of, load_data, minute_index
+from month_calendar import MonthCalendar
+from pillar_calc import PillarCalculator
+from saju_chart import (BAEKHO_GANZI, CHAR_ELEM, CHAR_INDEX, CHAR_KOR, CHAR_POL, CHARS, ELEM_INDEX, ELEMENTS,
+                        HAP_GROUPS, HYEONCHIM_BRANCHES, HYEONCHIM_STEMS, ME_SINSAL, RELATION_TABLE, ROOTED,
+                        SAMHAP_START, TEN_GOD_BY_ELEM, TEN_GOD_NAMES, TEN_GOD_TABLE, UNSEONG_TABLE, WANGJI,
+                        WINTER_SUMMER, Chart)
+from saju_interactions import find_interactions
+from time_correction import CorrectionTable
+
+# analyze(sections=...) 용: 중간 계산 결과별로 그것을 필요로 하는 결과 키
+SECTION_DEPS = {
+    "pillars": {"pillars", "representative_tendency", "wealth_analysis"},
+    "yongsin": {"yongsin_detail", "wealth_analysis", "daeun_list", "daeun_cycle"},
+    "daeun": {"daeun_num", "daeun_list"},
+    "tengod": {"tengod_analysis", "tengod_analysis_dict", "forestellar_analysis", "relation_groups", "representative_tendency"},
+}
+# 호출 시각에 따라 달라지는 결과 키 (원국 캐시에 넣지 않음)
+TIME_SECTIONS = frozenset({"current_trace", "initial_yeonun", "initial_wolun", "now_year", "now_month", "initial_calendar"})
+# 같은 차트라도 입력 표기에 따라 달라지는 결과 키
+INPUT_SECTIONS = frozenset({"birth", "calendar_type", "location_name"})
+# 8글자가 같아도 생시/성별/지역에 따라 달라지는 원국 결과 키 (analyze_chart 에 없음)
+BIRTH_SECTIONS = frozenset({"solar_display", "corrected_display", "lunar_display", "lunar_type", "lng_diff_str",
+                            "gender_str", "me", "daeun_num", "daeun_list", "jasi_type", "gender", "ilju"})
+# analyze_chart 가 sections 와 무관하게 항상 담는 키
+CHART_CORE = frozenset({"me_elem", "representative_elem", "scores", "power", "status", "element_analysis", "me_kor"})
+
+# 생시 모름 모드(analyze_hours)에서 시간대별로 기본 계산하는 결과 키
+HOUR_SECTIONS = frozenset({"pillars", "ilju", "me", "me_elem", "jasi_type", "corrected_display", "scores", "power",
+                           "status", "representative_elem", "yongsin_detail", "daeun_num"})
+
+# 합/조후 보정 조합(analyze_options)별로 기본 계산하는 결과 키 (/api/re-analyze 가 쓰는 키 + 용신)
+OPTION_SECTIONS = frozenset({"scores", "power", "status", "representative_elem", "representative_tendency",
+                             "forestellar_analysis", "relation_groups", "tengod_analysis_dict", "yongsin_detail"})
+# analyze_options 결과 키 순서: "합 적용 여부" + "조후 적용 여부" (예: "10" = 합만 적용)
+OPTION_KEYS = ("00", "01", "10", "11")
+
+# analyze_hours 시간대 항목에만 붙는 키
+HOUR_ONLY_KEYS = frozenset({"branch", "branch_kor", "time_range", "birth_time", "birth"})
+
+# 원국 분석 / 기준일 항목 LRU 캐시 크기 (환경 변수로 조정, 0 이면 사용 안 함)
+NATAL_CACHE_SIZE = int(os.environ.get("SAJU_NATAL_CACHE_SIZE", "2048"))
+OVERLAY_CACHE_SIZE = int(os.environ.get("SAJU_OVERLAY_CACHE_SIZE", "2048"))
+# 8글자 단위 분석 캐시 크기, 오프라인 생성 파일 경로 (python chart_store.py 로 생성, 없으면 사용 안 함)
+CHART_CACHE_SIZE = int(os.environ.get("SAJU_CHART_CACHE_SIZE", "4096"))
+CHART_STORE_FILE = os.environ.get("SAJU_CHART_STORE", "./data/chart_store.sqlite")
+# 월 달력 캐시 크기 (기본값은 1900~2100년 전체 2,412개월)
+CALENDAR_CACHE_SIZE = int(os.environ.get("SAJU_CALENDAR_CACHE_SIZE", "2412"))
+
+
+def _common_fields(dicts):
+    """여러 dict 에서 모든 dict 의 값이 같은 키만 남긴 dict"""
+    first = dicts[0]
+    return {k: v for k, v in first.items() if all(k in d and d[k] == v for d in dicts[1:])}
+
 
 class SajuEngine:
-    def __init__(self, m_file, t_file):
-        with open(m_file, 'r', encoding='utf-8') as f: self.m_db = json.load(f)
-        with open(t_file, 'r', encoding='utf-8') as f: self.t_db = json.load(f)
-        self.SIXTY_GANZI = [f"{sc.STEMS[i%10]}{sc.BRANCHES[i%12]}" for i in range(60)]
+    def __init__(self, m_file, t_file=None, cache_size=None, chart_store=CHART_STORE_FILE):
+        # 만세력/절기는 typed array 저장소로 보관 (m_file 이 .bin 이면 mmap 으로 워커 간 공유)
+        self.m_db, self.t_db = load_data(m_file, t_file)
+        # 년/월/일주는 절기 타임라인으로 산술 계산 (m_db 는 음력 표시/역변환용)
+        self.pillars = PillarCalculator(self.t_db)
+        # 표준시/서머타임 보정 구간표 (epoch minute 경계 + bisect)
+        self.time_corrections = CorrectionTable.for_region("KR")
+        # 원국 분석 결과 캐시 (같은 사람의 연속 요청용)
+        self.natal_cache = LRUCache(NATAL_CACHE_SIZE if cache_size is None else cache_size)
+        # 기준일 항목(현재 운로, 초기 연운/월운/달력) 캐시: (날짜, 차트) 단위
+        self.overlay_cache = LRUCache(OVERLAY_CACHE_SIZE if cache_size is None else cache_size)
+        # 8글자 + 대운 방향 + 합/조후 옵션 단위 분석 캐시 (다른 생시라도 같은 원국이면 공유)
+        self.chart_cache = LRUCache(CHART_CACHE_SIZE if cache_size is None else cache_size)
+        self.chart_store = ChartStore.open(chart_store) if chart_store else None
+        # (년, 월) 불변 달력 캐시 (is_today 는 조회 시 덧씌움)
+        self.calendar_cache = LRUCache(CALENDAR_CACHE_SIZE)
+        self.SIXTY_GANZI = SIXTY_GANZI
 
     # ==========================================================================
     # 1. 시간 및 력법 관련 유틸리티 (Calendar & Time Utils)
@@ -19,25 +92,16 @@ class SajuEngine:
             i_y, i_m, i_d = dt_input.year, dt_input.month, dt_input.day
             is_leap = (calendar_type == "음력(윤달)")
             
-            for s_key, data in self.m_db.items():
-                if (data.get('ly') == i_y and data.get('lm') == i_m and 
-                    data.get('ld') == i_d and data.get('ls') == is_leap):
-                    solar_str = f"{s_key[:4]}-{s_key[4:6]}-{s_key[6:]} {dt_input.strftime('%H:%M')}"
-                    return datetime.strptime(solar_str, "%Y-%m-%d %H:%M"), True
+            solar = self.m_db.find_lunar(i_y, i_m, i_d, is_leap)
+            if solar:
+                return datetime.combine(solar, dt_input.time()), True
             return None, False
         
         return dt_input, True
 
     def _get_historical_correction(self, dt):
-        """역사적 표준시 및 서머타임 보정 (sc.DST_PERIODS 참조)"""
-        offset, ts = 0, dt.strftime("%Y%m%d%H%M")
-        if "190804010000" <= ts <= "191112312359": offset += 30
-        elif "195403210000" <= ts <= "196108092359": offset += 30
-        for start, end in sc.DST_PERIODS:
-            if start <= ts <= end:
-                offset -= 60
-                break
-        return offset
+        """역사적 표준시 및 서머타임 보정 (sc.HISTORICAL_CORRECTIONS 구간표 이분 탐색)"""
+        return self.time_corrections.offset_at(dt)
 
     def _get_equation_of_time(self, dt):
         """균시차(Equation of Time) 계산"""
@@ -52,27 +116,13 @@ class SajuEngine:
         return "NORMAL"
 
     def _get_solar_terms(self, dt_in):
-        """절기 정보 조회"""
-        year_terms = []
-        for y in [dt_in.year-1, dt_in.year, dt_in.year+1]:
-            if str(y) in self.t_db:
-                for t in self.t_db[str(y)]:
-                    t_copy = t.copy()
-                    t_copy['dt_obj'] = datetime.strptime(t['datetime'], "%Y-%m-%dT%H:%M")
-                    year_terms.append(t_copy)
-        year_terms.sort(key=lambda x: x['dt_obj'])
-        m_terms = [t for t in year_terms if t['isMonthChange']]
-
-        # 이전 절기: dt_in 이전 또는 같은 시간 중 가장 늦은 것
-        l_term = next((t for t in reversed(m_terms) if t['dt_obj'] <= dt_in), m_terms[0])
-
-        # 다음 절기: dt_in 이후 시간 중 가장 빠른 것
-        # 월건 보정을 위한 기준 절기 (현재 월의 절기 기준 찾기)
-        # dt_in이 2월 4일인 경우 입춘(2월 3일)을 반환해야 함
-        # dt_in 이후의 첫 번째 절기 반환
-        n_term = next((t for t in m_terms if t['dt_obj'] > dt_in), m_terms[-1])
-
-        return l_term, n_term
+        """절기 정보 조회 (dt_in 직전 절, 다음 절)
+
+        로드 시 정렬해 둔 절기 타임라인(epoch minute)에서 이분 탐색합니다.
+        이전 절기: dt_in 이전 또는 같은 시간 중 가장 늦은 것
+        다음 절기: dt_in 이후 시간 중 가장 빠른 것
+        """
+        return self.t_db.month_terms_around(dt_in)
 
     def _get_next_ganzi(self, ganzi):
         """상수를 사용하여 간지를 다음 순번으로 계산합니다 (예: 己酉 -> 庚戌)"""
@@ -115,12 +165,9 @@ class SajuEngine:
                 pass
             else:
                 # dt_raw가 l_term 이전 날짜면 갑진년
-                prev_date = l_term_dt.strftime('%Y%m%d')
-                prev_data = self.m_db.get(prev_date)
-                if prev_data:
-                    yG = prev_data['yG']
-                    # 월건은 갑진년 2월 = 을묘월
-                    mG = '乙卯'
+                yG = self.pillars.day_pillars(l_term_dt)[0]
+                # 월건은 갑진년 2월 = 을묘월
+                mG = '乙卯'
         else:
             # 같은 날짜면 월주 변경
             # 생시가 이전 절기 입절 시각을 넘으면 해당 월로 진입
@@ -166,41 +213,39 @@ class SajuEngine:
     #     else: return "극왕(極旺)"
 
 
-    def _get_element_distribution(self, palja, use_hap_correction=False, use_johoo_correction=False):
-        weights, hap_map = self._get_analysis_config(palja, use_hap_correction, use_johoo_correction)
-        dist_scores = {"목": 0.0, "화": 0.0, "토": 0.0, "금": 0.0, "수": 0.0}
-        effective_elements = [sc.ELEMENT_MAP[char] for char in palja]
+    def _get_element_distribution(self, chart, use_hap_correction=False, use_johoo_correction=False, config=None):
+        """오행 분포(%)와 합 보정이 반영된 8칸 오행 인덱스 리스트 반환 (config: 미리 구한 (weights, hap_map))"""
+        weights, hap_map = config or self._get_analysis_config(chart, use_hap_correction, use_johoo_correction)
+        dist = [0.0] * 5  # 목화토금수
+        effective_elements = list(chart.elems)
         HAP_RATIO = 0.5
 
         for i in range(8):
-            orig_elem = sc.ELEMENT_MAP[palja[i]]
+            orig_elem = chart.elems[i]
             weight = weights[i]
-            
+
             if i in hap_map:
                 new_elem = hap_map[i]
-                dist_scores[new_elem] += weight * HAP_RATIO
-                dist_scores[orig_elem] += weight * (1 - HAP_RATIO)
+                dist[new_elem] += weight * HAP_RATIO
+                dist[orig_elem] += weight * (1 - HAP_RATIO)
                 effective_elements[i] = new_elem
             else:
-                dist_scores[orig_elem] += weight
-                
-        total = sum(dist_scores.values())
-        for k in dist_scores:
-            dist_scores[k] = round((dist_scores[k] / total * 100), 1) if total > 0 else 0.0
-            
+                dist[orig_elem] += weight
+
+        total = sum(dist)
+        dist_scores = {ELEMENTS[k]: round((dist[k] / total * 100), 1) if total > 0 else 0.0 for k in range(5)}
         return dist_scores, effective_elements
 
-    def _calculate_strength_score(self, palja, effective_elements, me_hj, use_hap_correction=False, use_johoo_correction=False):
+    def _calculate_strength_score(self, chart, effective_elements, use_hap_correction=False, use_johoo_correction=False):
         """
-        [최종 통합판] 변환된 오행 리스트를 바탕으로 신강약 지수 계산
+        [최종 통합판] 변환된 오행 리스트(인덱스)를 바탕으로 신강약 지수 계산
         """
         # 1. 위치별 가중치 재설정 (일간 index 4는 제외)
-        # weights 인덱스는 palja/effective_elements의 인덱스와 동일
+        # weights 인덱스는 chart/effective_elements의 8칸 인덱스와 동일
         weights = {0: 10.0, 1: 10.0, 2: 10.0, 3: 30.0, 5: 15.0, 6: 10.0, 7: 15.0}
-        
+
         if use_johoo_correction:
-            month_b = palja[3]
-            if month_b in sc.WINTER_BS or month_b in sc.SUMMER_BS:
+            if chart.branches[1] in WINTER_SUMMER:
                 weights[3] += 5.0
             weights[0] *= 0.9
             weights[1] *= 0.9
@@ -209,28 +254,23 @@ class SajuEngine:
         strong_sum = 10.0  # 일간 본인 기본 점수
         total_presence = 10.0 + sum(weights.values())
 
-        me_elem = sc.ELEMENT_MAP[palja[4]] # 내 오행 (예: '토')
+        me_elem = chart.elems[4] # 내 오행
+        rooted = ROOTED[chart.me]
 
         for idx, weight in weights.items():
-            target_elem = effective_elements[idx] # [중요] 합/보정이 완료된 오행 사용
-            
-            # 내 일간 오행(me_elem)과 대상 오행(target_elem)의 관계 확인
-            relation = self._get_element_relation(me_elem, target_elem)
-            
-            # 비겁(비견/겁재)이거나 인성(편인/정인)이면 내 편
-            if relation in ['비겁', '인성']:
+            # [중요] 합/보정이 완료된 오행 사용, (대상 - 나) % 5 가 0(비겁) 또는 4(인성)이면 내 편
+            if (effective_elements[idx] - me_elem) % 5 in (0, 4):
                 strong_sum += weight
-                
+
                 # 통근 보너스 (지지에 뿌리가 있는지 확인)
-                char = palja[idx]
-                if idx in [1, 3, 5, 7] and palja[4] in sc.JIJANGAN_MAP.get(char, ""):
+                if idx % 2 == 1 and rooted[chart.code(idx)]:
                     bonus = weight * 0.3
                     strong_sum += bonus
                     total_presence += bonus
 
         # 3. 머릿수 보정 (effective_elements 기준)
-        strong_count = sum(1 for i, elem in enumerate(effective_elements) 
-                        if i != 4 and self._get_element_relation(me_elem, elem) in ['비겁', '인성'])
+        strong_count = sum(1 for i, elem in enumerate(effective_elements)
+                        if i != 4 and (elem - me_elem) % 5 in (0, 4))
         
         if strong_count >= 5: strong_sum += 5.0
         elif strong_count <= 1: strong_sum -= 5.0
@@ -270,7 +310,8 @@ class SajuEngine:
             # 2. 일반적인 억부용신 로직
             targets = sc.STRONG_ENERGY if power <= 49 else sc.WEAK_ENERGY
             eokbu_type = "/".join(targets)
-            needed_elements = [sc.HJ_TO_HG[hj] for hj in sc.HJ_ELEMENTS if sc.REL_MAP.get((me_hj_hanja, hj)) in targets]
+            relations = RELATION_TABLE[sc.HJ_ELEMENTS.index(me_hj_hanja)]
+            needed_elements = [ELEMENTS[k] for k in range(5) if relations[k] in targets]
             main_yongsin_name = f"{needed_elements[0]}(억부용신)"
 
         # 3. 실제 원국 내 존재 확인
@@ -305,55 +346,52 @@ class SajuEngine:
             "is_special": is_special
         }
     
-    def _get_ten_god(self, me, target, me_hj):
+    def _get_ten_god(self, me, target, me_hj=None):
+        """체용 변화가 적용된 음양 기준 십성 (TEN_GOD_TABLE 조회)
 
-        """체용 변화가 적용된 FUNCTIONAL_POLARITY를 참조하여 십성을 계산합니다."""
-        rel = sc.REL_MAP.get((me_hj, sc.E_MAP_HJ[target]))
-
-        is_same = (sc.FUNCTIONAL_POLARITY[me] == sc.FUNCTIONAL_POLARITY[target])
-        return sc.TEN_GODS_MAP.get((rel, is_same), "-")
+        me_hj 는 기존 호출 규격 호환용이며, 일간 오행은 me 에서 구합니다.
+        """
+        return TEN_GOD_TABLE[CHAR_INDEX[me]][CHAR_INDEX[target]]
 
-    def _investigate_sinsal(self, palja, me, me_hj):
+    def _investigate_sinsal(self, chart):
         """기존 코드를 유지하며 상세 표 출력용 필드를 추가합니다."""
-        y_ji, d_ji = palja[1], palja[5]
-        start_y, start_d = sc.BRANCHES.find(sc.SAMHAP_START_MAP[y_ji]), sc.BRANCHES.find(sc.SAMHAP_START_MAP[d_ji])
-        ilju_name = palja[4] + palja[5]
+        start_y, start_d = SAMHAP_START[chart.branches[0]], SAMHAP_START[chart.branches[2]]
+        me_sinsal = ME_SINSAL[chart.me]
 
         pillars = []
         for i in range(4):
-            g, j, special = palja[i*2], palja[i*2+1], []
-            s12_y = sc.SINSAL_12_NAMES[(sc.BRANCHES.find(j) - start_y) % 12]
-            s12_d = sc.SINSAL_12_NAMES[(sc.BRANCHES.find(j) - start_d) % 12]
+            s, b, special = chart.stems[i], chart.branches[i], []
+            s12_y = sc.SINSAL_12_NAMES[(b - start_y) % 12]
+            s12_d = sc.SINSAL_12_NAMES[(b - start_d) % 12]
             special.append(s12_y)
             if s12_d != s12_y: special.append(f"{s12_d}(일)")
-            
+
             sinsal_table_gan, sinsal_table_ji = [], [s12_y]
             if s12_d != s12_y: sinsal_table_ji.append(f"{s12_d}(일)")
 
-            for mapping, name, m_type in sc.ME_MAPPING_RULES:
-                val = mapping.get(me)
-                if val:
-                    if (m_type == "single" and j == val) or (m_type == "list" and j in val):
-                        if name not in special: special.append(name)
-                        sinsal_table_ji.append(name)
+            for name, branches in me_sinsal:
+                if b in branches:
+                    if name not in special: special.append(name)
+                    sinsal_table_ji.append(name)
 
-            if (g + j) in sc.BAEKHO_LIST:
+            if chart.ganzi[i] in BAEKHO_GANZI:
                 if "백호대살" not in special: special.append("백호대살"); sinsal_table_gan.append("백호대살")
-            if g in sc.HYEONCHIM_CHARS:
+            if s in HYEONCHIM_STEMS:
                 if "현침살" not in special: special.append("현침살"); sinsal_table_gan.append("현침살")
-            if j in sc.HYEONCHIM_CHARS:
+            if b in HYEONCHIM_BRANCHES:
                 if "현침살" not in special: special.append("현침살"); sinsal_table_ji.append("현침살")
 
-            gan_pol_str = "+" if sc.FUNCTIONAL_POLARITY[g] else "-"
-            ji_pol_str = "+" if sc.FUNCTIONAL_POLARITY[j] else "-"
-            
+            # 출력용 문자열 변환
+            g, j = sc.STEMS[s], sc.BRANCHES[b]
             pillars.append({
-                "gan": g, "gan_kor": sc.B_KOR[g], "gan_elem": sc.ELEMENT_MAP[g], "gan_pol": gan_pol_str,
-                "ji": j, "ji_kor": sc.B_KOR[j], "ji_elem": sc.ELEMENT_MAP[j], "ji_pol": ji_pol_str,
-                "t_gan": "본인" if i == 2 else self._get_ten_god(me, g, me_hj),
-                "t_ji": self._get_ten_god(me, j, me_hj),
+                "gan": g, "gan_kor": sc.B_KOR[g], "gan_elem": ELEMENTS[chart.elems[i*2]],
+                "gan_pol": "+" if chart.pols[i*2] else "-",
+                "ji": j, "ji_kor": sc.B_KOR[j], "ji_elem": ELEMENTS[chart.elems[i*2+1]],
+                "ji_pol": "+" if chart.pols[i*2+1] else "-",
+                "t_gan": "본인" if i == 2 else TEN_GOD_NAMES[chart.ten_god(i*2)],
+                "t_ji": TEN_GOD_NAMES[chart.ten_god(i*2+1)],
                 "jijangan": sc.JIJANGAN_MAP.get(j, "-"),
-                "unseong": sc.UNSEONG_MAP.get(me, {}).get(j, "-"),
+                "unseong": UNSEONG_TABLE[chart.me][b],
                 "sinsal_12": s12_y,
                 "special": sorted(list(set(special))),
                 "sinsal_table_gan": sorted(list(set(sinsal_table_gan))),
@@ -364,36 +402,39 @@ class SajuEngine:
     # ==========================================================================
     # 3. 대운 및 환경 분석 (Luck & Environment Analysis)
     # ==========================================================================
-    def _calculate_daeun(self, dt_in, yG, mG, gender, l_term, n_term, me, me_hj):
-        """대운수 및 상세 정보(이미지 스타일) 계산"""
-        is_fwd = (gender == 'M' and sc.POLARITY_MAP[yG[0]] == '+') or (gender == 'F' and sc.POLARITY_MAP[yG[0]] == '-')
+    def _is_daeun_forward(self, year_stem, gender):
+        """대운 순행 여부 (양남음녀 순행, 음남양녀 역행)"""
+        return (gender == 'M' and sc.POLARITY_MAP[year_stem] == '+') or (gender == 'F' and sc.POLARITY_MAP[year_stem] == '-')
+
+    def _calculate_daeun_num(self, dt_in, is_fwd, l_term, n_term):
+        """대운수: 순행이면 다음 절, 역행이면 이전 절까지의 일수 / 3"""
         target_term = n_term if is_fwd else l_term
-        daeun_num = max(1, int(round(abs((target_term['dt_obj'] - dt_in).total_seconds() / 86400) / 3.0)))
-        
-        daeun_list = []
-        curr_idx = self.SIXTY_GANZI.index(mG)
+        return max(1, int(round(abs((target_term['dt_obj'] - dt_in).total_seconds() / 86400) / 3.0)))
+
+    def _calculate_daeun_cycle(self, chart, is_fwd):
+        """월주에서 순행/역행으로 이어지는 대운 10개 (시작 나이 제외, 원국만으로 결정)"""
+        cycle = []
+        curr_idx = chart.ganzi[1]
+        ten_gods, unseong = TEN_GOD_TABLE[chart.me], UNSEONG_TABLE[chart.me]
         
         # 이미지처럼 보통 10개 혹은 11개의 대운을 보여줍니다.
-        for i in range(1, 11):
+        for _ in range(10):
             curr_idx = (curr_idx + 1) % 60 if is_fwd else (curr_idx - 1) % 60
-            ganzi = self.SIXTY_GANZI[curr_idx]
-            g, j = ganzi[0], ganzi[1]
+            s_i, b_i = curr_idx % 10, curr_idx % 12
             
-            daeun_list.append({
-                "start_age": daeun_num + (i-1)*10,
-                "ganzi": ganzi,
-                "gan": g,
-                "gan_kor": sc.B_KOR[g],
-                "gan_elem": sc.ELEMENT_MAP[g],
-                "t_gan": self._get_ten_god(me, g, me_hj), # 천간 십성
-                "ji": j,
-                "ji_kor": sc.B_KOR[j],
-                "ji_elem": sc.ELEMENT_MAP[j],
-                "t_ji": self._get_ten_god(me, j, me_hj), # 지지 십성
-                "unseong": sc.UNSEONG_MAP.get(me, {}).get(j, "-"), # 12운성
+            cycle.append({
+                "ganzi": SIXTY_GANZI[curr_idx],
+                "gan": CHARS[s_i],
+                "gan_kor": CHAR_KOR[s_i],
+                "gan_elem": ELEMENTS[CHAR_ELEM[s_i]],
+                "t_gan": ten_gods[s_i], # 천간 십성
+                "ji": CHARS[10 + b_i],
+                "ji_kor": CHAR_KOR[10 + b_i],
+                "ji_elem": ELEMENTS[CHAR_ELEM[10 + b_i]],
+                "t_ji": ten_gods[10 + b_i], # 지지 십성
+                "unseong": unseong[b_i], # 12운성
             })
-            
-        return daeun_num, daeun_list
+        return cycle
 
     def _calculate_daeun_scores(self, daeun_list, yongsin_info, palja):
         """대운 점수 산출"""
@@ -419,84 +460,17 @@ class SajuEngine:
     # SajuEngine 클래스 내부에 추가
     def get_yeonun_only(self, birth_year, daeun_start_age, me_gan, me_hj):
         """
-        특정 대운의 10년치 연운 데이터를 생성합니다. (누락 필드 보강)
+        특정 대운의 10년치 연운 데이터 (최신 연도가 왼쪽), LUCK_TABLE 조회
+        결과는 공유되는 불변 tuple/FrozenDict 입니다. (me_hj 는 호출 규격 호환용)
         """
-        yeonun_list = []
-        start_year = int(birth_year) + int(daeun_start_age) - 1
-        # [수정] 일간 천간(庚)의 한자 오행(金)을 가져옴
-        me_elem = sc.E_MAP_HJ.get(me_gan)
-        
-        for i in range(10):
-            target_year = start_year + i
-            ganzi_idx = (target_year - 2023 + 39) % 60
-            ganzi = self.SIXTY_GANZI[ganzi_idx]
-            g, j = ganzi[0], ganzi[1]
-            
-            yeonun_list.append({
-                "year": target_year,
-                "ganzi": ganzi,             # 한자 원문 (예: '癸')
-                "gan_kor": sc.B_KOR[g],      # 한글 (예: '계')
-                "gan_elem": sc.ELEMENT_MAP[g],
-                "t_gan": self._get_ten_god(me_gan, g, me_elem), # 천간 십성
-                "ji": j,                    # 지지 한자 원문
-                "ji_kor": sc.B_KOR[j],       # 지지 한글
-                "ji_elem": sc.ELEMENT_MAP[j],
-                "t_ji": self._get_ten_god(me_gan, j, me_elem), # 지지 십성
-                "unseong": sc.UNSEONG_MAP.get(me_gan, {}).get(j, "-"), # 12운성
-            })
-            # debug_json = json.dumps(yeonun_list, indent=4, ensure_ascii=False, default=str)
-            # print(f"\n>>> DEBUG REPORT:\n{debug_json}, -{g}, -{j}")
-        return yeonun_list[::-1] # 최신 연도가 왼쪽으로 오게 정렬
+        return LUCK_TABLE.yeonun(me_gan, birth_year, daeun_start_age)
+
     def get_wolun_only(self, target_year, me_gan, me_hj):
         """
-        포스텔러 방식: 양력 1월(전년도 축월)부터 12월(당해년도 자월)까지 계산
+        포스텔러 방식: 양력 1월(전년도 축월)부터 12월(당해년도 자월)까지, 12월부터 내림차순
+        결과는 공유되는 불변 tuple/FrozenDict 입니다. (me_hj 는 호출 규격 호환용)
         """
-        wolun_list = []
-        me_elem = sc.E_MAP_HJ.get(me_hj) # 일간 오행 (예: '金')
-        target_year = int(target_year)
-
-        # 1. 당해년도분 계산 (양력 2월 ~ 12월 = 사주 인월 ~ 자월)
-        y_idx = (target_year - 2023 + 39) % 60
-        y_stem = self.SIXTY_GANZI[y_idx][0]
-        # 연두법 공식 적용
-        start_stem_idx = (sc.STEMS.index(y_stem) * 2 + 2) % 10
-        
-        for i in range(11): # 인(寅)월부터 자(子)월까지 11개 달
-            g = sc.STEMS[(start_stem_idx + i) % 10]
-            j = sc.BRANCHES[(2 + i) % 12]
-            wolun_list.append({
-                "month": i + 2, # 양력 2월 ~ 12월로 라벨링
-                "ganzi": g + j,
-                "gan_kor": sc.B_KOR[g],
-                "gan_elem": sc.ELEMENT_MAP[g],
-                "t_gan": self._get_ten_god(me_gan, g, me_elem),
-                "ji_kor": sc.B_KOR[j],
-                "ji_elem": sc.ELEMENT_MAP[j],
-                "t_ji": self._get_ten_god(me_gan, j, me_elem),
-                "unseong": sc.UNSEONG_MAP.get(me_gan, {}).get(j, "-"),
-            })
-
-        # 2. 전년도분 계산 (양력 1월 = 사주 전년도 축월)
-        y_prev_idx = (target_year - 1 - 2023 + 39) % 60
-        y_prev_stem = self.SIXTY_GANZI[y_prev_idx][0]
-        start_stem_prev_idx = (sc.STEMS.index(y_prev_stem) * 2 + 2) % 10
-        
-        g_jan = sc.STEMS[(start_stem_prev_idx + 11) % 10] # 12번째 달(축월)
-        j_jan = sc.BRANCHES[(2 + 11) % 12] # 丑
-        wolun_list.append({
-            "month": 1, # 양력 1월로 라벨링
-            "ganzi": g_jan + j_jan,
-            "gan_kor": sc.B_KOR[g_jan],
-            "gan_elem": sc.ELEMENT_MAP[g_jan],
-            "t_gan": self._get_ten_god(me_gan, g_jan, me_elem),
-            "ji_kor": sc.B_KOR[j_jan],
-            "ji_elem": sc.ELEMENT_MAP[j_jan],
-            "t_ji": self._get_ten_god(me_gan, j_jan, me_elem),
-            "unseong": sc.UNSEONG_MAP.get(me_gan, {}).get(j_jan, "-"),
-        })
-
-        # [정렬] 12월부터 1월까지 내림차순 정렬 (오른쪽이 작은 숫자)
-        return sorted(wolun_list, key=lambda x: x['month'], reverse=True)
+        return LUCK_TABLE.wolun(me_gan, target_year)
     
     def _analyze_wealth_and_career(self, pillars, power, yongsin_elements):
         """재물/커리어 성공 지수 분석"""
@@ -521,93 +495,21 @@ class SajuEngine:
         get_grade = lambda s: "S (최상)" if s >= 85 else "A (우수)" if s >= 70 else "B (보통)" if s >= 55 else "C (관리필요)"
         return {"wealth_score": min(100, ws), "career_score": min(100, cs), "wealth_grade": get_grade(ws), "career_grade": get_grade(cs)}
 
-    def _analyze_interactions(self, palja):
+    def _analyze_interactions(self, chart):
         """
         인덱스를 년(0), 월(1), 일(2), 시(3) 순서로 고정하여 화면과 동기화합니다.
-        양방향 체크 로직을 통해 딕셔너리 키 순서와 상관없이 모든 상호작용을 검출합니다.
+        천간/지지 쌍 테이블과 삼합/방합 비트마스크로 검출합니다 (saju_interactions).
         """
-        res = {k: [] for k in sc.INTERACTION_KEYS}
-        sl = [palja[0], palja[2], palja[4], palja[6]]
-        bl = [palja[1], palja[3], palja[5], palja[7]]
-        
-        for i in range(4):
-            for j in range(i + 1, 4):
-                for key, mapping, target_type in sc.PAIRWISE_RULES:
-                    target_list = sl if target_type == "stem" else bl
-                    
-                    # [수정 구간] 두 글자의 조합을 양방향으로 생성하여 체크합니다.
-                    char1, char2 = target_list[i], target_list[j]
-                    pair1 = char1 + char2
-                    pair2 = char2 + char1
-                    
-                    # 정방향(pair1) 또는 역방향(pair2) 중 하나라도 매핑 테이블에 있는지 확인합니다.
-                    if pair1 in mapping:
-                        res[key].append({"name": mapping[pair1], "subs": [i, j]})
-                    elif pair2 in mapping:
-                        res[key].append({"name": mapping[pair2], "subs": [i, j]})
-                        
+        return find_interactions(chart.stems, chart.branches, chart.ganzi[2])
 
-        
-        # 삼합/방합/삼형 등 그룹 단위 분석
-        self._check_group_interactions(bl, res)
-        
-        # 공망 분석
-        ilju_name = palja[4] + palja[5]
-        g_jis = sc.GONGMANG_MAP[self.SIXTY_GANZI.index(ilju_name) // 10]
-         
-        for i, b in enumerate(bl):
-            if b in g_jis: 
-                res["공망"].append({"name": f"{sc.POSITIONS[i]} 공망({sc.B_KOR.get(b, b)})", "subs": [i]})
-
-        # 결과값 중복 제거 및 가나다순 정렬
-        unique_res = {}
-        pos_names = ["년", "월", "일", "시"] # 위치 명칭 정의
-
-        for k, v in res.items():
-            # 1. 이름별로 그룹화하여 위치(subs)를 합침
-            combined = {}
-            for item in v:
-                name = item["name"]
-                if name not in combined:
-                    combined[name] = set(item["subs"]) # set으로 중복 위치 방지
-                else:
-                    combined[name].update(item["subs"]) # 새로운 위치 인덱스 추가
-
-            # 2. 합쳐진 위치를 바탕으로 표시용 이름 생성
-            final_list = []
-            for name, subs_set in combined.items():
-                sorted_subs = sorted(list(subs_set)) # 인덱스 정렬 [0, 2, 3]
-                
-                # 위치 명칭 추출 (예: "년-일-시")
-                loc_str = "-".join([pos_names[i] for i in sorted_subs])
-                
-                # 표시용 이름 결정: 2개 이상 중첩되면 위치를 병기함
-                display_name = f"{name}({loc_str})" if len(sorted_subs) > 2 else name
-                
-                final_list.append({
-                    "name": display_name,     # 화면 표시용 (예: 자묘형(년-일-시))
-                    "pure_name": name,        # 순수 명칭 (해석 데이터 매칭용)
-                    "subs": sorted_subs       # 하이라이트할 모든 인덱스 [0, 2, 3]
-                })
-
-            # 가나다순 정렬하여 저장
-            unique_res[k] = sorted(final_list, key=lambda x: x["name"])
-        return unique_res
-
-    def _check_group_interactions(self, bl, res):
-        """삼합/방합 분석"""
-        for key, (val, king) in sc.B_SAMHAP.items():
-            match_indices = [idx for idx, b in enumerate(bl) if b in key]
-            if len(set(match_indices)) >= 3: res["지지삼합"].append({"name": f"{val} 삼합", "subs": match_indices})
-            elif len(set(match_indices)) == 2 and king in bl:
-                chars = "".join([sc.B_KOR.get(bl[idx], bl[idx]) for idx in match_indices])
-                res["지지삼합"].append({"name": f"{chars} 반합({val})", "subs": match_indices})
-        for key, val in sc.B_BANGHAP.items():
-            match_indices = [idx for idx, b in enumerate(bl) if b in key]
-            if len(set(match_indices)) >= 3: res["지지방합"].append({"name": val, "subs": match_indices})
-            elif len(set(match_indices)) == 2:
-                chars = "".join([sc.B_KOR.get(bl[idx], bl[idx]) for idx in match_indices])
-                res["지지방합"].append({"name": f"{chars} 반합", "subs": match_indices})
+    def get_incoming_interactions(self, palja, ganzi):
+        """원국(palja 8글자)과 들어오는 운 기둥(ganzi: 대운/세운/일진 간지)의 상호작용
+
+        결과 형태는 analyze()['interactions'] 와 같고, 운 기둥의 위치 번호는 4('운')입니다.
+        """
+        chart = palja if isinstance(palja, Chart) else Chart.from_palja(palja)
+        return find_interactions(chart.stems + (CHAR_INDEX[ganzi[0]],), chart.branches + (CHAR_INDEX[ganzi[1]] - 10,),
+                                 chart.ganzi[2], anchor=4)
 
     def _get_element_status(self, scores):
         """오행 상태 진단"""
@@ -622,55 +524,34 @@ class SajuEngine:
             }
         return results
 
-    def _get_tengod_distribution(self, palja, use_hap_correction=False, use_johoo_correction=False):
+    def _get_tengod_distribution(self, chart, use_hap_correction=False, use_johoo_correction=False, config=None):
         # 1. 공통 설정(가중치, 합 맵) 로드 - 오행 함수와 동일한 weights를 사용함
-        if len(palja) != 8:
-            raise ValueError(f"팔자 데이터가 부족합니다. 현재 {len(palja)}개만 입력되었습니다.")
-    
-        weights, hap_map = self._get_analysis_config(palja, use_hap_correction, use_johoo_correction)
-        
-        # 결과 저장용 딕셔너리
-        scores = {tg: 0.0 for tg in ["비견", "겁재", "식신", "상관", "편재", "정재", "편관", "정관", "편인", "정인"]}
-        
-        me_gan = palja[4] # 일간
-        me_elem_han = sc.HG_TO_HJ[sc.ELEMENT_MAP[me_gan]] # 일간의 한자 오행 (예: '木')
-        me_pol = sc.POLARITY_MAP[me_gan]
-        
+        weights, hap_map = config or self._get_analysis_config(chart, use_hap_correction, use_johoo_correction)
+
+        # 결과 저장용 (TEN_GOD_NAMES 순서: 비견, 겁재, 식신, ... 정인)
+        scores = [0.0] * 10
+
         HAP_RATIO = 0.5 # 합 보정 시 에너지 배분 비율 (50%)
 
         for i in range(8):
-            char = palja[i]
             weight = weights[i]
-            
-            # 원래 글자의 한자 오행과 음양
-            char_elem_han = sc.HG_TO_HJ[sc.ELEMENT_MAP[char]]
-            char_pol = sc.POLARITY_MAP[char]
-            is_same_pol = (me_pol == char_pol)
-            
-            # A. 원래 이 자리에 있어야 할 십성 계산
-            rel_group = sc.REL_MAP.get((me_elem_han, char_elem_han))
-            orig_tg = sc.TEN_GODS_MAP.get((rel_group, is_same_pol))
-            
-            # 일간 본인 자리는 '비견'으로 강제 설정
-            if i == 4: orig_tg = "비견"
+
+            # A. 원래 이 자리에 있어야 할 십성 (일간 본인 자리는 '비견'으로 강제 설정)
+            orig_tg = 0 if i == 4 else chart.ten_god(i)
 
             if i in hap_map:
-                # B. 합으로 변한 오행의 새로운 십성 계산
-                new_elem_han = sc.HG_TO_HJ[hap_map[i]] # 합 결과 한글('금') -> 한자('金')
-                new_rel_group = sc.REL_MAP.get((me_elem_han, new_elem_han))
-                new_tg = sc.TEN_GODS_MAP.get((new_rel_group, is_same_pol))
-                
-                # 오행 점수 배분과 동일하게 5:5로 십성 점수 배분
-                if new_tg in scores: scores[new_tg] += weight * HAP_RATIO
-                if orig_tg in scores: scores[orig_tg] += weight * (1 - HAP_RATIO)
+                # B. 합으로 변한 오행의 새로운 십성, 오행 점수 배분과 동일하게 5:5로 배분
+                new_tg = chart.ten_god(i, hap_map[i])
+                scores[new_tg] += weight * HAP_RATIO
+                scores[orig_tg] += weight * (1 - HAP_RATIO)
             else:
                 # 합이 없으면 원래 십성에 100% 부여
-                if orig_tg in scores:
-                    scores[orig_tg] += weight
+                scores[orig_tg] += weight
 
         # 3. 정규화 (100% 환산)
-        total = sum(scores.values())
-        return {tg: {"count": scores[tg], "ratio": f"{(scores[tg]/total*100):.1f}%" if scores[tg] > 0 else "-"} for tg in scores}
+        total = sum(scores)
+        return {tg: {"count": scores[k], "ratio": f"{(scores[k]/total*100):.1f}%" if scores[k] > 0 else "-"}
+                for k, tg in enumerate(TEN_GOD_NAMES)}
     def _get_combined_analysis(self, scores, me_elem, pillars):
         """포스텔러 스타일: 오행(목~수)을 고정하고 십성을 그에 맞춰 배치합니다."""
         elements = ["목", "화", "토", "금", "수"]
@@ -712,161 +593,449 @@ class SajuEngine:
             })
         return combined_list
     
-    def get_month_calendar(self, year, month):
-        import calendar
-        cal_data = []
-        last_day = calendar.monthrange(year, month)[1]
-        
-        # 1. 해당 월의 첫날과 마지막 날 데이터를 가져옴
-        first_info = self.m_db.get(f"{year}{month:02d}01")
-        last_info = self.m_db.get(f"{year}{month:02d}{last_day:02d}")
-        
-        saju_header = ""
-        if first_info and last_info:
-            # [수정] 포스텔러 스타일: 연도는 마지막 날(새로운 기운)을 기준으로 하나만 표시
-            # 2026년 2월의 경우, 마지막 날은 입춘 이후이므로 '병오년'으로 고정됩니다.
-            y_final = f"{sc.B_KOR[last_info['yG'][0]]}{sc.B_KOR[last_info['yG'][1]]}"
-            year_part = f"{y_final}년"
-                
-            # [월 범위] 월건은 기존처럼 범위로 표시 (절기 변화 강조)
-            m_start = f"{sc.B_KOR[first_info['mG'][0]]}{sc.B_KOR[first_info['mG'][1]]}"
-            m_end = f"{sc.B_KOR[last_info['mG'][0]]}{sc.B_KOR[last_info['mG'][1]]}"
-            
-            if m_start != m_end:
-                month_part = f"{m_start}~{m_end}월" # 예: "기축~경인월"
-            else:
-                month_part = f"{m_start}월"
-                
-            # [최종 헤더] "병오년 기축~경인월"
-            saju_header = f"{year_part} {month_part}"
-
-        for day in range(1, last_day + 1):
-            date_str = f"{year}{month:02d}{day:02d}"
-            day_info = self.m_db.get(date_str)
-            if day_info:
-                dg = day_info['dG']
-                term_name, term_time = "", ""
-                year_terms = self.t_db.get(str(year), [])
-                for t in year_terms:
-                    if t['datetime'].startswith(f"{year}-{month:02d}-{day:02d}"):
-                        term_name = t['term']
-                        term_time = t['datetime'].split('T')[1]
-                        break
-
-                cal_data.append({
-                    "day": day,
-                    "ganzi_kor": f"{sc.B_KOR[dg[0]]}{sc.B_KOR[dg[1]]}",
-                    "ganzi_hj": dg,
-                    "lunar": f"{day_info['lm']}.{day_info['ld']}",
-                    "term_name": term_name,
-                    "term_time": term_time,
-                    "is_today": (datetime.now().strftime("%Y%m%d") == date_str)
-                })
-        
-        first_weekday = (calendar.monthrange(year, month)[0] + 1) % 7 
-        return {
-            "first_weekday": first_weekday, 
-            "days": cal_data,
-            "saju_header": saju_header # "을사년 정해~무자월" 형태
-        }
+    def get_month_calendar(self, year, month, today=None):
+        """월별 일진 달력 (today: is_today 표시 기준일, 기본값: 오늘)"""
+        return self.month_calendar(year, month).to_dict(today or datetime.now())
+
+    def month_calendar(self, year, month) -> MonthCalendar:
+        """(년, 월) 불변 달력 객체 (calendar_cache 에 보관)"""
+        key = (year, month)
+        cal = self.calendar_cache.get(key)
+        if cal is None:
+            cal = MonthCalendar.build(self.m_db, self.t_db, year, month)
+            self.calendar_cache.put(key, cal)
+        return cal
+
+    def warm_calendar(self, start_year=1900, end_year=2100):
+        """start_year~end_year 전체 월 달력을 미리 생성 (기본 2,412개월), 생성한 개월 수 반환"""
+        count = 0
+        for year in range(start_year, end_year + 1):
+            for month in range(1, 13):
+                self.month_calendar(year, month)
+                count += 1
+        return count
     
     def _determine_ten_god(self, me_gan, target_char, target_elem):
         """
         일간(me_gan)과 대상 글자(target_char)의 음양, 
         그리고 변화된 결과 오행(target_elem)을 비교하여 십성을 반환합니다.
         """
-        me_elem = sc.ELEMENT_MAP[me_gan]
-        # 음양 비교 (천간/지지 통합)
-        is_same_polarity = sc.FUNCTIONAL_POLARITY[me_gan] == sc.FUNCTIONAL_POLARITY[target_char]
-        
-        # 오행 관계 추출 (생극제화)
-        # sc.RELATION_MAP = {('목', '화'): '생', ('목', '토'): '극', ...} 형태라 가정
-        relation = self._get_element_relation(me_elem, target_elem)
-        
-        # 관계에 따른 십성 매핑
-        mapping = {
-            '비겁': ('비견', '겁재'),
-            '식상': ('식신', '상관'),
-            '재성': ('편재', '정재'),
-            '관성': ('편관', '정관'),
-            '인성': ('편인', '정인')
-        }
-        
-        pair = mapping.get(relation, ('비견', '겁재'))
-        return pair[0] if is_same_polarity else pair[1]
+        # [일간][대상 글자 음양][변화된 오행] 테이블 조회
+        pol = CHAR_POL[CHAR_INDEX[target_char]]
+        return TEN_GOD_NAMES[TEN_GOD_BY_ELEM[CHAR_INDEX[me_gan]][pol][ELEM_INDEX[target_elem]]]
     
     def _get_element_relation(self, me, target):
-        """일간 오행(me)과 대상 오행(target)의 생극 관계 반환"""
-        if me == target: return '비겁'
-        
-        order = ['목', '화', '토', '금', '수']
-        m_idx = order.index(me)
-        t_idx = order.index(target)
-        
-        # 오행의 거리에 따른 관계 (나를 기준으로 상대가 몇 번째 뒤에 있는가)
-        diff = (t_idx - m_idx) % 5
-        
-        if diff == 1: return '식상'  # 목 -> 화 (내가 생함)
-        if diff == 2: return '재성'  # 목 -> 토 (내가 극함)
-        if diff == 3: return '관성'  # 금 -> 목 (나를 극함)
-        if diff == 4: return '인성'  # 수 -> 목 (나를 생함)
-        return '비겁'
-
-    def _get_analysis_config(self, palja, use_hap_correction, use_johoo_correction):
-        """가중치와 합 정보를 한 곳에서 관리"""
+        """일간 오행(me)과 대상 오행(target)의 생극 관계 반환 (RELATION_TABLE 조회)"""
+        return RELATION_TABLE[ELEM_INDEX[me]][ELEM_INDEX[target]]
+
+    def _get_analysis_config(self, chart, use_hap_correction, use_johoo_correction, shared=None):
+        """가중치와 합 정보를 한 곳에서 관리 (hap_map: 8칸 위치 -> 합 결과 오행 인덱스)
+
+        shared: 같은 차트의 옵션 조합끼리 공유하는 dict (합 맵은 조후 옵션과 무관하므로 한 번만 계산)
+        """
         # 1. 가중치 설정
         if use_johoo_correction:
             weights = [10.0, 10.0, 10.0, 30.0, 10.0, 15.0, 10.0, 15.0]
-            month_b = palja[3]
-            if month_b in sc.WINTER_BS or month_b in sc.SUMMER_BS:
+            if chart.branches[1] in WINTER_SUMMER:
                 weights[3] += 5.0
             weights[0] *= 0.9
             weights[1] *= 0.9
         else:
             weights = [12.5] * 8
 
-        # 2. 합(Hap) 맵 생성
+        # 2. 합(Hap) 맵 생성 (삼합/방합, 왕지 포함 반합)
         hap_map = {}
-        if use_hap_correction:
-            jiji_indices = [1, 3, 5, 7]
-            jiji_chars = [palja[i] for i in jiji_indices]
-            all_hap_rules = {**sc.B_SAMHAP, **sc.B_BANGHAP}
-            
-            for rule_chars, val_info in all_hap_rules.items():
-                res_elem = (val_info[0] if isinstance(val_info, (tuple, list)) else val_info)[0]
-                matched_indices = [idx for idx, c in enumerate(jiji_chars) if c in rule_chars]
-                unique_matched = set([jiji_chars[i] for i in matched_indices])
-                
-                if len(unique_matched) >= 3 or (len(unique_matched) >= 2 and any(w in unique_matched for w in "子午卯酉")):
+        if use_hap_correction and shared is not None and "hap_map" in shared:
+            hap_map = shared["hap_map"]
+        elif use_hap_correction:
+            for rule_branches, res_elem in HAP_GROUPS:
+                matched_indices = [idx for idx, b in enumerate(chart.branches) if b in rule_branches]
+                unique_matched = {chart.branches[i] for i in matched_indices}
+
+                if len(unique_matched) >= 3 or (len(unique_matched) >= 2 and not unique_matched.isdisjoint(WANGJI)):
                     for slot in matched_indices:
-                        hap_map[jiji_indices[slot]] = res_elem
-                        
-        return weights, hap_map   
+                        hap_map[slot * 2 + 1] = res_elem
+            if shared is not None: shared["hap_map"] = hap_map
+
+        return weights, hap_map
     # ==========================================================================
     # 4. 메인 분석 엔진 (Main Analysis Orchestrator)
     # ==========================================================================
-    def analyze(self, birth_str, gender, location, use_yajas_i, calendar_type="양력",use_hap_correction=False, use_johoo_correction=False):
+    def analyze(self, birth_str, gender, location, use_yajas_i, calendar_type="양력",use_hap_correction=False, use_johoo_correction=False,
+                sections=None, as_of=None):
+        """사주 전체 분석
+
+        sections: 필요한 결과 키 집합 (예: {"scores", "power"}). 지정하면 해당 키만 담아 반환하고
+                  그 키들이 의존하지 않는 계산(달력, 연운/월운, 상호작용 등)은 건너뜁니다.
+                  sections=TIME_SECTIONS 이면 기준일 항목(overlay)만 반환합니다.
+        as_of: 현재 운로/초기 연운·월운·달력의 기준 시각 (기본값: 지금)
+        """
         # 1. 입력 날짜 파싱 및 양력 변환
         dt_raw, success = self._parse_and_convert_to_solar(birth_str, calendar_type)
         if not success: return {"error": f"입력 날짜({birth_str})를 찾을 수 없습니다."}
-        
-        # 2. 지역 경도 및 역사적 표준시 보정 (시각 결정)
+        return self._analyze_dt(dt_raw, birth_str, gender, location, use_yajas_i, calendar_type,
+                                use_hap_correction, use_johoo_correction,
+                                sections=frozenset(sections) if sections is not None else None, as_of=as_of)
+
+    def analyze_natal(self, birth_str, gender, location, use_yajas_i, calendar_type="양력",
+                      use_hap_correction=False, use_johoo_correction=False):
+        """기준일과 무관한 원국 분석만 반환 (TIME_SECTIONS 항목 없음, 날짜가 바뀌어도 동일)"""
+        dt_raw, success = self._parse_and_convert_to_solar(birth_str, calendar_type)
+        if not success: return {"error": f"입력 날짜({birth_str})를 찾을 수 없습니다."}
+        return self._analyze_dt(dt_raw, birth_str, gender, location, use_yajas_i, calendar_type,
+                                use_hap_correction, use_johoo_correction, overlay=False)
+
+    def analyze_hours(self, birth_date, gender, location, use_yajas_i=True, calendar_type="양력",
+                      use_hap_correction=False, use_johoo_correction=False, sections=HOUR_SECTIONS, as_of=None):
+        """생시 모름 모드: 날짜만으로 시간대별 원국과 시간과 무관한 3주(년/월/일) 공통 결과를 한 번에 반환
+
+        하루(원본 시계 00:00~23:59)를 8글자와 야자시/조자시 구분이 같은 구간으로 나눠
+        구간마다 대표 시각(중간)으로 분석합니다. 자시(새벽/밤)와 야자시에 걸친 해시, 보정 후 자정(일주 변경)에서
+        나뉘어 보통 13~16개입니다.
+        입력 변환, 경도 보정, 기준일 항목은 한 번만 계산하고 8글자 분석은 chart_cache 를 공유합니다.
+
+        Args:
+            birth_date: "YYYY-MM-DD" (시각이 붙어 있으면 무시)
+            sections: 시간대별 결과에 담을 키 (기본 HOUR_SECTIONS, None 이면 전체)
+        Returns:
+            {"birth", "calendar_type", "location_name",
+             "hours": [{"branch", "branch_kor", "time_range", "birth_time", **결과}, ...] (시각 순),
+             "three_pillar": 모든 시간대에서 같은 값만 모은 결과 (pillars 는 년/월/일 3주)}
+        """
+        birth_date = birth_date[:10]
+        dt_day, success = self._parse_and_convert_to_solar(f"{birth_date} 12:00", calendar_type)
+        if not success: return {"error": f"입력 날짜({birth_date})를 찾을 수 없습니다."}
+        keep = frozenset(sections) if sections is not None else None
+        as_of = as_of or datetime.now()
+
+        # 원본 시계 분(0~1439) 경계: _boundary_candidates 의 후보 시각 중 8글자나 조자시/야자시 구분이
+        # 바뀌는 분 (보정값은 분마다 실제 값을 쓰므로 서머타임/표준시 변경일에도 맞음)
+        lng_off = int(round((sc.CITY_DATA.get(location, sc.DEFAULT_LNG) - 135) * 4))
+        base = minute_index(dt_day.replace(hour=0, minute=0))
+
+        def state(minute):
+            dt_raw = datetime_of(minute)
+            dt_solar = dt_raw + timedelta(minutes=self.time_corrections.offset(minute) + lng_off)
+            determined = self._determine_pillars(dt_raw, dt_solar, use_yajas_i)
+            return determined and (tuple(determined[0]), determined[3])
+
+        prev = state(base)
+        if prev is None: return {"error": "DB 데이터가 없습니다."}
+        bounds = [0]
+        for minute in self._boundary_candidates(base, base + 1439, lng_off):
+            cur = state(minute)
+            if cur is None: return {"error": "DB 데이터가 없습니다."}
+            if cur != prev: bounds.append(minute - base)
+            prev = cur
+        bounds.append(1440)
+
+        hours, shared = [], {}
+        for lo, hi in zip(bounds, bounds[1:]):
+            dt_raw = datetime_of(base + (lo + hi - 1) // 2)
+            result = self._analyze_dt(dt_raw, f"{birth_date} {dt_raw:%H:%M}", gender, location, use_yajas_i,
+                                      calendar_type, use_hap_correction, use_johoo_correction,
+                                      shared=shared, sections=keep | {"pillars"} if keep is not None else None,
+                                      as_of=as_of)
+            if "error" in result: return result
+            branch = result["pillars"][3]["ji"]
+            if keep is not None and "pillars" not in keep:
+                result = {k: v for k, v in result.items() if k != "pillars"}
+            hours.append({
+                "branch": branch, "branch_kor": sc.B_KOR[branch],
+                "time_range": f"{lo // 60:02d}:{lo % 60:02d}~{(hi - 1) // 60:02d}:{(hi - 1) % 60:02d}",
+                "birth_time": f"{dt_raw:%H:%M}",
+                **result
+            })
+
+        # 3주 공통 결과: 그날 일주를 쓰는 시간대(조자시 제외)에서 값이 모두 같은 항목만
+        same_day = [h for h in hours if h.get("jasi_type") != "JOJAS-I"] or hours
+        three_pillar = _common_fields([{k: v for k, v in h.items() if k not in HOUR_ONLY_KEYS} for h in same_day])
+        if all(h.get("pillars") for h in same_day):
+            three_pillar["pillars"] = [_common_fields([h["pillars"][i] for h in same_day]) for i in range(3)]
+        return {"birth": birth_date, "calendar_type": calendar_type, "location_name": location,
+                "hours": hours, "three_pillar": three_pillar}
+
+    def analyze_options(self, birth_str, gender, location, use_yajas_i=True, calendar_type="양력",
+                        sections=OPTION_SECTIONS):
+        """합/조후 보정 4가지 조합 결과를 한 번에 계산 (체크박스 전환을 서버 왕복 없이 처리)
+
+        입력 변환, 보정 시각, 8글자/대운 방향은 한 번만 정하고, 조합마다 달라지는
+        가중치/합 변환 오행/신강약/십성 분포 이후만 analyze_chart 로 계산합니다 (chart_cache 공유).
+
+        Args:
+            sections: 조합별로 담을 analyze_chart 결과 키 (기본 OPTION_SECTIONS, None 이면 전체)
+        Returns:
+            {"birth", "calendar_type", "location_name", "pillars": 8글자(한자),
+             "options": {"00": 결과, "01": ..., "10": ..., "11": ...}} (키: 합/조후 적용 여부)
+        """
+        dt_raw, success = self._parse_and_convert_to_solar(birth_str, calendar_type)
+        if not success: return {"error": f"입력 날짜({birth_str})를 찾을 수 없습니다."}
         lng_off = int(round((sc.CITY_DATA.get(location, sc.DEFAULT_LNG) - 135) * 4))
         dt_solar = dt_raw + timedelta(minutes=self._get_historical_correction(dt_raw) + lng_off)
-        
+        determined = self._determine_pillars(dt_raw, dt_solar, use_yajas_i)
+        if determined is None: return {"error": "DB 데이터가 없습니다."}
+        palja, yG = determined[0], determined[1]
+        chart = Chart.from_palja(palja)
+        is_fwd = self._is_daeun_forward(yG[0], gender)
+        keep = frozenset(sections) if sections is not None else None
+
+        options, shared = {}, {}
+        for key in OPTION_KEYS:
+            analysis = self.analyze_chart(chart, is_fwd, key[0] == "1", key[1] == "1", keep, shared)
+            options[key] = {k: v for k, v in analysis.items() if keep is None or k in keep}
+        return {"birth": birth_str, "calendar_type": calendar_type, "location_name": location,
+                "pillars": palja, "options": options}
+
+    def find_pillar_boundaries(self, birth_str, location, gender="M", window_hours=12, use_yajas_i=True,
+                               calendar_type="양력"):
+        """생시 전후로 년/월/일/시주 또는 대운 방향이 바뀌는 시각(원본 시계, 분 단위) 목록
+
+        분마다 analyze 하지 않고, 바뀔 수 있는 후보 시각만 골라 그 시각에서만 8글자를 판정합니다.
+        - 시지 경계(보정 후 홀수 시 정각), 자정/22시(야자시 미적용 시 조회일), 절입 시각과 그 다음 분
+          -> 경도 보정과 구간 안의 역사 보정값으로 원본 시각으로 환산
+        - 원본 시계 00시/01시/23시 (조자시/야자시 판정), 표준시/서머타임 보정값이 바뀌는 시각
+        후보 사이에서는 8글자가 바뀌지 않으므로 후보에서 값이 달라진 곳이 곧 경계입니다.
+
+        Args:
+            birth_str: "YYYY-MM-DD HH:MM" 또는 "YYYY-MM-DD" (날짜만 주면 그날 12:00 기준)
+            window_hours: 기준 시각 앞뒤로 살펴볼 시간 (최대 31일)
+        Returns:
+            {"start", "end", "location_name", "segments": [{"start", "end", "pillars", "daeun_forward"}, ...],
+             "boundaries": [{"at", "changed", "before", "after"}, ...]}
+        """
+        if len(birth_str.strip()) == 10: birth_str = f"{birth_str.strip()} 12:00"
+        center, success = self._parse_and_convert_to_solar(birth_str, calendar_type)
+        if not success: return {"error": f"입력 날짜({birth_str})를 찾을 수 없습니다."}
+        if not 0 <= window_hours <= 31 * 24: return {"error": "window_hours 는 0~744 사이여야 합니다."}
+
+        lng_off = int(round((sc.CITY_DATA.get(location, sc.DEFAULT_LNG) - 135) * 4))
+        mid = minute_index(center)
+        lo, hi = mid - window_hours * 60, mid + window_hours * 60 - (1 if window_hours else 0)
+        candidates = self._boundary_candidates(lo, hi, lng_off)
+
+        def state(minute):
+            dt_raw = datetime_of(minute)
+            dt_solar = dt_raw + timedelta(minutes=self.time_corrections.offset(minute) + lng_off)
+            determined = self._determine_pillars(dt_raw, dt_solar, use_yajas_i)
+            if determined is None: return None
+            palja, yG = determined[0], determined[1]
+            return tuple(palja[i] + palja[i + 1] for i in range(0, 8, 2)), self._is_daeun_forward(yG[0], gender)
+
+        fmt = lambda minute: datetime_of(minute).strftime("%Y-%m-%d %H:%M")
+        labels = ("year", "month", "day", "hour")
+        prev = state(lo)
+        if prev is None: return {"error": "DB 데이터가 없습니다."}
+        segments, boundaries, seg_start = [], [], lo
+        for minute in candidates:
+            cur = state(minute)
+            if cur is None: return {"error": "DB 데이터가 없습니다."}
+            if cur == prev: continue
+            changed = [labels[i] for i in range(4) if cur[0][i] != prev[0][i]]
+            if cur[1] != prev[1]: changed.append("daeun")
+            segments.append({"start": fmt(seg_start), "end": fmt(minute - 1), "pillars": list(prev[0]),
+                             "daeun_forward": prev[1]})
+            boundaries.append({"at": fmt(minute), "changed": changed, "before": list(prev[0]), "after": list(cur[0])})
+            prev, seg_start = cur, minute
+        segments.append({"start": fmt(seg_start), "end": fmt(hi), "pillars": list(prev[0]), "daeun_forward": prev[1]})
+        return {"start": fmt(lo), "end": fmt(hi), "location_name": location,
+                "segments": segments, "boundaries": boundaries}
+
+    def _boundary_candidates(self, lo, hi, lng_off):
+        """(lo, hi] 구간에서 8글자나 조자시/야자시 구분이 바뀔 수 있는 원본 시계 epoch minute (정렬)
+
+        - 시지 경계(보정 후 홀수 시 정각), 자정/22시, 절입 시각과 그 다음 분
+          -> 경도 보정과 구간 안의 모든 역사 보정값으로 원본 시각으로 환산
+        - 원본 시계 00시/01시/23시, 표준시/서머타임 보정값이 바뀌는 시각
+        """
+        hist_changes, hist_offs = self.time_corrections.changes_between(lo, hi)
+        solar_marks = []
+        day0, day1 = (lo - 1440) // 1440, (hi + 1440) // 1440
+        for day in range(day0, day1 + 1):
+            base = day * 1440
+            solar_marks += [base, base + 22 * 60] + [base + 60 + 120 * k for k in range(12)]
+        for m in self.t_db.month_minutes[bisect_left(self.t_db.month_minutes, lo - 1440):
+                                         bisect_right(self.t_db.month_minutes, hi + 1440)]:
+            solar_marks += [m, m + 1]
+        candidates = {m - lng_off - h for m in solar_marks for h in hist_offs}
+        for day in range(day0, day1 + 1):
+            candidates.update(day * 1440 + k for k in (0, 60, 23 * 60))
+        candidates.update(hist_changes)
+        return sorted(m for m in candidates if lo < m <= hi)
+
+    def analyze_many(self, items, sections=None, as_of=None):
+        """여러 명의 사주를 한 번에 분석합니다 (야간 배치용).
+
+        - 같은 차트(양력 변환 후 생시, 성별, 지역, 옵션)는 한 번만 계산하여 결과를 공유
+        - 현재 날짜 기준 달력/월운 등 배치 공통 조회는 배치 안에서 재사용
+
+        Args:
+            items: (birth_str, gender, location, options) 튜플의 iterable.
+                   options 는 analyze 키워드 인자 dict (use_yajas_i, calendar_type,
+                   use_hap_correction, use_johoo_correction), 생략 가능
+            sections: 결과에 담을 키 목록 (None 이면 전체, analyze 의 sections 와 동일)
+            as_of: 기준 시각 (기본값: 배치 시작 시각, 배치 전체에 같은 기준일 적용)
+        Yields:
+            입력 순서대로 analyze 와 같은 형태의 결과 dict
+        """
+        shared, charts = {}, {}
+        keep = frozenset(sections) if sections is not None else None
+        as_of = as_of or datetime.now()
+
+        for item in items:
+            birth_str, gender, location = item[0], item[1], item[2]
+            opts = (item[3] if len(item) > 3 else None) or {}
+            calendar_type = opts.get("calendar_type", "양력")
+            try:
+                dt_raw, success = self._parse_and_convert_to_solar(birth_str, calendar_type)
+            except ValueError:
+                yield {"error": f"입력 날짜({birth_str}) 형식이 올바르지 않습니다."}
+                continue
+            if not success:
+                yield {"error": f"입력 날짜({birth_str})를 찾을 수 없습니다."}
+                continue
+
+            flags = (opts.get("use_yajas_i", True), opts.get("use_hap_correction", False),
+                     opts.get("use_johoo_correction", False))
+            key = (dt_raw, gender, location, flags)
+            if key not in charts:
+                charts[key] = self._analyze_dt(dt_raw, birth_str, gender, location, flags[0], calendar_type,
+                                               flags[1], flags[2], shared=shared, sections=keep, as_of=as_of)
+
+            result = dict(charts[key])
+            if "error" not in result:
+                # 입력 표기만 다른 같은 차트 (예: 음력/양력 입력)
+                if keep is None or "birth" in keep: result["birth"] = birth_str
+                if keep is None or "calendar_type" in keep: result["calendar_type"] = calendar_type
+            yield result
+
+    def cache_stats(self):
+        """원국/기준일/8글자/달력 캐시 통계 (크기 튜닝용)"""
+        return {"natal": self.natal_cache.stats(), "overlay": self.overlay_cache.stats(),
+                "chart": self.chart_cache.stats(), "calendar": self.calendar_cache.stats()}
+
+    def _analyze_dt(self, dt_raw, birth_str, gender, location, use_yajas_i, calendar_type,
+                    use_hap_correction, use_johoo_correction, shared=None, sections=None, as_of=None, overlay=True):
+        """양력으로 변환된 생시(dt_raw)로 분석 수행
+
+        시각과 무관한 원국 분석은 보정된 생시 기준으로 natal_cache 에 보관하고,
+        입력 표기(birth 등)는 호출마다, 기준일 항목(TIME_SECTIONS)은 overlay_cache 에서 채웁니다.
+
+        shared: analyze_many 가 넘기는 배치 공통 조회 캐시 (dict)
+        sections: 결과 키 frozenset (None 이면 전체)
+        as_of: 기준 시각 (기본값: 지금)
+        overlay: False 이면 기준일 항목 없이 원국만 반환
+        """
+        if shared is None: shared = {}
+
+        # 2. 지역 경도 및 역사적 표준시 보정 (시각 결정)
+        lng_off = int(round((sc.CITY_DATA.get(location, sc.DEFAULT_LNG) - 135) * 4))
+        hist_off = self._get_historical_correction(dt_raw)
+        dt_solar = dt_raw + timedelta(minutes=hist_off + lng_off)
+
+        natal_secs = None
+        if not overlay:
+            sections = None
+        elif sections is not None:
+            natal_secs = sections - TIME_SECTIONS - INPUT_SECTIONS
+            if not sections.isdisjoint(TIME_SECTIONS):
+                natal_secs |= {"me", "daeun_list"}  # 현재 대운/연운/월운 계산에 필요
+
+        # 원국 캐시 키: 보정된 분(minute), 역사 보정, 경도 보정, 성별, 야자시/합/조후 옵션
+        # (같은 차트의 전체 결과가 이미 있으면 그것을 잘라서 사용)
+        chart_key = (minute_index(dt_solar), hist_off, lng_off, gender, use_yajas_i,
+                     use_hap_correction, use_johoo_correction)
+        cache_key = (chart_key, natal_secs)
+        if natal_secs is not None and self.natal_cache.peek((chart_key, None)) is not None:
+            cache_key = (chart_key, None)
+        natal = self.natal_cache.get(cache_key)
+        if natal is None:
+            natal = self._analyze_natal(dt_raw, dt_solar, lng_off, gender, use_yajas_i,
+                                        use_hap_correction, use_johoo_correction, cache_key[1])
+            if "error" in natal: return natal
+            self.natal_cache.put(cache_key, natal)
+
+        # 캐시된 dict 는 공유되므로 얕은 복사본에 호출별 항목을 채웁니다
+        result = dict(natal)
+        result["birth"] = birth_str
+        result["calendar_type"] = calendar_type
+        result["location_name"] = location
+        if overlay and (sections is None or not sections.isdisjoint(TIME_SECTIONS)):
+            as_of = as_of or datetime.now()
+            # 기준일 항목은 같은 날 같은 차트면 동일하므로 (날짜, 차트) 단위로 캐시
+            overlay_secs = None if sections is None else sections & TIME_SECTIONS
+            overlay_key = (as_of.date(), chart_key, overlay_secs)
+            time_part = self.overlay_cache.get(overlay_key)
+            if time_part is None:
+                time_part = self._time_overlay(natal, dt_raw, overlay_secs, shared, as_of)
+                self.overlay_cache.put(overlay_key, time_part)
+            result.update(time_part)
+        if sections is not None:
+            result = {k: v for k, v in result.items() if k in sections}
+        return result
+
+    def _time_overlay(self, natal, dt_raw, sections, shared, now):
+        """기준일(now) 항목 (현재 운로, 초기 연운/월운, 이번 달 달력)
+
+        날짜 단위로만 달라지므로 시각이 아닌 now.date() 만 결과에 영향을 줍니다.
+        """
+        want = lambda key: sections is None or key in sections
+        curr_age = now.year - dt_raw.year + 1
+        me = natal["me"]
+        overlay = {}
+
+        if want("current_trace") or want("initial_yeonun"):
+            # 현재 나이가 속한 대운 찾기
+            daeun_list = natal["daeun_list"]
+            current_daeun = next((d for d in daeun_list if d['start_age'] <= curr_age < d['start_age'] + 10), daeun_list[0])
+        if want("current_trace"):
+            now_yG, now_mG, now_dG = self.pillars.day_pillars(now)
+            overlay["current_trace"] = {
+                "date": now.strftime("%Y-%m-%d"), "age": curr_age,
+                "daeun": current_daeun,
+                "seun": now_yG,
+                "wolun": now_mG,
+                "ilun": now_dG
+            }
+        if want("initial_yeonun"):
+            # [추가] 초기 화면에 보여줄 연운 데이터 생성 (현재 대운 기준)
+            overlay["initial_yeonun"] = self.get_yeonun_only(
+                birth_year=dt_raw.year,
+                daeun_start_age=current_daeun['start_age'],
+                me_gan=me,
+                me_hj=me # me_hj 대신 me(palja[4])를 두 번 전달
+            )
+        if want("initial_wolun"):
+            overlay["initial_wolun"] = self.get_wolun_only(target_year=now.year, me_gan=me, me_hj=me)
+        overlay["now_year"] = now.year
+        overlay["now_month"] = now.month
+        if want("initial_calendar"):
+            cal_key = ("calendar", now.date())
+            if cal_key not in shared:
+                shared[cal_key] = self.get_month_calendar(now.year, now.month, today=now)
+            overlay["initial_calendar"] = shared[cal_key]
+        return overlay
+
+    def _determine_pillars(self, dt_raw, dt_solar, use_yajas_i):
+        """원본 생시(dt_raw)와 보정된 생시(dt_solar)로 8글자 결정
+
+        Returns:
+            (palja, yG, mG, jasi, day_data) 또는 만세력 범위 밖이면 None
+        """
         # 3. 야자시/조자시 판정 및 DB 데이터 로드
         # [중요] 조자시/야자시 판정은 원본 시간 기준 (경도 보정 전)
         jasi, fetch_dt = self._get_jasi_type(dt_raw), dt_solar
         if not use_yajas_i and jasi == "YAJAS-I": 
             fetch_dt = dt_solar + timedelta(hours=2)
             
-        day_data = self.m_db.get(fetch_dt.strftime("%Y%m%d"))
-        if not day_data: return {"error": "DB 데이터가 없습니다."}
+        # 음력 표시용 일자 데이터 (간지는 산술 계산기 사용)
+        day_data = self.m_db.get(fetch_dt)
+        if not day_data: return None
+        day_yG, day_mG, _ = self.pillars.day_pillars(fetch_dt)
         
         # 4. [절기 보정] 입절 시각을 정밀 비교하여 연주(yG) 및 월건(mG) 확정
         # 중요: 지역시 보정된 시간(dt_solar)과 절입 시각을 비교해야 함
         # [포스텔러 방식] 절입 시간에는 lng_off 보정을 적용하지 않음
-        yG, mG = self._apply_solar_correction(dt_solar, day_data['yG'], day_data['mG'])
+        yG, mG = self._apply_solar_correction(dt_solar, day_yG, day_mG)
         
         # 5. [수정] 시주 및 일주 결정 (경도 보정값 반영)
         h_idx = ((dt_solar.hour * 60 + dt_solar.minute + 60) // 120) % 12
@@ -874,28 +1043,21 @@ class SajuEngine:
         # [중요] 조자시는 원본 시간 기준, 그 외는 보정된 시간 기준
         if jasi == "JOJAS-I":
             # 조자시: 원본 시간 기준으로 날짜 계산 (00:00~01:00는 전날 일주 사용)
-            raw_date_str = dt_raw.strftime("%Y%m%d")
-            prev_raw_date_str = (dt_raw - timedelta(days=1)).strftime("%Y%m%d")
-            curr_day_data = self.m_db.get(raw_date_str)
-            prev_day_data = self.m_db.get(prev_raw_date_str)
-            next_day_data = None  # 조자시에는 사용 안함
             # 조자시: 일주는 전날, 시주 천간은 당일 기준
-            target_dG = prev_day_data['dG'] if prev_day_data else curr_day_data['dG']
-            ref_gan = curr_day_data['dG'][0]
+            target_dG = self.pillars.day_ganzi(dt_raw - timedelta(days=1))
+            ref_gan = self.pillars.day_ganzi(dt_raw)[0]
         else:
             # 야자시 및 일반 시간: 보정된 시간 기준
-            solar_date_str = dt_solar.strftime("%Y%m%d")
-            next_solar_date_str = (dt_solar + timedelta(days=1)).strftime("%Y%m%d")
-            curr_day_data = self.m_db.get(solar_date_str)
-            next_day_data = self.m_db.get(next_solar_date_str)
+            curr_dG = self.pillars.day_ganzi(dt_solar)
             
             if jasi == "YAJAS-I":
                 # 야자시(23:00~): 일주는 오늘 유지, 시주 기준은 내일
-                target_dG = curr_day_data['dG'] if use_yajas_i else next_day_data['dG']
-                ref_gan = next_day_data['dG'][0]
+                next_dG = self.pillars.day_ganzi(dt_solar + timedelta(days=1))
+                target_dG = curr_dG if use_yajas_i else next_dG
+                ref_gan = next_dG[0]
             else:
                 # 일반 시간: 날짜와 시주 기준 모두 현재 보정된 날짜
-                target_dG = curr_day_data['dG']
+                target_dG = curr_dG
                 ref_gan = target_dG[0]
 
         # 최종 시주 천간 계산
@@ -903,13 +1065,125 @@ class SajuEngine:
         
         # 6. [데이터 동기화] 8글자(palja) 구성
         palja = [yG[0], yG[1], mG[0], mG[1], target_dG[0], target_dG[1], hG_gan, sc.BRANCHES[h_idx]]
-                
+        return palja, yG, mG, jasi, day_data
+
+    def _analyze_natal(self, dt_raw, dt_solar, lng_off, gender, use_yajas_i,
+                       use_hap_correction, use_johoo_correction, sections=None):
+        """현재 시각과 무관한 원국 분석 (sections: 결과 키 frozenset, None 이면 전체)"""
+        determined = self._determine_pillars(dt_raw, dt_solar, use_yajas_i)
+        if determined is None: return {"error": "DB 데이터가 없습니다."}
+        palja, yG, mG, jasi, day_data = determined
+        chart = Chart.from_palja(palja)
+        is_fwd = self._is_daeun_forward(yG[0], gender)
+
+        # 7~11. 8글자 + 대운 방향 + 합/조후 옵션만으로 정해지는 분석 (chart_cache / chart_store)
+        chart_secs = None
+        if sections is not None:
+            chart_secs = sections - BIRTH_SECTIONS
+            if "daeun_list" in sections:
+                chart_secs |= {"daeun_cycle"}
+        analysis = self.analyze_chart(chart, is_fwd, use_hap_correction, use_johoo_correction, chart_secs)
+
+        # 8. 대운수 (생시와 절입 시각 차이)
+        daeun_num, daeun_list = None, None
+        if sections is None or not sections.isdisjoint(SECTION_DEPS["daeun"]):
+            l_term, n_term = self._get_solar_terms(dt_raw)
+            daeun_num = self._calculate_daeun_num(dt_raw, is_fwd, l_term, n_term)
+        if analysis.get("daeun_cycle") is not None:
+            daeun_list = [{"start_age": daeun_num + i * 10, **d} for i, d in enumerate(analysis["daeun_cycle"])]
+        
+        # 12. 최종 결과 조립
+        final_result = {
+            "solar_display": dt_raw.strftime("%Y/%m/%d %H:%M"), 
+            "corrected_display": dt_solar.strftime("%Y/%m/%d %H:%M"),
+            "lunar_display": f"{day_data['ly']}/{day_data['lm']:02d}/{day_data['ld']:02d} {dt_raw.strftime('%H:%M')}", 
+            "lunar_type": "윤" if day_data.get('ls') else "평",
+            "lng_diff_str": f"{lng_off:+d}분", 
+            "gender_str": "여자" if gender == "F" else "남자", 
+            "display_tags": analysis.get("display_tags"),
+            "pillars": analysis.get("pillars"), 
+            "me": palja[4], 
+            "me_elem": analysis["me_elem"],
+            "representative_elem": analysis["representative_elem"],
+            "representative_tendency": analysis.get("representative_tendency"),
+            "scores": analysis["scores"], 
+            "power": analysis["power"], 
+            "status": analysis["status"],
+            "yongsin_detail": analysis.get("yongsin_detail"), 
+            "wealth_analysis": analysis.get("wealth_analysis"),
+            "daeun_num": daeun_num, 
+            "daeun_list": daeun_list, 
+            "interactions": analysis.get("interactions"), 
+            "jasi_type": jasi, 
+            "gender": gender, 
+            "ilju": palja[4]+palja[5],
+            "element_analysis": analysis["element_analysis"], 
+            "tengod_analysis": analysis.get("tengod_analysis"),
+            "forestellar_analysis": analysis.get("forestellar_analysis"), # 통합 분석 데이터 추가
+            "me_kor": analysis["me_kor"], 
+            "relation_groups": analysis.get("relation_groups"),
+            "tengod_analysis_dict": analysis.get("tengod_analysis_dict")
+        }
+        if sections is not None:
+            final_result = {k: v for k, v in final_result.items() if k in sections}
+        
+        # debug_json = json.dumps(final_result, indent=4, ensure_ascii=False, default=str)
+        # print(f"\n>>> DEBUG REPORT:\n{debug_json}")
+
+        return final_result
+
+    def analyze_chart(self, chart, is_fwd, use_hap_correction=False, use_johoo_correction=False, sections=None,
+                      shared=None):
+        """8글자(Chart) + 대운 방향 + 합/조후 옵션만으로 정해지는 분석 결과 (생시/지역과 무관)
+
+        chart_cache(LRU) -> chart_store(오프라인 생성 파일, 전체 결과만) -> 계산 순으로 찾습니다.
+        반환되는 dict 는 여러 요청이 공유하므로 수정하지 마세요.
+        sections: 결과 키 frozenset (None 이면 전체, 대운은 "daeun_cycle")
+        shared: 같은 차트를 여러 옵션으로 계산할 때 옵션과 무관한 중간 결과(신살, 합 맵)를 나눠 쓰는 dict
+        """
+        key = (chart.key, is_fwd, use_hap_correction, use_johoo_correction)
+        cache_key = (key, sections)
+        if sections is not None and self.chart_cache.peek((key, None)) is not None:
+            cache_key = (key, None)
+        analysis = self.chart_cache.get(cache_key)
+        if analysis is None:
+            if self.chart_store is not None:
+                analysis = self.chart_store.get(chart, is_fwd, use_hap_correction, use_johoo_correction)
+                if analysis is not None:
+                    cache_key = (key, None)
+            if analysis is None:
+                analysis = self._analyze_chart(chart, is_fwd, use_hap_correction, use_johoo_correction, sections,
+                                               shared)
+            self.chart_cache.put(cache_key, analysis)
+        return analysis
+
+    def _analyze_chart(self, chart, is_fwd, use_hap_correction, use_johoo_correction, sections=None, shared=None):
+        """analyze_chart 의 실제 계산 (캐시 없음)"""
+        palja = chart.palja
         # 7. 오행/신강약 분석
         me_hj = sc.E_MAP_HJ.get(palja[4]) 
+        config = self._get_analysis_config(chart, use_hap_correction, use_johoo_correction, shared)
          # 오행 분포(단순 개수)와 신강약 지수(가중치)를 각각 구함
-        scores, effective_elements = self._get_element_distribution(palja, use_hap_correction, use_johoo_correction)
-        power = self._calculate_strength_score(palja, effective_elements, me_hj, use_hap_correction, use_johoo_correction)
-        yongsin, pillars = self._get_yongsin_info(palja, power, me_hj), self._investigate_sinsal(palja, palja[4], me_hj)
+        scores, effective_elements = self._get_element_distribution(chart, config=config)
+        power = self._calculate_strength_score(chart, effective_elements, use_hap_correction, use_johoo_correction)
+        me_elem_name = sc.ELEMENT_MAP[palja[4]]
+
+        # 요청된 섹션과 그 섹션이 의존하는 중간 결과만 계산합니다 (sections=None 이면 전체)
+        want = lambda deps: sections is None or not sections.isdisjoint(deps)
+        need_pillars = want(SECTION_DEPS["pillars"])
+        need_yongsin = want(SECTION_DEPS["yongsin"])
+        need_daeun = want(("daeun_cycle",))
+        need_tengod = want(SECTION_DEPS["tengod"])
+
+        yongsin = self._get_yongsin_info(palja, power, me_hj) if need_yongsin else None
+        if not need_pillars:
+            pillars = []
+        elif shared is None:
+            pillars = self._investigate_sinsal(chart)
+        else:
+            # 신살은 옵션과 무관: 한 번만 조사하고 아래에서 고치는 칸(오행/십성)만 복사본에 덮어씀
+            if "sinsal" not in shared: shared["sinsal"] = self._investigate_sinsal(chart)
+            pillars = [dict(p) for p in shared["sinsal"]]
         for i, p in enumerate(pillars):
             # effective_elements는 8글자 순서: [년간, 년지, 월간, 월지, 일간, 일지, 시간, 시지]
             # pillars는 4개의 기둥 순서: [년, 월, 일, 시]
@@ -917,57 +1191,32 @@ class SajuEngine:
             new_ji_elem = effective_elements[i * 2 + 1] # 지지 변환 오행
 
             # 1. 화면에 표시할 오행 색상 갱신
-            p['gan_elem'] = new_gan_elem
-            p['ji_elem'] = new_ji_elem
+            p['gan_elem'] = ELEMENTS[new_gan_elem]
+            p['ji_elem'] = ELEMENTS[new_ji_elem]
 
             # 2. 변환된 오행을 바탕으로 십성(비견, 식신 등) 이름을 재결정
-            # (일간인 pal[4]와 대상 글자, 그리고 '변환된 오행'을 넣어 호출)
-            p['t_gan'] = self._determine_ten_god(palja[4], palja[i*2], new_gan_elem)
-            p['t_ji'] = self._determine_ten_god(palja[4], palja[i*2+1], new_ji_elem)
+            # (일간과 대상 글자의 음양, 그리고 '변환된 오행'으로 계산)
+            p['t_gan'] = TEN_GOD_NAMES[chart.ten_god(i * 2, new_gan_elem)]
+            p['t_ji'] = TEN_GOD_NAMES[chart.ten_god(i * 2 + 1, new_ji_elem)]
        
-        # 8. 대운 계산
-        l_term, n_term = self._get_solar_terms(dt_raw)
-        daeun_num, daeun_list = self._calculate_daeun(dt_raw, yG, mG, gender, l_term, n_term, palja[4], me_hj)
-        daeun_list = self._calculate_daeun_scores(daeun_list, yongsin, palja)
+        # 8. 대운 (간지 순서와 점수만, 시작 나이는 생시 기준으로 _analyze_natal 에서)
+        daeun_cycle = None
+        if need_daeun:
+            daeun_cycle = self._calculate_daeun_scores(self._calculate_daeun_cycle(chart, is_fwd), yongsin, palja)
         
-        # 9. 현재 운세(운로) 추적
-        now = datetime.now()
-        curr_age = now.year - dt_raw.year + 1
-        # 현재 나이가 속한 대운 찾기
-        current_daeun = next((d for d in daeun_list if d['start_age'] <= curr_age < d['start_age'] + 10), daeun_list[0])
-        current_trace = {
-            "date": now.strftime("%Y-%m-%d"), "age": curr_age,
-            "daeun": next((d for d in daeun_list if d['start_age'] <= curr_age < d['start_age'] + 10), daeun_list[0]),
-            "seun": self.m_db.get(now.strftime("%Y%m%d"), {}).get('yG', 'N/A'),
-            "wolun": self.m_db.get(now.strftime("%Y%m%d"), {}).get('mG', 'N/A'),
-            "ilun": self.m_db.get(now.strftime("%Y%m%d"), {}).get('dG', 'N/A')
-        }
-        # [추가] 초기 화면에 보여줄 연운 데이터 생성 (현재 대운 기준)
-        initial_yeonun = self.get_yeonun_only(
-            birth_year=dt_raw.year,
-            daeun_start_age=current_daeun['start_age'],
-            me_gan=palja[4],
-            me_hj=palja[4] # me_hj 대신 me(palja[4])를 두 번 전달
-        )
-        initial_wolun = self.get_wolun_only(
-            target_year=now.year,
-            me_gan=palja[4],
-            me_hj=palja[4]
-        )
-
         # 10. 상호작용 분석
-        interactions = self._analyze_interactions(palja)
-        display_tags = [item for sublist in interactions.values() for item in sublist][:8]
+        interactions, display_tags = None, None
+        if want(("interactions", "display_tags")):
+            interactions = self._analyze_interactions(chart)
+            display_tags = [item for sublist in interactions.values() for item in sublist][:8]
         
         # 11. 오행/십성 통계 구성 (HTML 에러 방지)
         element_dict = self._get_element_status(scores)
-        tengod_dict = self._get_tengod_distribution(
-            palja=palja, 
-            use_hap_correction=use_hap_correction, 
-            use_johoo_correction=use_johoo_correction
-        )
         element_list = [{"name": k, **v} for k, v in element_dict.items()]
-        tengod_list = [{"name": k, **v} for k, v in tengod_dict.items()]
+        tengod_dict, tengod_list = None, None
+        if need_tengod:
+            tengod_dict = self._get_tengod_distribution(chart=chart, config=config)
+            tengod_list = [{"name": k, **v} for k, v in tengod_dict.items()]
         
         # ----------------------------------------------------------------------
         # [추가] 포스텔러 스타일 통합 분석 (오행 고정 + 십성 유동)
@@ -976,13 +1225,12 @@ class SajuEngine:
         tg_pairs = [("비견", "겁재"), ("식신", "상관"), ("편재", "정재"), ("편관", "정관"), ("편인", "정인")]
         group_names = ["비겁", "식상", "재성", "관성", "인성"]
         
-        me_elem_name = sc.ELEMENT_MAP[palja[4]]
         me_idx = elements_fixed.index(me_elem_name)
         
         forestellar_analysis = [] # 표 전용 (목화토금수 순서)
         relation_groups = [None] * 5 # 그래프 전용 (나부터 시작하는 순서)
 
-        for i, elem in enumerate(elements_fixed):
+        for i, elem in enumerate(elements_fixed if need_tengod else []):
             dist = (i - me_idx) % 5  # 나와의 거리 (0:비겁, 1:식상...)
             pair = tg_pairs[dist]
             e_status = element_dict.get(elem, {"score": "0.0%", "status": "부족"})
@@ -1022,49 +1270,37 @@ class SajuEngine:
         
         representative_elem = max(scores, key=scores.get)
 
-        # 2. 대표 성향: 십성을 5개 그룹(비겁, 식상...)으로 합산 후 판정
-        # (sc.TEN_GOD_GROUPS 상수가 정의되어 있다고 가정합니다)
-        group_counts = {"비겁": 0, "식상": 0, "재성": 0, "관성": 0, "인성": 0}
-        group_mapping = {
-            "비견": "비겁", "겁재": "비겁", "본인": "비겁",
-            "식신": "식상", "상관": "식상",
-            "편재": "재성", "정재": "재성",
-            "편관": "관성", "정관": "관성",
-            "편인": "인성", "정인": "인성"
-        }
-
-        for p in pillars:
-            group_counts[group_mapping.get(p['t_gan'], "비겁")] += 1
-            group_counts[group_mapping.get(p['t_ji'], "비겁")] += 1
-
-        # 가장 비중이 큰 그룹을 찾음 (예: 관성)
-        representative_group_name = max(group_counts, key=group_counts.get)
-        
-        # 해당 그룹에 속하는 십성 중 원국에 가장 많은 것 선택
-        group_to_tgs = {
-            "비겁": ["비견", "겁재"], "식상": ["식신", "상관"],
-            "재성": ["편재", "정재"], "관성": ["편관", "정관"], "인성": ["편인", "정인"]
-        }
-        target_tgs = group_to_tgs[representative_group_name]
-        representative_tendency = max(target_tgs, key=lambda k: (tengod_dict.get(k, {'count': 0})['count']))
-        
-
+        representative_tendency = None
+        if want(("representative_tendency",)):
+            # 2. 대표 성향: 십성을 5개 그룹(비겁, 식상...)으로 합산 후 판정
+            # (sc.TEN_GOD_GROUPS 상수가 정의되어 있다고 가정합니다)
+            group_counts = {"비겁": 0, "식상": 0, "재성": 0, "관성": 0, "인성": 0}
+            group_mapping = {
+                "비견": "비겁", "겁재": "비겁", "본인": "비겁",
+                "식신": "식상", "상관": "식상",
+                "편재": "재성", "정재": "재성",
+                "편관": "관성", "정관": "관성",
+                "편인": "인성", "정인": "인성"
+            }
 
+            for p in pillars:
+                group_counts[group_mapping.get(p['t_gan'], "비겁")] += 1
+                group_counts[group_mapping.get(p['t_ji'], "비겁")] += 1
 
+            # 가장 비중이 큰 그룹을 찾음 (예: 관성)
+            representative_group_name = max(group_counts, key=group_counts.get)
+            
+            # 해당 그룹에 속하는 십성 중 원국에 가장 많은 것 선택
+            group_to_tgs = {
+                "비겁": ["비견", "겁재"], "식상": ["식신", "상관"],
+                "재성": ["편재", "정재"], "관성": ["편관", "정관"], "인성": ["편인", "정인"]
+            }
+            target_tgs = group_to_tgs[representative_group_name]
+            representative_tendency = max(target_tgs, key=lambda k: (tengod_dict.get(k, {'count': 0})['count']))
         
-        # 12. 최종 결과 조립
-        final_result = {
-            "solar_display": dt_raw.strftime("%Y/%m/%d %H:%M"), 
-            "calendar_type": calendar_type, 
-            "corrected_display": dt_solar.strftime("%Y/%m/%d %H:%M"),
-            "lunar_display": f"{day_data['ly']}/{day_data['lm']:02d}/{day_data['ld']:02d} {dt_raw.strftime('%H:%M')}", 
-            "lunar_type": "윤" if day_data.get('ls') else "평",
-            "lng_diff_str": f"{lng_off:+d}분", 
-            "gender_str": "여자" if gender == "F" else "남자", 
-            "location_name": location, 
+        analysis = {
             "display_tags": display_tags,
             "pillars": pillars, 
-            "me": palja[4], 
             "me_elem": me_elem_name,
             "representative_elem": representative_elem,
             "representative_tendency": representative_tendency,
@@ -1072,29 +1308,16 @@ class SajuEngine:
             "power": power, 
             "status": self._get_detailed_status(power),
             "yongsin_detail": yongsin, 
-            "wealth_analysis": self._analyze_wealth_and_career(pillars, power, yongsin['eokbu_elements']),
-            "daeun_num": daeun_num, 
-            "daeun_list": daeun_list, 
-            "current_trace": current_trace, 
+            "wealth_analysis": self._analyze_wealth_and_career(pillars, power, yongsin['eokbu_elements']) if want(("wealth_analysis",)) else None,
+            "daeun_cycle": daeun_cycle,
             "interactions": interactions, 
-            "jasi_type": jasi, 
-            "birth": birth_str, 
-            "gender": gender, 
-            "ilju": palja[4]+palja[5],
             "element_analysis": element_list, 
             "tengod_analysis": tengod_list,
-            "forestellar_analysis": forestellar_analysis, # 통합 분석 데이터 추가
+            "forestellar_analysis": forestellar_analysis,
             "me_kor": me_elem_name, 
-            "relation_groups" :relation_groups,
-            "initial_yeonun": initial_yeonun,
-            "initial_wolun": initial_wolun,
-            "now_year": now.year,
-            "now_month": now.month,
-            "initial_calendar": self.get_month_calendar(now.year, now.month),
+            "relation_groups": relation_groups,
             "tengod_analysis_dict": tengod_dict  
         }
-        
-        # debug_json = json.dumps(final_result, indent=4, ensure_ascii=False, default=str)
-        # print(f"\n>>> DEBUG REPORT:\n{debug_json}")
-
-        return final_result
\ No newline at end of file
+        if sections is not None:
+            analysis = {k: v for k, v in analysis.items() if k in sections or k in CHART_CORE}
+        return analysis
@@ -0,0 +1,114 @@
+"""
+합/충/형/파/해/원진/삼합/방합/공망 검출기 (Compiled interaction detector)
+
+- 2글자 규칙(sc.PAIRWISE_RULES)은 10x10 천간, 12x12 지지 쌍 테이블로 미리 펼쳐 둠
+- 삼합/방합은 지지별 소속 규칙 목록과 비트마스크로 판정
+- 원국 4기둥뿐 아니라 원국 + 들어오는 운(대운/세운/일진) 1기둥도 같은 함수로 검사
+  (anchor 위치를 주면 그 기둥이 포함된 관계만 반환)
+"""
+
+import saju_constants as sc
+from saju_chart import BRANCH_INDEX, CHAR_KOR, STEM_INDEX
+
+# 위치 표시명: 년/월/일/시 + 들어오는 운
+POS_NAMES = ["년", "월", "일", "시", "운"]
+GONGMANG_POSITIONS = sc.POSITIONS + ["운지"]
+
+
+def _pair_table(kind, size, index):
+    """[a][b] -> ((결과 키, 이름), ...) : a+b 정방향 우선, 없으면 b+a 역방향 (규칙 순서 유지)"""
+    chars = {v: k for k, v in index.items()}
+    table = []
+    for a in range(size):
+        row = []
+        for b in range(size):
+            hits = []
+            for key, mapping, target_type in sc.PAIRWISE_RULES:
+                if target_type != kind:
+                    continue
+                pair1, pair2 = chars[a] + chars[b], chars[b] + chars[a]
+                if pair1 in mapping:
+                    hits.append((key, mapping[pair1]))
+                elif pair2 in mapping:
+                    hits.append((key, mapping[pair2]))
+            row.append(tuple(hits))
+        table.append(tuple(row))
+    return tuple(table)
+
+
+STEM_PAIRS = _pair_table("stem", 10, STEM_INDEX)
+BRANCH_PAIRS = _pair_table("branch", 12, BRANCH_INDEX)
+
+# 삼합/방합 그룹: (결과 키, 지지 비트마스크, 이름, 왕지 비트(삼합 반합 조건) 또는 0)
+GROUP_RULES = tuple(
+    [("지지삼합", sum(1 << BRANCH_INDEX[c] for c in chars), val, 1 << BRANCH_INDEX[king])
+     for chars, (val, king) in sc.B_SAMHAP.items()]
+    + [("지지방합", sum(1 << BRANCH_INDEX[c] for c in chars), val, 0)
+       for chars, val in sc.B_BANGHAP.items()]
+)
+# 지지 -> 그 지지가 속한 그룹 규칙 번호
+BRANCH_GROUPS = tuple(
+    tuple(r for r, rule in enumerate(GROUP_RULES) if rule[1] >> b & 1) for b in range(12)
+)
+# 일주 순(旬, 간지 인덱스 // 10) -> 공망 지지 비트마스크
+GONGMANG_MASKS = tuple(sum(1 << BRANCH_INDEX[c] for c in pair) for pair in sc.GONGMANG_MAP)
+
+
+def find_interactions(stems, branches, day_ganzi, anchor=None):
+    """기둥들 사이의 상호작용을 analyze()['interactions'] 형태로 반환
+
+    Args:
+        stems, branches: 기둥별 천간/지지 인덱스 (년, 월, 일, 시[, 운])
+        day_ganzi: 일주 60갑자 인덱스 (공망 기준)
+        anchor: 지정하면 해당 위치 기둥이 포함된 관계만 검사 (원국 + 운 비교용)
+    """
+    res = {k: [] for k in sc.INTERACTION_KEYS}
+    n = len(branches)
+
+    # 1. 2글자 관계 (천간/지지 쌍 테이블)
+    for i in range(n):
+        for j in range(i + 1, n):
+            if anchor is not None and anchor not in (i, j):
+                continue
+            for key, name in STEM_PAIRS[stems[i]][stems[j]]:
+                res[key].append((name, (i, j)))
+            for key, name in BRANCH_PAIRS[branches[i]][branches[j]]:
+                res[key].append((name, (i, j)))
+
+    # 2. 삼합/방합 (그룹별로 해당 지지가 있는 위치 수집)
+    mask = 0
+    members = {}
+    for i, b in enumerate(branches):
+        mask |= 1 << b
+        for r in BRANCH_GROUPS[b]:
+            members.setdefault(r, []).append(i)
+    for r, idxs in members.items():
+        if len(idxs) < 2 or (anchor is not None and anchor not in idxs):
+            continue
+        key, _, val, king = GROUP_RULES[r]
+        if len(idxs) >= 3:
+            res[key].append((f"{val} 삼합" if king else val, tuple(idxs)))
+        elif not king or mask & king:
+            chars = "".join(CHAR_KOR[10 + branches[i]] for i in idxs)
+            res[key].append((f"{chars} 반합({val})" if king else f"{chars} 반합", tuple(idxs)))
+
+    # 3. 공망 (일주 기준)
+    g_mask = GONGMANG_MASKS[day_ganzi // 10]
+    for i, b in enumerate(branches):
+        if g_mask >> b & 1 and (anchor is None or i == anchor):
+            res["공망"].append((f"{GONGMANG_POSITIONS[i]} 공망({CHAR_KOR[10 + b]})", (i,)))
+
+    # 4. 이름별로 위치를 합치고 가나다순 정렬
+    unique_res = {}
+    for k, v in res.items():
+        combined = {}
+        for name, subs in v:
+            combined.setdefault(name, set()).update(subs)
+        final_list = []
+        for name, subs_set in combined.items():
+            sorted_subs = sorted(subs_set)
+            # 표시용 이름: 2개 이상 중첩되면 위치를 병기함 (예: 자묘형(년-일-시))
+            display_name = f"{name}({'-'.join(POS_NAMES[i] for i in sorted_subs)})" if len(sorted_subs) > 2 else name
+            final_list.append({"name": display_name, "pure_name": name, "subs": sorted_subs})
+        unique_res[k] = sorted(final_list, key=lambda x: x["name"]) if len(final_list) > 1 else final_list
+    return unique_res
@@ -0,0 +1,27 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DATA = os.path.join(ROOT, "data")
+TERM_FILE = os.path.join(DATA, "term_data.json")
+
+
+def manse_file():
+    """로컬에서 생성한 만세력 데이터 (.bin 우선, 없으면 .json, 둘 다 없으면 None)"""
+    for name in ("manse_data.bin", "manse_data.json"):
+        path = os.path.join(DATA, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+@pytest.fixture(scope="session")
+def engine_args():
+    path = manse_file()
+    if path is None:
+        pytest.skip("data/manse_data.json 이 없습니다 (로컬 생성 데이터)")
+    return (path, TERM_FILE) if path.endswith(".json") else (path,)
@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+DST_DATES = ["1988-07-01", "1987-07-01", "1955-07-01", "1961-08-10", "2024-03-05"]
+
+
+@pytest.fixture(scope="module")
+def engine(engine_args):
+    from saju_engine import SajuEngine
+    return SajuEngine(*engine_args, chart_store=None)
+
+
+@pytest.mark.parametrize("use_yajas_i", [True, False])
+@pytest.mark.parametrize("date", DST_DATES)
+def test_windows_match_per_minute_analyze(engine, date, use_yajas_i):
+    result = engine.analyze_hours(date, "M", "서울특별시", use_yajas_i=use_yajas_i, sections=["pillars", "jasi_type"])
+    assert "error" not in result
+    day = datetime.strptime(date, "%Y-%m-%d")
+    covered = 0
+    for hour in result["hours"]:
+        lo, hi = hour["time_range"].split("~")
+        start = datetime.strptime(f"{date} {lo}", "%Y-%m-%d %H:%M")
+        end = datetime.strptime(f"{date} {hi}", "%Y-%m-%d %H:%M")
+        assert start == day + timedelta(minutes=covered)
+        minute = start
+        while minute <= end:
+            got = engine.analyze(f"{minute:%Y-%m-%d %H:%M}", "M", "서울특별시", use_yajas_i,
+                                 sections=["pillars", "jasi_type"])
+            assert got["pillars"] == hour["pillars"], f"{minute:%H:%M}"
+            assert got["jasi_type"] == hour["jasi_type"], f"{minute:%H:%M}"
+            minute += timedelta(minutes=1)
+        covered = int((end - day).total_seconds() // 60) + 1
+    assert covered == 1440
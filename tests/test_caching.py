@@ -0,0 +1,64 @@
+from datetime import datetime
+from itertools import product
+
+import pytest
+
+from lru_cache import LRUCache
+
+BIRTHS = [("1990-05-15 14:30", "M", "서울특별시"),
+          ("1988-07-01 00:40", "F", "부산광역시"),
+          ("1955-07-01 23:20", "M", "서울특별시")]
+OPTIONS = list(product([True, False], repeat=3))  # (use_yajas_i, hap, johoo)
+AS_OF = [datetime(2024, 1, 1, 9, 0), datetime(2031, 6, 15, 12, 0)]
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # a 가 최근 사용
+    cache.put("c", 3)
+    assert cache.peek("b") is None and cache.peek("a") == 1 and cache.peek("c") == 3
+    assert cache.stats()["evictions"] == 1 and len(cache) == 2
+
+
+def test_lru_zero_size_stores_nothing():
+    cache = LRUCache(0)
+    cache.put("a", 1)
+    assert cache.get("a") is None and len(cache) == 0
+
+
+@pytest.fixture(scope="module")
+def engines(engine_args):
+    from saju_engine import SajuEngine
+    return SajuEngine(*engine_args, chart_store=None), SajuEngine(*engine_args, cache_size=0, chart_store=None)
+
+
+def test_cached_matches_uncached_across_options(engines):
+    cached, plain = engines
+    # 같은 생시에 옵션과 기준일을 번갈아 요청해도 다른 옵션의 캐시 항목을 돌려주지 않아야 함
+    for _ in range(2):
+        for (birth, gender, loc), (yajasi, hap, johoo), as_of in product(BIRTHS, OPTIONS, AS_OF):
+            args = (birth, gender, loc, yajasi, "양력", hap, johoo)
+            assert cached.analyze(*args, as_of=as_of) == plain.analyze(*args, as_of=as_of), (args, as_of)
+    assert cached.natal_cache.hits > 0 and cached.overlay_cache.hits > 0
+
+
+def test_sections_share_cache_without_collision(engines):
+    cached, plain = engines
+    for sections in (None, ["pillars"], ["pillars", "daeun_list"], ["scores", "power"]):
+        for birth, gender, loc in BIRTHS:
+            args = (birth, gender, loc, True, "양력", False, False)
+            assert cached.analyze(*args, sections=sections, as_of=AS_OF[0]) == \
+                plain.analyze(*args, sections=sections, as_of=AS_OF[0])
+
+
+def test_engine_cache_evicts_at_size(engine_args):
+    from saju_engine import SajuEngine
+    engine = SajuEngine(*engine_args, cache_size=2, chart_store=None)
+    for birth, gender, loc in BIRTHS:
+        engine.analyze(birth, gender, loc, True, as_of=AS_OF[0])
+    stats = engine.cache_stats()["natal"]
+    assert stats["size"] == 2 and stats["evictions"] == 1
+    engine.analyze(*BIRTHS[0], True, as_of=AS_OF[0])  # 가장 먼저 넣은 항목은 제거됨
+    assert engine.cache_stats()["natal"]["misses"] == 4
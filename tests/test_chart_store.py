@@ -0,0 +1,94 @@
+import sqlite3
+from datetime import datetime
+from itertools import combinations, islice
+
+import pytest
+
+import chart_store
+from saju_chart import Chart
+from saju_engine import SECTION_DEPS
+
+OPTIONS = ((False, False), (True, False), (False, True), (True, True))
+BIRTHS = [("1990-05-15 14:30", "M", "서울특별시"),
+          ("1988-07-01 00:40", "F", "부산광역시"),
+          ("2001-02-04 05:10", "M", "광주광역시")]
+
+
+def birth_chart(engine, birth, gender, location):
+    pillars = engine.analyze(birth, gender, location, True, sections=["pillars"])["pillars"]
+    return Chart.from_palja([c for p in pillars for c in (p["gan"], p["ji"])])
+
+
+@pytest.fixture(scope="module")
+def plain(engine_args):
+    from saju_engine import SajuEngine
+    return SajuEngine(*engine_args, chart_store=None)
+
+
+@pytest.fixture(scope="module")
+def store_file(plain, tmp_path_factory):
+    charts = list(islice(reachable_charts_sample(), 12)) + [birth_chart(plain, *b) for b in BIRTHS]
+    path = str(tmp_path_factory.mktemp("store") / "charts.sqlite")
+    assert chart_store.build(plain, path, charts=charts, limit=len(charts)) == len(charts)
+    return path, charts
+
+
+def reachable_charts_sample():
+    return islice(chart_store.reachable_charts(), 0, None, 997)
+
+
+def test_store_matches_computed_results(plain, store_file):
+    path, charts = store_file
+    store = chart_store.ChartStore.open(path)
+    assert store is not None and len(store) == len(charts) * 2 * len(OPTIONS)
+    for chart in charts:
+        for is_fwd in (False, True):
+            for hap, johoo in OPTIONS:
+                assert store.get(chart, is_fwd, hap, johoo) == plain._analyze_chart(chart, is_fwd, hap, johoo)
+    store.close()
+
+
+def test_build_limit(plain, tmp_path):
+    path = str(tmp_path / "limited.sqlite")
+    charts = list(islice(reachable_charts_sample(), 5))
+    assert chart_store.build(plain, path, options=OPTIONS[:1], charts=charts, limit=3) == 3
+    store = chart_store.ChartStore.open(path)
+    assert len(store) == 3 * 2
+    store.close()
+
+
+def test_version_mismatch_is_not_used(store_file, tmp_path):
+    path = str(tmp_path / "old.sqlite")
+    with sqlite3.connect(store_file[0]) as src, sqlite3.connect(path) as dst:
+        src.backup(dst)
+        dst.execute("UPDATE meta SET value = 'old' WHERE name = 'version'")
+    assert chart_store.ChartStore.open(path) is None
+
+
+SECTION_KEYS = sorted(set().union(*SECTION_DEPS.values()) | {"daeun_cycle", "interactions", "display_tags"})
+
+
+@pytest.mark.parametrize("sections", [frozenset(c) for n in (1, 2) for c in combinations(SECTION_KEYS, n)]
+                         + [frozenset(deps) for deps in SECTION_DEPS.values()])
+def test_sections_are_projection_of_full_result(plain, store_file, sections):
+    # 파일에는 전체 결과만 있으므로 sections 요청은 전체 결과에서 키를 골라 답하게 됨
+    for chart in store_file[1][-len(BIRTHS):]:
+        for hap, johoo in OPTIONS:
+            full = plain._analyze_chart(chart, True, hap, johoo)
+            part = plain._analyze_chart(chart, True, hap, johoo, sections)
+            assert {k: part[k] for k in sections if k in part} == {k: full[k] for k in sections if k in part}
+            assert sections & full.keys() <= part.keys()
+
+
+def test_analyze_with_store_matches_without(engine_args, plain, store_file):
+    from saju_engine import SajuEngine
+    stored = SajuEngine(*engine_args, chart_store=store_file[0])
+    assert stored.chart_store is not None
+    as_of = datetime(2024, 1, 1)
+    for birth, gender, loc in BIRTHS:
+        for sections in (None, ["pillars"], ["yongsin_detail", "daeun_list"], ["tengod_analysis_dict"]):
+            for hap, johoo in OPTIONS:
+                args = (birth, gender, loc, True, "양력", hap, johoo)
+                assert stored.analyze(*args, sections=sections, as_of=as_of) == \
+                    plain.analyze(*args, sections=sections, as_of=as_of)
+    assert stored.chart_store.path == store_file[0]
@@ -0,0 +1,56 @@
+import asyncio
+import threading
+
+import pytest
+
+from executor import ExecutorBusy, TaskExecutor
+
+
+class SlowEngine:
+    def __init__(self):
+        self.started, self.release = threading.Event(), threading.Event()
+
+    def analyze(self, **kwargs):
+        self.started.set()
+        self.release.wait(5)
+        return kwargs
+
+
+def test_disconnected_request_keeps_queue_slot_until_work_ends():
+    engine = SlowEngine()
+    executor = TaskExecutor(engine=engine, cpu_workers=1, max_queue=1)
+
+    async def scenario():
+        first = asyncio.create_task(executor.run_engine("analyze", "analyze", n=1))
+        await asyncio.to_thread(engine.started.wait, 5)
+        first.cancel()  # 클라이언트 연결 끊김: 풀 작업은 계속 실행 중
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert executor.stats()["pending"]["cpu"] == 1
+        with pytest.raises(ExecutorBusy):
+            await executor.run_engine("analyze", "analyze", n=2)
+        engine.release.set()
+        for _ in range(100):
+            if executor.stats()["pending"]["cpu"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert executor.stats()["pending"]["cpu"] == 0
+        assert executor.stats()["endpoints"]["analyze"]["running"] == 0
+        assert await executor.run_engine("analyze", "analyze", n=3) == {"n": 3}
+
+    asyncio.run(scenario())
+    executor.shutdown()
+
+
+def test_endpoint_limit_released_after_pool_work():
+    engine = SlowEngine()
+    engine.release.set()
+    executor = TaskExecutor(engine=engine, cpu_workers=2, limits={"analyze": 1})
+
+    async def scenario():
+        return await asyncio.gather(*(executor.run_engine("analyze", "analyze", n=i) for i in range(5)))
+
+    assert asyncio.run(scenario()) == [{"n": i} for i in range(5)]
+    stats = executor.stats()
+    assert stats["pending"]["cpu"] == 0 and stats["endpoints"]["analyze"]["calls"] == 5
+    executor.shutdown()
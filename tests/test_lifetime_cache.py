@@ -0,0 +1,68 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+import lifetime_fortune as lf
+
+TEXT = "".join(f"## {title}\n{{name}}님의 {key} 풀이입니다.\n" for key, title, _ in lf.SECTIONS)
+
+
+class FakeClient:
+    """generateContent 대신 고정 응답 (호출 수만 셈)"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate(self, prompt, **kwargs):
+        self.calls += 1
+        return TEXT.replace("{name}", lf.NAME_TOKEN)
+
+
+@pytest.fixture
+def generator(engine_args, tmp_path, monkeypatch):
+    from saju_engine import SajuEngine
+    monkeypatch.setattr(lf, "CACHE_DB_PATH", str(tmp_path / "lifetime.db"))
+    engine = SajuEngine(*engine_args, chart_store=None)
+    calls = []
+    analyze = engine.analyze
+    engine.analyze = lambda **kw: calls.append(kw) or analyze(**kw)
+    gen = lf.LifetimeFortuneGenerator(engine, client=FakeClient(), mode="single")
+    gen.analyze_calls = calls
+    return gen
+
+
+def test_repeat_request_skips_analysis(generator):
+    async def scenario():
+        first = await generator.generate("1990-05-15 14:30", "M", "서울특별시", name="홍길동")
+        again = await generator.generate("1990-05-15 14:30", "M", "서울특별시", name="김철수")
+        events = [e async for e in generator.stream("1990-05-15 14:30", "M", "서울특별시", name="이영희")]
+        return first, again, events
+
+    first, again, events = asyncio.run(scenario())
+    assert not first["from_cache"] and again["from_cache"]
+    assert "김철수님" in again["overall"] and lf.NAME_TOKEN not in again["overall"]
+    assert generator.client.calls == 1 and len(generator.analyze_calls) == 1
+    assert events[0] == ("meta", {"name": "이영희", "birth": "1990-05-15 14:30", "gender": "M",
+                                  "ilju": first["ilju"], "ilju_info": first["ilju_info"], "from_cache": True})
+    assert [e for e, _ in events].count("section") == len(lf.SECTION_KEYS)
+
+
+def test_same_chart_other_input_shares_generation(generator):
+    async def scenario():
+        await generator.generate("1990-05-15 14:30", "M", "서울특별시")
+        return await generator.generate("1990-05-15 14:40", "M", "서울특별시")
+
+    assert asyncio.run(scenario())["from_cache"]
+    assert generator.client.calls == 1 and len(generator.analyze_calls) == 2
+
+
+def test_purge_removes_old_version_and_last_year_rows(generator):
+    asyncio.run(generator.generate("1990-05-15 14:30", "M", "서울특별시"))
+    with sqlite3.connect(lf.CACHE_DB_PATH) as conn:
+        conn.execute("INSERT INTO fortune_cache (cache_key, generated_at) VALUES ('v1', '2099-01-01 00:00:00')")
+        conn.execute("INSERT INTO fortune_cache (cache_key, generated_at, prompt_version) "
+                     "VALUES ('old', '2001-12-31 23:59:59', ?)", (lf.PROMPT_VERSION,))
+    assert generator.get_cache_stats()["stale_entries"] == 2
+    assert lf.purge_stale_cache() == 2
+    assert generator.get_cache_stats()["total_entries"] == 1
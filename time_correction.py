@@ -0,0 +1,85 @@
+"""
+역사적 시간 보정 구간표 (Historical time-correction interval index)
+
+- 표준시 변경(+30분), 서머타임(-60분) 등의 기간을 epoch minute(1900-01-01 00:00 기준)
+  경계 배열과 구간별 누적 보정값으로 컴파일
+- 단건 조회는 bisect 한 번 (offset), 여러 시각은 정렬 후 경계 배열을 한 번만 훑음 (offsets)
+- 지역/기간 추가는 saju_constants.HISTORICAL_CORRECTIONS 에 층(layer)을 더하면 되며
+  조회 비용은 경계 수의 log 에만 비례합니다.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+import saju_constants as sc
+from manse_store import minute_index
+
+
+def _parse_minute(ts: str) -> int:
+    """'YYYYMMDDHHMM' -> epoch minute"""
+    return minute_index(datetime.strptime(ts, "%Y%m%d%H%M"))
+
+
+class CorrectionTable:
+    """시간 보정 구간표: bounds[k] 부터 bounds[k+1] 직전까지 offsets[k+1] 분 보정"""
+
+    def __init__(self, layers):
+        """
+        Args:
+            layers: [(보정 분, [(시작 'YYYYMMDDHHMM', 끝 'YYYYMMDDHHMM'), ...]), ...]
+                    끝 시각 포함, 같은 층 안에서 겹치는 기간은 한 번만 적용
+        """
+        spans = [(offset, [(_parse_minute(s), _parse_minute(e) + 1) for s, e in periods])
+                 for offset, periods in layers]
+        bounds = sorted({m for _, ivs in spans for iv in ivs for m in iv})
+
+        offsets = [0] * (len(bounds) + 1)
+        for offset, ivs in spans:
+            # 층별 구간 덮임 횟수를 차분 배열로 누적
+            cover = [0] * (len(bounds) + 1)
+            for s, e in ivs:
+                cover[bisect_left(bounds, s) + 1] += 1
+                cover[bisect_left(bounds, e) + 1] -= 1
+            depth = 0
+            for k in range(1, len(cover)):
+                depth += cover[k]
+                if depth > 0:
+                    offsets[k] += offset
+
+        self.bounds = array('i', bounds)
+        self.offsets = array('i', offsets)
+
+    @classmethod
+    def for_region(cls, region: str = "KR"):
+        return cls(sc.HISTORICAL_CORRECTIONS[region])
+
+    def __len__(self):
+        return len(self.bounds)
+
+    def offset(self, minute: int) -> int:
+        """epoch minute 의 보정 분"""
+        return self.offsets[bisect_right(self.bounds, minute)]
+
+    def offset_at(self, dt: datetime) -> int:
+        """datetime 의 보정 분"""
+        return self.offsets[bisect_right(self.bounds, minute_index(dt))]
+
+    def changes_between(self, lo: int, hi: int):
+        """[lo, hi] 구간 안에서 보정값이 바뀌는 epoch minute 목록과 구간에 나타나는 보정값 집합"""
+        i, j = bisect_right(self.bounds, lo), bisect_right(self.bounds, hi)
+        return list(self.bounds[i:j]), set(self.offsets[i:j + 1])
+
+    def offsets_many(self, minutes):
+        """여러 epoch minute 의 보정 분을 입력 순서대로 반환 (array('i'))
+
+        정렬한 뒤 경계 배열과 함께 한 번 훑으므로 배치 작업에서 건당 bisect 보다 빠릅니다.
+        """
+        out = array('i', bytes(4 * len(minutes)))
+        bounds, offsets, k, n = self.bounds, self.offsets, 0, len(self.bounds)
+        for i in sorted(range(len(minutes)), key=minutes.__getitem__):
+            m = minutes[i]
+            while k < n and bounds[k] <= m:
+                k += 1
+            out[i] = offsets[k]
+        return out